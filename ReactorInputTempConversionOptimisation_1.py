@@ -40,10 +40,14 @@ initialMoleFractionAr = 0.0262431
 PlotTempRange = [550, 740]              # [start, end] K (MUST BE INTEGER VALUE)
 BedLengthcalc = 2.1                     # m
 StepSize_dL = 0.001                     # m
+effFactorModel = "polynomial"           # "pellet": rigorous pellet model (pelletModel.py), also valid below 550 K
 # =========================================================================================================== #
 # =========================================================================================================== #
 # ===================================   I M P O R T   L I B R A R I E S   =================================== #
 import numpy as np
+from reactorCache import runCached
+from reactorSim import R2Config
+from interstageCooler import CoolerInlet, InterstageCooler
 from reactorCalcs_1 import ReactorUpdates
 import matplotlib.pyplot as plt
 import os
@@ -65,7 +69,8 @@ class Reactor(ReactorUpdates):
         initialMoleFractionNH3,
         initialMoleFractionAr,
         Fn2,
-        F
+        F,
+        effFactorModel="polynomial"
     ):
         super().__init__(
             stepSize,
@@ -78,6 +83,7 @@ class Reactor(ReactorUpdates):
             initialMoleFractionAr,
             248.153,
             1041.55,
+            effFactorModel=effFactorModel,
         )
 
     def run(self, iterations=1):
@@ -97,7 +103,6 @@ class Reactor(ReactorUpdates):
             self.updateActivationCoefficientNH3()
             self.updateReactionRateConstant()
             self.updateEquilibriumConstant()
-            self.updateEquilibriumConversion()
             self.updateRateOfReactionNH3()
             self.updateConversionN2()
             self.updateTemp()
@@ -157,8 +162,10 @@ def main():
             initialMoleFractionAr,
             248.153,
             1041.55,
+            effFactorModel,
         )
-        R1.run(int(BedLengthcalc / StepSize_dL))
+        runCached(R1, int(BedLengthcalc / StepSize_dL))
+        R1.updateEquilibriumConversion()                       # equilibrium at the outlet temperature
 
         reactorconversioniterative.append(R1.conversionN2)
 
@@ -205,6 +212,18 @@ def main():
         ]
 
 
+    # ------------- interstage cooler R-601 -> R-602, sized for every point of the sweep in one call -------------#
+    interstageCooler = InterstageCooler(outletTemp=R2Config.incomingTemp)
+    coolerDuty = interstageCooler.calcDuty(CoolerInlet(
+        np.array(reactortempfinaliterative),
+        np.array(yH2),
+        np.array(yN2),
+        np.array(yNH3),
+        np.array(yAr),
+        1041.55 - 2 * 248.153 * np.array(reactorconversioniterative),
+        constantPressure,
+    )) / 1e3                                                                                            # MW
+
 # --------------------- Print Results ---------------------#
     print(
         "\n---------------------------------------------------------------------------------------------------------------------------------------------------------------------------------"
@@ -265,6 +284,11 @@ def main():
         "   Ar: ",
         yAr[temperatureloop.index(PlotTempRange[0] + iterationsToMAX)],
     )
+    print(
+        "Interstage Cooler Duty (to R-602 inlet at", R2Config.incomingTemp, "K): ",
+        coolerDuty[temperatureloop.index(PlotTempRange[0] + iterationsToMAX)],
+        "MW",
+    )
     print(
         "---------------------------------------------------------------------------------------------------------------------------------------------------------------------------------\n"
     )
@@ -333,7 +357,7 @@ def main():
         temperatureloop, reactorconversioniterative, color="green", label="Conversion"
     )
     lns7 = ax1.plot(
-        temperatureloop[1:], np.array(equilibriumConversionIterative)-np.array(initialMoleFractionNH3)*np.array(initialMoleFractionAr), color="orange", label="Equilibrium Conversion"
+        temperatureloop[1:], np.array(equilibriumConversionIterative), color="orange", label="Equilibrium Conversion"
     )
 
 
@@ -428,13 +452,23 @@ def main():
     plt.legend()
     plt.title("R-601 Equilibrium Constant vs Temperature")
 
+    # --------------------- Plot Interstage Cooler Duty --------------------#
+    fig3, ax4 = plt.subplots(figsize=(8, 4))
+    plt.plot(temperatureloop[1:], coolerDuty[1:], color="blue", label="Interstage Cooler Duty")
+    plt.plot(iterationsToMAX + PlotTempRange[0], coolerDuty[temperatureloop.index(PlotTempRange[0] + iterationsToMAX)], color="None", marker="o", markersize=7, markeredgewidth=2, markeredgecolor="red", markerfacecolor="None", label="Optimum Reaction Conditions")
+    plt.xlabel("R-601 Inlet Temperature (K)")
+    plt.ylabel("Duty (MW)")
+    plt.xlim(PlotTempRange[0], PlotTempRange[1])
+    plt.legend()
+    plt.title("R-601 -> R-602 Interstage Cooler Duty vs Temperature")
+
 # --------------------- Save PDF ---------------------#
 
     pp = matplotlib.backends.backend_pdf.PdfPages(
             os.path.join(storagePath, "REACTOR_1__TEMP_VS_CONVERSION_OPTIMISATION.pdf")
     )
     #group all figures together in a list
-    figs = [fig, fig1, fig2]
+    figs = [fig, fig1, fig2, fig3]
     for figs in figs:
         figs.set_size_inches(10.0, 5)
         figs.gca().grid(True, linestyle=':')
@@ -42,12 +42,14 @@ initialMoleFractionAr_2 = 0.0281596
 PlotTempRange = [500, 740]              # [start, end] K (MUST BE INTEGER VALUE)
 BedLengthcalc = 5.35                    # m
 StepSize_dL = 0.001   
+effFactorModel = "polynomial"           # "pellet": rigorous pellet model (pelletModel.py), also valid below 550 K
 
 
 # =========================================================================================================== #
 # =========================================================================================================== #
 # ===================================   I M P O R T   L I B R A R I E S   =================================== #
 import numpy as np
+from reactorCache import runCached
 from reactorCalcs_1 import Fn2, ReactorUpdates
 import matplotlib.pyplot as plt
 import os
@@ -79,7 +81,8 @@ class Reactor(ReactorUpdates):
         initialMoleFractionNH3_2,
         initialMoleFractionAr_2,
         FN2, 
-        F
+        F,
+        effFactorModel="polynomial"
     ):
         super().__init__(
             stepSize,
@@ -91,7 +94,8 @@ class Reactor(ReactorUpdates):
             initialMoleFractionNH3_2,
             initialMoleFractionAr_2,
             FN2, 
-            F
+            F,
+            effFactorModel=effFactorModel,
         )
 
     def run(self, iterations=1):
@@ -111,7 +115,6 @@ class Reactor(ReactorUpdates):
             self.updateActivationCoefficientNH3()
             self.updateReactionRateConstant()
             self.updateEquilibriumConstant()
-            self.updateEquilibriumConversion()
             self.updateRateOfReactionNH3()
             self.updateConversionN2()
             self.updateTemp()
@@ -169,9 +172,11 @@ def main():
             initialMoleFractionNH3_2,
             initialMoleFractionAr_2,
             R2FN2, 
-            R2F
+            R2F,
+            effFactorModel,
         )
-        R2.run(int(BedLengthcalc / StepSize_dL))
+        runCached(R2, int(BedLengthcalc / StepSize_dL))
+        R2.updateEquilibriumConversion()                       # equilibrium at the outlet temperature
 
         reactorconversioniterative.append(R2.conversionN2)
         temperatureloop.append(tempnow)
@@ -346,7 +351,7 @@ def main():
     
 
     lns7 = ax1.plot(
-        temperatureloop[1:], np.array(equilibriumConversionIterative) - (np.array(bed1conversion) - np.array(initialMoleFractionAr_2)) * np.array(bed1feed/R2F), color="orange", label="Equilibrium Conversion"
+        temperatureloop[1:], np.array(equilibriumConversionIterative), color="orange", label="Equilibrium Conversion"
     )
 
     lns5 = ax1.plot(
@@ -6,6 +6,7 @@
 # ------------------------------------------- import libraries ---------------------------------------------- #
 import numpy as np
 import matplotlib.pyplot as plt
+from heatCapacityCalcs import calcComponentHeatCapacities, calcMixtureHeatCapacity, calcMeanHeatCapacity
 # ----------------------------------------------------------------------------------------------------------- #
 # composition
 initialMoleFractionH2 = 0.714089
@@ -22,12 +23,6 @@ pressure = 225  #atm
 T1 = int(input("Enter a starting temperature (501 - 900K): "))
 T2 = int(input("Enter an ending temperature (501 - 900K): "))
 FeedFlowRate = float(input("Enter the feed flow rate (kg/s): "))
-CpH2 = []
-CpN2 = []
-CpAr = []
-CpNH3 = []
-Cp = []
-temperature = []
 yH2 = initialMoleFractionH2
 yN2 = initialMoleFractionN2
 yNH3 = initialMoleFractionNH3
@@ -35,64 +30,14 @@ yAr = initialMoleFractionAr
 
 molecularWeight = molecularWeightH2 * initialMoleFractionH2 + molecularWeightN2 * initialMoleFractionN2 + molecularWeightNH3 * initialMoleFractionNH3 + molecularWeightAr * initialMoleFractionAr # g/mol
 
-# Calculate the heat capacity of each component of the system
-temp = T1
-while temp <= T2 :
-    HeatCapacityH2 = (
-        #                 # specific_heat_hydrogen * yH2
-        (
-            4.184
-            * (
-                6.952
-                - 4.576e-4 * temp
-                + 9.563e-7 * temp**2
-                - 2.079e-10 * temp**3
-            )
-        ))
-    HeatCapacityN2 = (
-        #        # + specific_heat_nitrogen * yN2
-        + (
-            4.184
-            * (
-                6.903
-                - 3.753e-4 * temp
-                + 1.93e-6 * temp**2
-                - 6.861e-10 * temp**3
-            )
-        ))
-    HeatCapacityAr = (
-        #        # + specific_heat_argon * yAr
-            + (4.9675
-                ) * 4.184
-        )
-    HeatCapacityNH3 = (
-        # + specific_heat_ammonia * yNH3
-        + (4.184 *
-            (
-                6.5846 * 1
-                - 6.1251e-3 * temp
-                + 2.3663e-6 * temp**2
-                - 1.5981e-9 * temp**3
-                + (
-                    96.1678
-                    - 0.067571 * pressure
-                    + (-0.2225 + 1.6847e-4 * pressure) * temp
-                    + (1.289e-4 - 1.0095e-7 * pressure) * temp**2
-                )
-            )
-        )
-    ) 
+# Calculate the heat capacity of each component of the system (closed form, see heatCapacityCalcs.py)
+temperature = np.arange(T1, T2 + 1)
+CpH2, CpN2, CpNH3, CpAr = calcComponentHeatCapacities(temperature, pressure)
+CpAr = np.full_like(temperature, CpAr, dtype=float)
+Cp = calcMixtureHeatCapacity(temperature, yH2, yN2, yNH3, yAr, pressure)
 
-    temperature.append(temp)
-    CpH2.append(HeatCapacityH2)
-    CpN2.append(HeatCapacityN2)
-    CpAr.append(HeatCapacityAr)
-    CpNH3.append(HeatCapacityNH3)
-    Cp.append(HeatCapacityH2 *initialMoleFractionH2 + HeatCapacityN2 *initialMoleFractionN2 + HeatCapacityAr *initialMoleFractionAr + HeatCapacityNH3 *initialMoleFractionNH3)
-    temp += 1
 
-
-AverageHeatCapacity = sum(Cp)/len(Cp)
+AverageHeatCapacity = calcMeanHeatCapacity(T1, T2, yH2, yN2, yNH3, yAr, pressure)
 print ("The average heat capacity of the system across the user specified temperature range is:   ", AverageHeatCapacity, "kJ/mol*K") 
 print("The heat transfer rate per mole is:   ", AverageHeatCapacity * (T2-T1), "kJ/kmol") # on a per mole basis
 print("The heat transfer rate per unit mass is:    ", AverageHeatCapacity * (T2-T1) / molecularWeight, "kJ/kg") # on a per unit mass basis
@@ -0,0 +1,352 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Multiple steady states of an autothermal converter: the fresh feed is preheated by the bed  #
+#                  effluent in a feed-effluent exchanger (FEHE) before it enters the adiabatic bed, so the bed #
+#                  inlet temperature depends on the bed outlet temperature - a heat feedback loop that can     #
+#                  have three steady states (extinguished, unstable middle, ignited) for one feed.             #
+#                - AutothermalConverter: unknown = bed inlet temperature, residual = FEHE cold outlet - bed     #
+#                  inlet. Parameter: feed temperature (feedTemp) or any BatchConfig field (pressure, F, ...).  #
+#                - The S-curve is traced with pseudoArclength of sweepContinuation, which passes the folds;    #
+#                  turning points (ignition / extinction) are found by the sign change of the tangent and      #
+#                  refined with a secant on dparameter/dunknown = 0 (the fold condition).                      #
+#                - main() compares the folds found that way with the integer-kelvin up/down sweep.             #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - problem = AutothermalConverter(config, FeedEffluentExchanger(0.6))                                        #
+# - curve = pseudoArclength(problem, 450, (450, 570), stepLength=0.05, scales=(100, 100))                      #
+# - folds = findTurningPoints(problem, curve)   ->  fold.parameter, fold.unknown, fold.outletTemp              #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+exchangerEffectiveness = 0.6            #        FEHE duty / maximum possible duty                              #
+feedTempBounds = (450, 570)             # K      feed temperature range traced in main()                       #
+pressureBounds = (150, 300)             # atm    pressure range traced in main()                               #
+pressureFeedTemp = 530                  # K      feed temperature of the pressure trace                        #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import os
+import pathlib
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.backends.backend_pdf
+from prettytable import PrettyTable
+from heatCapacityCalcs import calcMixtureEnthalpyChange, calcMixtureHeatCapacity
+from interstageCooler import CoolerInlet
+from reactorEngine import BatchConfig, runBatch
+from reactorGeometry import shootingTolerance
+from reactorSim import R1Config
+from sweepContinuation import ContinuationPoint, ContinuationResult, finiteDifferenceStep, pseudoArclength
+storagePath = os.path.join(pathlib.Path(__file__).parent.absolute(), "Figures")
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+exchangerTolerance = 1e-9               # K      FEHE outlet temperature (well inside the shooting tolerance)   #
+maxExchangerIterations = 20
+maxSolveIterations = 50
+maxSolveStep = 50                       # K      largest step on the bed inlet temperature                      #
+turningPointTolerance = 1e-3            # K      on the bed inlet temperature of a refined fold                #
+maxTurningPointIterations = 10
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class FeedEffluentExchanger:
+    effectiveness: float                # duty / maximum duty (cold stream heated to the hot inlet or vice versa)
+
+    def __post_init__(self):
+        if not 0 <= self.effectiveness < 1:
+            raise ValueError("exchanger effectiveness must be in [0, 1), got %g" % self.effectiveness)
+
+    def calcDuty(self, cold, hot):      # kW, heat passed from the effluent (hot) to the fresh feed (cold)
+        composition = lambda stream: (stream.moleFractionH2, stream.moleFractionN2, stream.moleFractionNH3,
+                                      stream.moleFractionAr, stream.pressure)
+        coldLimit = cold.molarFlowrate * calcMixtureEnthalpyChange(cold.temp, hot.temp, *composition(cold))
+        hotLimit = -hot.molarFlowrate * calcMixtureEnthalpyChange(hot.temp, cold.temp, *composition(hot))
+        return self.effectiveness * np.minimum(coldLimit, hotLimit) / 3600
+
+    def calcColdOutletTemp(self, cold, hot):        # K - Newton on the cold side enthalpy balance
+        composition = (cold.moleFractionH2, cold.moleFractionN2, cold.moleFractionNH3, cold.moleFractionAr,
+                       cold.pressure)
+        duty = 3600 * self.calcDuty(cold, hot) / cold.molarFlowrate                     # kJ/kmol of feed
+        temp = cold.temp + duty / calcMixtureHeatCapacity(cold.temp, *composition)
+        for _ in range(maxExchangerIterations):
+            correction = ((calcMixtureEnthalpyChange(cold.temp, temp, *composition) - duty)
+                          / calcMixtureHeatCapacity(temp, *composition))
+            temp = temp - correction
+            if np.all(np.abs(correction) < exchangerTolerance):
+                break
+        return temp
+
+
+@dataclasses.dataclass
+class AutothermalConverter:
+    # adiabatic bed (config, incomingTemp unused) behind a FEHE; parameter = feedTemp or one BatchConfig field
+    config: BatchConfig
+    exchanger: FeedEffluentExchanger
+    feedTemp: float = 473.15            # K - fresh feed to the cold side of the FEHE
+    parameterName: str = "feedTemp"
+
+    def __post_init__(self):
+        if self.parameterName != "feedTemp" and self.parameterName not in BatchConfig.caseFields:
+            raise ValueError("unknown continuation parameter '%s'" % self.parameterName)
+
+    def configAt(self, parameter):
+        # -> (bed config, feed temperature); a new total flow F keeps the N2 fraction of the feed
+        if self.parameterName == "feedTemp":
+            return self.config, parameter
+        overrides = {self.parameterName: parameter}
+        if self.parameterName == "F":
+            overrides["Fn2"] = None
+        return dataclasses.replace(self.config, **overrides), self.feedTemp
+
+    def residual(self, parameter, unknown):
+        # -> (FEHE cold outlet - bed inlet (K), bed result) - one march
+        config, feedTemp = self.configAt(parameter)
+        result = runBatch(dataclasses.replace(config, incomingTemp=unknown))
+        feed = CoolerInlet(feedTemp, config.initialMoleFractionH2, config.initialMoleFractionN2,
+                           config.initialMoleFractionNH3, config.initialMoleFractionAr, config.F, config.pressure)
+        effluent = CoolerInlet(result.temp.real, result.moleFractionH2.real, result.moleFractionN2.real,
+                               result.moleFractionNH3.real, result.moleFractionAr.real,
+                               config.F - 2 * config.Fn2 * result.conversionN2.real, result.pressure.real)
+        return float(self.exchanger.calcColdOutletTemp(feed, effluent)[0]) - unknown, result
+
+    def solve(self, parameter, guess=None, slope=None):
+        # -> (bed inlet temperature, slope, marches, result) of a STABLE steady state near guess (default: the feed
+        # temperature, i.e. the extinguished side). Secant steps while the residual falls with the bed inlet
+        # temperature; otherwise a substitution step (bed inlet <- FEHE outlet), which runs away from the unstable
+        # middle branch - the jump to the other branch past a fold. Just past a fold the substitution contracts by
+        # a factor close to 1, so its steps are at least doubled until the residual changes sign; from then on
+        # the steady state is bracketed (residual > 0 below, < 0 above) and secant steps that leave the bracket
+        # are replaced by bisection
+        guess = self.configAt(parameter)[1] if guess is None else guess
+        currentResidual, result = self.residual(parameter, guess)
+        marches = 1
+        below, above, lastStep = -np.inf, np.inf, 0.0
+        while abs(currentResidual) >= shootingTolerance:
+            if marches >= maxSolveIterations:
+                raise RuntimeError("autothermal steady state not found in %d marches at parameter %g"
+                                   % (maxSolveIterations, parameter))
+            if currentResidual > 0:
+                below = max(below, guess)
+            else:
+                above = min(above, guess)
+            bracketed = below < above and np.isfinite(below) and np.isfinite(above)
+            if slope is None:
+                newGuess = guess + 10.0
+            elif slope < 0:
+                newGuess = guess - np.clip(currentResidual / slope, -maxSolveStep, maxSolveStep)
+            elif bracketed:
+                newGuess = 0.5 * (below + above)
+            else:
+                step = max(abs(currentResidual), 2 * abs(lastStep) if lastStep * currentResidual > 0 else 0)
+                newGuess = guess + np.copysign(min(step, maxSolveStep), currentResidual)
+            if bracketed and not below < newGuess < above:
+                newGuess = 0.5 * (below + above)
+            newResidual, result = self.residual(parameter, newGuess)
+            marches += 1
+            slope = (newResidual - currentResidual) / (newGuess - guess)
+            lastStep = newGuess - guess
+            guess, currentResidual = newGuess, newResidual
+        return guess, slope, marches, result
+
+
+@dataclasses.dataclass
+class TurningPoint:
+    parameter: float
+    unknown: float                      # bed inlet temperature at the fold (K)
+    outletTemp: float                   # K
+    evaluations: int                    # marches spent on the refinement
+    isMaximum: bool                     # the parameter is at a local maximum along the curve
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def evaluateFoldFunction(problem, parameter, unknown, parameterSlope=None):
+    # solves g(parameter, unknown) = 0 for the parameter at a fixed unknown (well posed at a fold, where g_p does
+    # not vanish) and returns dparameter/dunknown = -g_u / g_p along the curve there, zero at a fold
+    # -> (parameter, dparameter/dunknown, g_p, result, marches)
+    value, result = problem.residual(parameter, unknown)
+    marches = 1
+    if parameterSlope is None:
+        step = finiteDifferenceStep * max(abs(parameter), 1.0)
+        parameterSlope = (problem.residual(parameter + step, unknown)[0] - value) / step
+        marches += 1
+    while abs(value) >= shootingTolerance:
+        if marches >= maxSolveIterations:
+            raise RuntimeError("no steady state at bed inlet temperature %g near parameter %g" % (unknown, parameter))
+        newParameter = parameter - value / parameterSlope
+        newValue, result = problem.residual(newParameter, unknown)
+        marches += 1
+        parameterSlope = (newValue - value) / (newParameter - parameter)
+        parameter, value = newParameter, newValue
+    step = finiteDifferenceStep * max(abs(unknown), 1.0)
+    unknownSlope = (problem.residual(parameter, unknown + step)[0] - value) / step
+    return parameter, -unknownSlope / parameterSlope, parameterSlope, result, marches + 1
+
+
+def refineTurningPoint(problem, before, after):
+    # before / after: curve points on either side of a fold. Illinois regula falsi on dparameter/dunknown over
+    # the unknown, so the iterates never leave the bracket
+    lowParameter, lowSlope, parameterSlope, result, evaluations = evaluateFoldFunction(problem, before.parameter,
+                                                                                      before.unknown)
+    highParameter, highSlope, _, _, marches = evaluateFoldFunction(problem, after.parameter, after.unknown)
+    evaluations += marches
+    if lowSlope * highSlope > 0:
+        raise RuntimeError("no single turning point between parameters %g and %g" % (before.parameter,
+                                                                                       after.parameter))
+    low, high = before.unknown, after.unknown
+    unknown, parameter, side = low, lowParameter, 0
+    for _ in range(maxTurningPointIterations):
+        newUnknown = high - highSlope * (high - low) / (highSlope - lowSlope)
+        # start from the parameter at the bracket end nearest to the new unknown
+        guess = parameter + (lowSlope if abs(newUnknown - low) < abs(newUnknown - high) else highSlope) * (
+            newUnknown - unknown)
+        parameter, slope, parameterSlope, result, marches = evaluateFoldFunction(problem, guess, newUnknown,
+                                                                                 parameterSlope)
+        evaluations += marches
+        converged = abs(newUnknown - unknown) < turningPointTolerance
+        unknown = newUnknown
+        if converged:
+            break
+        if slope * lowSlope > 0:
+            low, lowSlope = unknown, slope
+            highSlope = highSlope / 2 if side == -1 else highSlope
+            side = -1
+        else:
+            high, highSlope = unknown, slope
+            lowSlope = lowSlope / 2 if side == 1 else lowSlope
+            side = 1
+    else:
+        raise RuntimeError("turning point between parameters %g and %g did not converge"
+                           % (before.parameter, after.parameter))
+    return TurningPoint(float(parameter), float(unknown), float(result.temp[0].real), evaluations,
+                        bool(before.tangent[0] > 0))
+
+
+def findTurningPoints(problem, curve):
+    # folds of a pseudoArclength curve: the parameter component of the tangent changes sign. The tangent of an
+    # arclength point follows the chord from the point before it, so the fold lies within one point either side
+    points = curve.points
+    return [refineTurningPoint(problem, points[max(i - 1, 0)], points[i + 1]) for i in range(len(points) - 1)
+            if points[i].tangent[0] * points[i + 1].tangent[0] < 0]
+
+
+def hysteresisSweep(problem, parameters):
+    # the brute-force way: natural continuation up and down the grid, each point warm-started from the last
+    # steady state; the branch jumps where a fold is crossed, so a fold is only known to one grid step
+    start = time.perf_counter()
+    sweeps = []
+    for grid in (parameters, parameters[::-1]):
+        points, guess, slope = [], None, None
+        for parameter in grid:
+            unknown, slope, evaluations, result = problem.solve(parameter, guess, slope)
+            points.append(ContinuationPoint(float(parameter), unknown, evaluations, result))
+            guess = unknown
+        sweeps.append(points)
+    points = sweeps[0] + sweeps[1]
+    return ContinuationResult(points, sum(point.evaluations for point in points), time.perf_counter() - start)
+
+
+def findJumps(points, jumpSize=20.0):
+    # grid steps where the steady state jumps branch (K) -> [(parameter before, parameter after)]
+    return [(before.parameter, after.parameter) for before, after in zip(points, points[1:])
+            if abs(after.unknown - before.unknown) > jumpSize and before.parameter != after.parameter]
+
+
+def turningPointTable(title, rows):
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = title
+    table.field_names = ["Method", "Fold", "Parameter", "Bed inlet T (K)", "Bed outlet T (K)", "Marches",
+                         "Computing time (s)"]
+    for name, folds, evaluations, wallTime in rows:
+        for index, (label, parameter, inletTemp, outletTemp) in enumerate(folds):
+            table.add_row([name if index == 0 else "", label, parameter, inletTemp, outletTemp,
+                           evaluations if index == 0 else "", round(wallTime, 2) if index == 0 else ""])
+    return table
+
+
+def labelFolds(turningPoints):
+    # the fold on the extinguished side of the S-curve (lower bed inlet temperature) is the ignition point
+    ordered = sorted(turningPoints, key=lambda fold: fold.unknown)
+    labels = ["ignition", "extinction"] if len(ordered) == 2 else ["fold %d" % (i + 1) for i in range(len(ordered))]
+    return [(label, round(fold.parameter, 4), round(fold.unknown, 3), round(fold.outletTemp, 3))
+            for label, fold in zip(labels, ordered)]
+
+
+def traceWithFolds(problem, start, bounds, stepLength, scales):
+    # -> (curve, turning points, marches, wall time)
+    begin = time.perf_counter()
+    curve = pseudoArclength(problem, start, bounds, stepLength=stepLength, scales=scales)
+    turningPoints = findTurningPoints(problem, curve)
+    evaluations = curve.evaluations + sum(fold.evaluations for fold in turningPoints)
+    return curve, turningPoints, evaluations, time.perf_counter() - begin
+
+
+def plotSCurves(traces):
+    # one S-curve (bed outlet temperature against the parameter) per trace, folds marked
+    figs = []
+    for xLabel, curve, turningPoints in traces:
+        fig, ax = plt.subplots()
+        outletTemps = [point.result.temp[0].real for point in curve.points]
+        ax.plot(curve.parameters, outletTemps, "-", color="tab:blue", label="steady states")
+        ax.plot(curve.parameters, outletTemps, ".", color="tab:blue", markersize=4)
+        ax.plot([fold.parameter for fold in turningPoints], [fold.outletTemp for fold in turningPoints], "o",
+                color="tab:red", label="turning points")
+        ax.set_xlabel(xLabel)
+        ax.set_ylabel("Bed outlet temperature (K)")
+        plt.title("Autothermal converter, FEHE effectiveness %g" % exchangerEffectiveness)
+        figs.append(fig)
+    return figs
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    # R-601 bed behind a FEHE
+    config = BatchConfig.fromReactorConfig(R1Config, 248.153, 1041.55, bedLength=R1Config.baseLength)
+    exchanger = FeedEffluentExchanger(exchangerEffectiveness)
+    scales = (100.0, 100.0)
+
+    # feed temperature: arclength with refined folds against the integer-kelvin hysteresis sweep
+    problem = AutothermalConverter(config, exchanger)
+    low, high = feedTempBounds
+    curve, turningPoints, evaluations, wallTime = traceWithFolds(problem, low, (low, high), 0.05, scales)
+    grid = hysteresisSweep(problem, np.arange(low, high + 1, 1.0))
+    jumps = findJumps(grid.points)
+    gridFolds = [(label, "%g-%g" % tuple(sorted(jump)), "-", "-") for label, jump in zip(("ignition", "extinction"),
+                                                                                           jumps)]
+    print(turningPointTable("Feed temperature (K) - FEHE effectiveness %g" % exchangerEffectiveness, [
+        ("Pseudo-arclength + refinement", labelFolds(turningPoints), evaluations, wallTime),
+        ("Integer-kelvin up/down sweep", gridFolds, grid.evaluations, grid.wallTime),
+    ]))
+    traces = [("Feed temperature (K)", curve, turningPoints)]
+
+    # pressure at a fixed feed temperature
+    problem = AutothermalConverter(config, exchanger, feedTemp=pressureFeedTemp, parameterName="pressure")
+    low, high = pressureBounds
+    curve, turningPoints, evaluations, wallTime = traceWithFolds(problem, low, (low, high), 0.05, scales)
+    print(turningPointTable("Pressure (atm) - feed at %g K" % pressureFeedTemp, [
+        ("Pseudo-arclength + refinement", labelFolds(turningPoints), evaluations, wallTime),
+    ]))
+    traces.append(("Pressure (atm)", curve, turningPoints))
+
+    pp = matplotlib.backends.backend_pdf.PdfPages(os.path.join(storagePath, "AUTOTHERMAL_BIFURCATION.pdf"))
+    for fig in plotSCurves(traces):
+        fig.set_size_inches(9.0, 5)
+        fig.gca().grid(True, linestyle=':')
+        fig.gca().legend(loc="best", fontsize=7)
+        pp.savefig(fig, bbox_inches="tight", dpi=300)
+    pp.close()
+
+    showFig = input("Show figures? (y/n): ")
+    if showFig == "y":
+        plt.show()
+    else:
+        plt.close("all")
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
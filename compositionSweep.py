@@ -0,0 +1,240 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Feed composition sweeps: the recycle argon level and the H2/N2 ratio drift in operation,    #
+#                  while R1Config, R2Config and the optimisation scripts hold a single fixed composition.    #
+#                - Compositions are points of the (yH2, yN2, yNH3, yAr) simplex, either a full lattice or a   #
+#                  map over H2/N2 ratio x argon fraction at fixed NH3. Every point is checked (no negative    #
+#                  fraction, sum of 1) before anything is run.                                                #
+#                - One batched run per sweep through reactorCache.runBatchCached (process pool + on-disk      #
+#                  results store shared with the other sweeps). The N2 feed follows the composition,          #
+#                  Fn2 = F * yN2, at a fixed total feed.                                                      #
+#                - Outputs: conversion, outlet and peak temperature maps and their sensitivities to the H2/N2  #
+#                  ratio and the argon fraction.                                                              #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - sweep = ratioArgonSweep(R1Config, 1041.55, ratios, argonFractions)   ->  sweep.conversionN2 (nRatio, nAr) #
+# - composition = simplexLattice(20, bounds)                             ->  every lattice point in bounds      #
+# - Figures/COMPOSITION_SWEEP.pdf                                                                              #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+ratioRange = (2.0, 4.0, 41)                     # H2/N2 ratio           (low, high, points)                    #
+argonRange = (0.0, 0.12, 25)                    # argon mole fraction   (low, high, points)                    #
+latticeDivisions = 40                           # simplex lattice step = 1 / latticeDivisions                  #
+latticeBounds = {                               # mole fraction bounds of the lattice in main()                #
+    # component: (low, high)
+    "H2":       (0.55, 0.80),
+    "N2":       (0.15, 0.35),
+    "NH3":      (0.01, 0.05),
+    "Ar":       (0.00, 0.10),
+}
+compositionTolerance = 1e-3                     # allowed |sum - 1| before renormalising (R1Config: 0.99991)   #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import itertools
+import os
+import pathlib
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.backends.backend_pdf
+from prettytable import PrettyTable
+from reactorCache import runBatchCached
+from reactorEngine import BatchConfig, catalystMaxTemp
+from reactorSim import R1Config
+storagePath = os.path.join(pathlib.Path(__file__).parent.absolute(), "Figures")
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+components = ("H2", "N2", "NH3", "Ar")
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class Composition:
+    # mole fractions, one entry per point (any shape, all the same)
+    moleFractionH2: np.ndarray
+    moleFractionN2: np.ndarray
+    moleFractionNH3: np.ndarray
+    moleFractionAr: np.ndarray
+
+    def __post_init__(self):
+        fractions = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in dataclasses.astuple(self)))
+        checkComposition(*fractions)
+        # rounding of report values is taken out - every point is run with fractions summing to exactly 1
+        total = sum(fractions)
+        self.moleFractionH2, self.moleFractionN2, self.moleFractionNH3, self.moleFractionAr = (
+            value / total for value in fractions)
+
+    @classmethod
+    def fromRatio(cls, ratioH2N2, moleFractionAr, moleFractionNH3):
+        # H2 and N2 share what argon and ammonia leave, in the given ratio
+        remainder = 1 - np.asarray(moleFractionAr) - np.asarray(moleFractionNH3)
+        return cls(remainder * ratioH2N2 / (1 + ratioH2N2), remainder / (1 + ratioH2N2), moleFractionNH3,
+                   moleFractionAr)
+
+    @property
+    def shape(self):
+        return self.moleFractionH2.shape
+
+    @property
+    def ratioH2N2(self):
+        return self.moleFractionH2 / self.moleFractionN2
+
+    def flat(self):
+        return Composition(*(value.ravel() for value in dataclasses.astuple(self)))
+
+
+@dataclasses.dataclass
+class CompositionSweep:
+    composition: Composition
+    conversionN2: np.ndarray
+    outletTemp: np.ndarray              # K
+    peakTemp: np.ndarray                # K
+    moleFractionNH3: np.ndarray         # outlet
+
+    def sensitivity(self, name, axes):
+        # d(output)/d(axis) on a map (one axis coordinate array per map dimension), central differences
+        return np.gradient(getattr(self, name), *axes)
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def checkComposition(moleFractionH2, moleFractionN2, moleFractionNH3, moleFractionAr, tolerance=compositionTolerance):
+    fractions = np.stack(np.broadcast_arrays(moleFractionH2, moleFractionN2, moleFractionNH3, moleFractionAr))
+    if not np.all(np.isfinite(fractions)):
+        raise ValueError("mole fractions must be finite")
+    if np.any(fractions < 0):
+        worst = np.unravel_index(np.argmin(fractions), fractions.shape)
+        raise ValueError("negative mole fraction of %s (%g)" % (components[worst[0]], fractions[worst]))
+    error = np.abs(fractions.sum(axis=0) - 1)
+    if np.any(error > tolerance):
+        raise ValueError("mole fractions sum to 1 +- %g (allowed %g)" % (error.max(), tolerance))
+
+
+def simplexLattice(divisions, bounds=None):
+    # every (yH2, yN2, yNH3, yAr) = (i, j, k, l) / divisions with i + j + k + l = divisions, inside the bounds
+    points = np.array([(i, j, k, divisions - i - j - k) for i, j, k in
+                       itertools.product(range(divisions + 1), repeat=3) if i + j + k <= divisions]) / divisions
+    if bounds is not None:
+        low, high = np.array([bounds[name] for name in components]).T
+        points = points[np.all((points >= low - 1e-12) & (points <= high + 1e-12), axis=1)]
+    if len(points) == 0:
+        raise ValueError("no lattice point of %d divisions lies inside the bounds" % divisions)
+    return Composition(*points.T)
+
+
+def runCompositionSweep(feedConfig, F, composition, workers=None, **overrides):
+    # one batched run over every composition point (any shape), outputs in the shape of the composition
+    flat = composition.flat()
+    if np.any(flat.moleFractionNH3 <= 0):
+        raise ValueError("the Temkin-Pyzhev rate is singular without NH3 in the feed - give yNH3 > 0")
+    result = runBatchCached(BatchConfig.fromReactorConfig(
+        feedConfig, F * flat.moleFractionN2, F,
+        initialMoleFractionH2=flat.moleFractionH2,
+        initialMoleFractionN2=flat.moleFractionN2,
+        initialMoleFractionNH3=flat.moleFractionNH3,
+        initialMoleFractionAr=flat.moleFractionAr,
+        **overrides,
+    ), workers=workers)
+    reshape = lambda value: np.real(value).reshape(composition.shape)
+    return CompositionSweep(composition, reshape(result.conversionN2), reshape(result.temp),
+                            reshape(result.peakTemp), reshape(result.moleFractionNH3))
+
+
+def ratioArgonSweep(feedConfig, F, ratios, argonFractions, moleFractionNH3=None, workers=None, **overrides):
+    # map over H2/N2 ratio (axis 0) x argon fraction (axis 1) at the NH3 fraction of feedConfig
+    moleFractionNH3 = feedConfig.initialMoleFractionNH3 if moleFractionNH3 is None else moleFractionNH3
+    ratio, argon = np.meshgrid(ratios, argonFractions, indexing="ij")
+    return runCompositionSweep(feedConfig, F, Composition.fromRatio(ratio, argon, moleFractionNH3), workers,
+                               **overrides)
+
+
+def plotSweepMaps(sweep, ratios, argonFractions, designRatio, designArgon, title):
+    figs = []
+    maps = [
+        ("conversionN2", "Conversion N2", "viridis"),
+        ("outletTemp", "Outlet temperature (K)", "inferno"),
+        ("peakTemp", "Peak temperature (K)", "inferno"),
+    ]
+    for name, label, colourMap in maps:
+        fig, ax = plt.subplots()
+        contour = ax.contourf(ratios, argonFractions, getattr(sweep, name).T, levels=30, cmap=colourMap)
+        fig.colorbar(contour, ax=ax, label=label)
+        if name == "peakTemp":
+            ax.contour(ratios, argonFractions, sweep.peakTemp.T, levels=[catalystMaxTemp], colors="red",
+                       linestyles="dashed")
+        ax.plot(designRatio, designArgon, "w*", markersize=12, label="Design feed")
+        ax.set_xlabel("H2/N2 ratio")
+        ax.set_ylabel("Argon mole fraction")
+        plt.title(title + " - " + label)
+        figs.append(fig)
+
+    dConversionDRatio, dConversionDArgon = sweep.sensitivity("conversionN2", (ratios, argonFractions))
+    for sensitivity, label in ((dConversionDRatio, "dX/d(H2/N2)"), (dConversionDArgon, "dX/dyAr")):
+        fig, ax = plt.subplots()
+        contour = ax.contourf(ratios, argonFractions, sensitivity.T, levels=30, cmap="coolwarm")
+        fig.colorbar(contour, ax=ax, label=label)
+        ax.plot(designRatio, designArgon, "k*", markersize=12, label="Design feed")
+        ax.set_xlabel("H2/N2 ratio")
+        ax.set_ylabel("Argon mole fraction")
+        plt.title(title + " - sensitivity " + label)
+        figs.append(fig)
+    return figs
+
+
+def latticeTable(sweep, numberOfRows=10):
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = "Best feasible lattice compositions (peak T below %.2f K)" % catalystMaxTemp
+    table.field_names = ["yH2", "yN2", "yNH3", "yAr", "H2/N2", "Conversion N2", "Outlet NH3", "Outlet T (K)"]
+    feasible = np.flatnonzero(sweep.peakTemp < catalystMaxTemp)
+    composition = sweep.composition
+    for i in feasible[np.argsort(-sweep.moleFractionNH3[feasible])][:numberOfRows]:
+        table.add_row([round(float(composition.moleFractionH2[i]), 4), round(float(composition.moleFractionN2[i]), 4),
+                       round(float(composition.moleFractionNH3[i]), 4), round(float(composition.moleFractionAr[i]), 4),
+                       round(float(composition.ratioH2N2[i]), 3), round(float(sweep.conversionN2[i]), 5),
+                       round(float(sweep.moleFractionNH3[i]), 5), round(float(sweep.outletTemp[i]), 2)])
+    return table
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    F = 1041.55
+    design = Composition(R1Config.initialMoleFractionH2, R1Config.initialMoleFractionN2,
+                         R1Config.initialMoleFractionNH3, R1Config.initialMoleFractionAr)
+    ratios, argonFractions = np.linspace(*ratioRange), np.linspace(*argonRange)
+    sweep = ratioArgonSweep(R1Config, F, ratios, argonFractions, bedLength=R1Config.baseLength)
+    designRatio, designArgon = float(design.ratioH2N2), float(design.moleFractionAr)
+    dConversionDRatio, dConversionDArgon = sweep.sensitivity("conversionN2", (ratios, argonFractions))
+    i, j = np.argmin(np.abs(ratios - designRatio)), np.argmin(np.abs(argonFractions - designArgon))
+    print("R-601 composition map: ", sweep.conversionN2.size, "feeds")
+    print("    near the design feed (H2/N2 =", round(ratios[i], 3), ", yAr =", round(argonFractions[j], 4), "):")
+    print("    conversion ", round(sweep.conversionN2[i, j], 5), "    dX/d(H2/N2) ", round(dConversionDRatio[i, j], 5),
+          "    dX/dyAr ", round(dConversionDArgon[i, j], 4))
+    best = np.unravel_index(np.argmax(np.where(sweep.peakTemp < catalystMaxTemp, sweep.conversionN2, -np.inf)),
+                            sweep.conversionN2.shape)
+    print("    best feasible conversion ", round(sweep.conversionN2[best], 5), "at H2/N2 =", round(ratios[best[0]], 3),
+          ", yAr =", round(argonFractions[best[1]], 4))
+
+    lattice = simplexLattice(latticeDivisions, latticeBounds)
+    print(latticeTable(runCompositionSweep(R1Config, F, lattice, bedLength=R1Config.baseLength)))
+
+    figs = plotSweepMaps(sweep, ratios, argonFractions, designRatio, designArgon, "R-601")
+    pp = matplotlib.backends.backend_pdf.PdfPages(os.path.join(storagePath, "COMPOSITION_SWEEP.pdf"))
+    for fig in figs:
+        fig.set_size_inches(9.0, 5)
+        fig.gca().legend(loc="best", fontsize=7)
+        pp.savefig(fig, bbox_inches="tight", dpi=300)
+    pp.close()
+
+    showFig = input("Show figures? (y/n): ")
+    if showFig == "y":
+        plt.show()
+    else:
+        plt.close("all")
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
@@ -0,0 +1,180 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Conversion-temperature (X-T) diagram of an adiabatic bed: equilibrium curve, maximum-rate   #
+#                  locus, rate contours and the adiabatic operating lines of any number of inlet temperatures.#
+#                - Everything is evaluated on a (T, X) grid in one vectorized call of the reactor model        #
+#                  (reactorEngine.evaluateLocalRates) - no bed is integrated along its length.                #
+#                - The adiabatic line slope dT/dX is the ratio of calcChangeInTempAcrossBed and                #
+#                  calcChangeOfConversionAcrossBed, so it follows the heat of reaction and Cp correlations.   #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - diagram = buildDiagram(config, inletTemps=[650, 675, 700])   ->  arrays ready for plotting               #
+# - Points where the effectiveness factor polynomial is <= 0 (outside the range it was fitted on) are NaN     #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+tempRange = (600, 850)                  # K
+conversionRange = (0, 0.4)
+gridShape = (251, 201)                  # (nTemp, nConversion)
+adiabaticStep = 1e-4                    # dX for the adiabatic lines
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import os
+import pathlib
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.backends.backend_pdf
+from correlationSets import withCorrelations
+from equilibriumCalcs import solveEquilibriumConversion
+from reactorEngine import BatchConfig, ReactorState, catalystMaxTemp, evaluateLocalRates
+from reactorSim import R1Config, R2Config, R2FN2, R2F
+storagePath = os.path.join(pathlib.Path(__file__).parent.absolute(), "Figures")
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class XTDiagram:
+    temp: np.ndarray                    # K     (nTemp,)
+    conversion: np.ndarray              #       (nConversion,)
+    conversionRate: np.ndarray          # dX/dz, 1/m   (nConversion, nTemp) - NaN outside the valid region
+    equilibriumConversion: np.ndarray   # X_eq(T)      (nTemp,)
+    maxRateTemp: np.ndarray             # K, T of maximum rate at each X (nConversion,) - NaN if at a grid edge
+    adiabaticLines: dict                # inlet T -> (temp, conversion) arrays, up to the equilibrium curve
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def calcAdiabaticSlope(config, temp, conversionN2):
+    # dT/dX along an adiabatic bed - the rate and effectiveness factor cancel in the ratio
+    temp, conversionN2 = np.broadcast_arrays(np.asarray(temp, dtype=float), np.asarray(conversionN2, dtype=float))
+    state = ReactorState(dataclasses.replace(config, incomingTemp=temp))
+    state.conversionN2 = conversionN2
+    state.updateMoleFractionN2()
+    state.updateMoleFractionH2()
+    state.updateMoleFractionNH3()
+    state.updateMoleFractionAr()
+    state.updateHeatOfReaction()
+    state.updateSpecificHeat()
+    state.effFactor = state.rateOfReactionNH3 = 1.0
+    return state.calcChangeInTempAcrossBed() / state.calcChangeOfConversionAcrossBed()
+
+
+def calcEquilibriumCurve(config, temp):
+    return solveEquilibriumConversion(
+        withCorrelations(ReactorState, config.fugacityModel, config.rateModel),
+        temp,
+        config.pressure,
+        config.initialMoleFractionH2,
+        config.initialMoleFractionN2,
+        config.initialMoleFractionNH3,
+        config.initialMoleFractionAr,
+        config.F,
+        config.Fn2,
+    )
+
+
+def calcAdiabaticLines(config, inletTemps, maxConversion, equilibriumTemp, equilibriumConversion, step=adiabaticStep):
+    # Heun's method in X for every inlet at once; each line stops where it meets the (tabulated) equilibrium curve
+    inletTemps = np.atleast_1d(np.asarray(inletTemps, dtype=float))
+    conversion = np.arange(0, maxConversion + step / 2, step)
+    temp = np.full((len(conversion), len(inletTemps)), np.nan)
+    temp[0] = inletTemps
+    active = np.ones(len(inletTemps), dtype=bool)
+    for k in range(1, len(conversion)):
+        previous = temp[k - 1]
+        slope = calcAdiabaticSlope(config, previous, conversion[k - 1])
+        predictor = previous + step * slope
+        temp[k] = previous + 0.5 * step * (slope + calcAdiabaticSlope(config, predictor, conversion[k]))
+        active &= conversion[k] <= np.interp(temp[k], equilibriumTemp, equilibriumConversion)
+        temp[k, ~active] = np.nan
+        if not active.any():
+            break
+    return {inletTemp: (temp[:, i][np.isfinite(temp[:, i])], conversion[np.isfinite(temp[:, i])])
+            for i, inletTemp in enumerate(inletTemps)}
+
+
+def calcMaxRateLocus(temp, conversionRate):
+    # argmax over T of each X row, refined by a parabola through the three points around it
+    rate = np.where(np.isfinite(conversionRate) & (conversionRate > 0), conversionRate, -np.inf)
+    index = np.argmax(rate, axis=1)
+    interior = (index > 0) & (index < len(temp) - 1) & np.isfinite(rate[np.arange(len(rate)), index])
+    index = np.clip(index, 1, len(temp) - 2)
+    rows = np.arange(len(rate))
+    left, centre, right = rate[rows, index - 1], rate[rows, index], rate[rows, index + 1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        shift = 0.5 * (left - right) / (left - 2 * centre + right)
+    shift = np.where(np.isfinite(shift), np.clip(shift, -1, 1), 0)
+    maxRateTemp = temp[index] + shift * (temp[1] - temp[0])
+    interior &= np.isfinite(left) & np.isfinite(right)
+    return np.where(interior, maxRateTemp, np.nan)
+
+
+def buildDiagram(config, inletTemps=(), tempRange=tempRange, conversionRange=conversionRange, shape=gridShape):
+    temp = np.linspace(*tempRange, shape[0])
+    conversion = np.linspace(*conversionRange, shape[1])
+    T, X = np.meshgrid(temp, conversion)
+    conversionRate, _, state = evaluateLocalRates(config, T, X)
+    equilibriumConversion = calcEquilibriumCurve(config, temp)
+    valid = (state.effFactor > 0) & (X < equilibriumConversion[None, :])
+    conversionRate = np.where(valid, conversionRate, np.nan)
+    return XTDiagram(
+        temp,
+        conversion,
+        conversionRate,
+        equilibriumConversion,
+        calcMaxRateLocus(temp, conversionRate),
+        calcAdiabaticLines(config, inletTemps, conversionRange[1], temp, equilibriumConversion),
+    )
+
+
+def plotDiagram(diagram, title, upperTempLimit=catalystMaxTemp):
+    fig, ax = plt.subplots()
+    contour = ax.contourf(diagram.temp, diagram.conversion, diagram.conversionRate, levels=20, cmap="Greens")
+    fig.colorbar(contour, ax=ax, label="dX/dz (1/m)")
+    ax.plot(diagram.temp, diagram.equilibriumConversion, color="orange", label="Equilibrium Conversion")
+    ax.plot(diagram.maxRateTemp, diagram.conversion, color="red", linestyle="--", label="Maximum Rate Locus")
+    for inletTemp, (temp, conversion) in diagram.adiabaticLines.items():
+        ax.plot(temp, conversion, color="blue", linewidth=1)
+        ax.annotate("%d K" % inletTemp, (temp[0], conversion[0]), fontsize=7, rotation=90, va="bottom")
+    ax.axvline(upperTempLimit, color="red", linestyle="dotted", label="Catalyst Max Temperature")
+    ax.plot([], [], color="blue", linewidth=1, label="Adiabatic Operating Lines")
+    ax.set_xlabel("Temperature (K)")
+    ax.set_ylabel("Conversion")
+    ax.set_xlim(diagram.temp[0], diagram.temp[-1])
+    ax.set_ylim(diagram.conversion[0], diagram.conversion[-1])
+    plt.title(title)
+    return fig
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    reactors = [("R-601", BatchConfig.fromReactorConfig(R1Config, 248.153, 1041.55), (625, 650, 673.15, 700)),
+                ("R-602", BatchConfig.fromReactorConfig(R2Config, R2FN2, R2F), (650, 675, 692, 715))]
+    figs = []
+    for name, config, inletTemps in reactors:
+        diagram = buildDiagram(config, inletTemps)
+        for inletTemp, (temp, conversion) in diagram.adiabaticLines.items():
+            print(name, "Inlet: ", inletTemp, "K", "    adiabatic line meets equilibrium at X = ",
+                  round(conversion[-1], 4), "    T = ", round(temp[-1], 2), "K")
+        figs.append(plotDiagram(diagram, name + " Conversion-Temperature Diagram"))
+
+    pp = matplotlib.backends.backend_pdf.PdfPages(os.path.join(storagePath, "XT_DIAGRAM.pdf"))
+    for fig in figs:
+        fig.set_size_inches(9.0, 5)
+        fig.gca().grid(True, linestyle=':')
+        fig.gca().legend(loc="upper left", fontsize=7)
+        pp.savefig(fig, bbox_inches="tight", dpi=300)
+    pp.close()
+
+    showFig = input("Show figures? (y/n): ")
+    if showFig == "y":
+        plt.show()
+    else:
+        plt.close("all")
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
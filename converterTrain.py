@@ -0,0 +1,247 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Converter train of any number of adiabatic beds. Between two beds the gas is either         #
+#                  cooled indirectly (interstage exchanger to a set inlet temperature) or quenched with a     #
+#                  cold shot of fresh feed - a split fraction of the fresh feed bypasses bed 1 and is mixed   #
+#                  with the bed effluent (adiabatic mixing, closed-form enthalpies of heatCapacityCalcs.py).  #
+#                - The stream leaving each stage is passed on automatically (interstageCooler.CoolerInlet is  #
+#                  the stream state: temperature, composition, molar flowrate and pressure).                 #
+#                - Every numeric train parameter may be an array with one entry per case, so a whole screen   #
+#                  of train configurations is one batched integration per bed (reactorEngine).                #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - train = ConverterTrain(bedLengths=(2.1, 5.35), interstages=(IndirectCooling(692),), incomingTemp=673.15)   #
+# - result = runTrain(R1Config, 248.153, 1041.55, train)     ->  result.overallConversion, result.beds, ...     #
+# - main() screens 2-, 3- and 4-bed layouts of the design catalyst volume                                     #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+coldShotTemp = 473.15                   # K    fresh feed used for quenching                                    #
+numberOfCandidates = 256                # train configurations per layout screened in main()                   #
+totalBedLength = 7.45                   # m    catalyst of R-601 + R-602, shared out between the beds          #
+inletTempRange = (640, 700)             # K    bed inlet temperatures after indirect cooling                   #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import numpy as np
+from prettytable import PrettyTable
+from heatCapacityCalcs import calcMixtureEnthalpyChange, calcMixtureHeatCapacity
+from interstageCooler import CoolerInlet, InterstageCooler
+from reactorEngine import BatchConfig, catalystMaxTemp, runBatchParallel
+from reactorSim import R1Config, R2Config
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+mixingTolerance = 1e-8                  # K
+maxMixingIterations = 20
+layouts = {
+    # name:                         interstage types between consecutive beds
+    "2 beds, indirect cooling":     ("cooling",),
+    "3 beds, indirect cooling":     ("cooling", "cooling"),
+    "3 beds, cold-shot quench":     ("quench", "quench"),
+    "4 beds, cold-shot quench":     ("quench", "quench", "quench"),
+    "4 beds, quench + cooling":     ("quench", "cooling", "quench"),
+}
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class IndirectCooling:
+    outletTemp: np.ndarray                  # K - inlet temperature of the next bed
+
+
+@dataclasses.dataclass
+class ColdShotQuench:
+    fraction: np.ndarray                    # share of the fresh feed injected here (bypasses every earlier bed)
+
+
+@dataclasses.dataclass
+class ConverterTrain:
+    bedLengths: tuple                       # m - one entry per bed
+    interstages: tuple                      # IndirectCooling / ColdShotQuench between consecutive beds
+    incomingTemp: np.ndarray                # K - bed 1 inlet
+    coldShotTemp: float = coldShotTemp      # K
+
+    def __post_init__(self):
+        if len(self.interstages) != len(self.bedLengths) - 1:
+            raise ValueError("a train of %d beds needs %d interstages, not %d"
+                             % (len(self.bedLengths), len(self.bedLengths) - 1, len(self.interstages)))
+
+    @property
+    def numberOfBeds(self):
+        return len(self.bedLengths)
+
+    @property
+    def firstBedFraction(self):
+        # fresh feed through bed 1 - what the cold shots leave
+        quench = [stage.fraction for stage in self.interstages if isinstance(stage, ColdShotQuench)]
+        fraction = 1 - np.sum(np.broadcast_arrays(0.0, *quench), axis=0)
+        if np.any(fraction <= 0):
+            raise ValueError("cold-shot fractions must leave some fresh feed for bed 1")
+        return fraction
+
+
+@dataclasses.dataclass
+class TrainResult:
+    beds: list                              # BatchResult of every bed
+    bedInlets: list                         # CoolerInlet (stream state) entering every bed
+    interstageDuties: list                  # kW per interstage, NaN for quenches
+    overallConversion: np.ndarray           # N2 converted / N2 in the fresh feed
+    outlet: CoolerInlet
+
+    @property
+    def peakTemp(self):
+        return np.max([bed.peakTemp for bed in self.beds], axis=0)
+
+    def isFeasible(self, upperTempLimit=catalystMaxTemp):
+        # non-physical cases (NaN anywhere) are infeasible
+        return np.all([bed.peakTemp < upperTempLimit for bed in self.beds], axis=0) & np.isfinite(self.overallConversion)
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def scaleStream(stream, fraction):
+    return dataclasses.replace(stream, molarFlowrate=stream.molarFlowrate * fraction)
+
+
+def mixStreams(first, second):
+    # adiabatic mixing at the pressure of the first stream - Newton on the enthalpy balance for the temperature
+    flowrate = first.molarFlowrate + second.molarFlowrate
+    moleFractions = [(getattr(first, name) * first.molarFlowrate + getattr(second, name) * second.molarFlowrate)
+                     / flowrate for name in ("moleFractionH2", "moleFractionN2", "moleFractionNH3", "moleFractionAr")]
+    composition = lambda stream: (stream.moleFractionH2, stream.moleFractionN2, stream.moleFractionNH3,
+                                  stream.moleFractionAr)
+    temp = (first.temp * first.molarFlowrate + second.temp * second.molarFlowrate) / flowrate
+    for _ in range(maxMixingIterations):
+        imbalance = (first.molarFlowrate * calcMixtureEnthalpyChange(first.temp, temp, *composition(first), first.pressure)
+                     + second.molarFlowrate * calcMixtureEnthalpyChange(second.temp, temp, *composition(second),
+                                                                        first.pressure))
+        slope = (first.molarFlowrate * calcMixtureHeatCapacity(temp, *composition(first), first.pressure)
+                 + second.molarFlowrate * calcMixtureHeatCapacity(temp, *composition(second), first.pressure))
+        correction = imbalance / slope
+        temp = temp - correction
+        if np.all(np.abs(correction) < mixingTolerance):
+            break
+    return CoolerInlet(temp, *moleFractions, flowrate, first.pressure)
+
+
+def runBed(feedConfig, stream, bedLength, upperTempLimit, workers):
+    config = BatchConfig(
+        incomingTemp=stream.temp,
+        pressure=stream.pressure,
+        bedLength=bedLength,
+        initialMoleFractionH2=stream.moleFractionH2,
+        initialMoleFractionN2=stream.moleFractionN2,
+        initialMoleFractionNH3=stream.moleFractionNH3,
+        initialMoleFractionAr=stream.moleFractionAr,
+        F=stream.molarFlowrate,
+        Fn2=stream.molarFlowrate * stream.moleFractionN2,
+        isobaric=feedConfig.isobaric,
+        densityModel=feedConfig.densityModel,
+        effFactorModel=feedConfig.effFactorModel,
+        fugacityModel=feedConfig.fugacityModel,
+        rateModel=feedConfig.rateModel,
+    )
+    result = runBatchParallel(config, upperTempLimit=upperTempLimit, workers=workers)
+    outlet = CoolerInlet(result.temp.real, result.moleFractionH2.real, result.moleFractionN2.real,
+                         result.moleFractionNH3.real, result.moleFractionAr.real,
+                         stream.molarFlowrate - 2 * config.Fn2 * result.conversionN2.real, result.pressure.real)
+    return result, outlet
+
+
+def runTrain(feedConfig, Fn2, F, train, upperTempLimit=catalystMaxTemp, workers=None):
+    # feedConfig gives the fresh feed composition, pressure and bed model options; Fn2, F the fresh feed (kmol/hr)
+    freshFeed = CoolerInlet(train.incomingTemp, feedConfig.initialMoleFractionH2, Fn2 / F,
+                            feedConfig.initialMoleFractionNH3, feedConfig.initialMoleFractionAr, F,
+                            feedConfig.constantPressure)
+    coldShot = dataclasses.replace(freshFeed, temp=train.coldShotTemp)
+    stream = scaleStream(freshFeed, train.firstBedFraction)
+    beds, bedInlets, duties = [], [], []
+    for bed, bedLength in enumerate(train.bedLengths):
+        bedInlets.append(stream)
+        result, stream = runBed(feedConfig, stream, bedLength, upperTempLimit, workers)
+        beds.append(result)
+        if bed == train.numberOfBeds - 1:
+            break
+        stage = train.interstages[bed]
+        if isinstance(stage, IndirectCooling):
+            duties.append(InterstageCooler(outletTemp=stage.outletTemp).calcDuty(stream))
+            stream = dataclasses.replace(stream, temp=np.broadcast_to(stage.outletTemp, np.shape(stream.temp)))
+        else:
+            duties.append(np.full(np.shape(stream.temp), np.nan))
+            stream = mixStreams(stream, scaleStream(coldShot, stage.fraction))
+    overallConversion = 1 - stream.molarFlowrate * stream.moleFractionN2 / Fn2
+    return TrainResult(beds, bedInlets, duties, overallConversion, stream)
+
+
+def sampleTrain(layout, numberOfCandidates, generator):
+    # random train configurations of one layout sharing totalBedLength of catalyst
+    numberOfBeds = len(layout) + 1
+    bedLengths = tuple(totalBedLength * generator.dirichlet(np.full(numberOfBeds, 2.0), numberOfCandidates).T)
+    interstages = []
+    for stage in layout:
+        if stage == "cooling":
+            interstages.append(IndirectCooling(generator.uniform(*inletTempRange, numberOfCandidates)))
+        else:
+            interstages.append(ColdShotQuench(generator.uniform(0.05, 0.5 / len(layout), numberOfCandidates)))
+    incomingTemp = generator.uniform(*inletTempRange, numberOfCandidates)
+    return ConverterTrain(bedLengths, tuple(interstages), incomingTemp)
+
+
+def caseValue(value, index):
+    value = np.asarray(value)
+    return value if value.ndim == 0 else value[index]
+
+
+def describeCase(train, index):
+    stages = []
+    for stage in train.interstages:
+        if isinstance(stage, IndirectCooling):
+            stages.append("cool to %.0f K" % caseValue(stage.outletTemp, index))
+        else:
+            stages.append("shot %.1f %%" % (100 * caseValue(stage.fraction, index)))
+    lengths = "/".join("%.2f" % caseValue(length, index) for length in train.bedLengths)
+    return "L = %s m, T in %.0f K, %s" % (lengths, caseValue(train.incomingTemp, index), ", ".join(stages))
+
+
+def screeningTable(rows):
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = "Converter train screening - %d configurations per layout, %.2f m of catalyst" % (
+        numberOfCandidates, totalBedLength)
+    table.field_names = ["Layout", "Feasible", "Best overall conversion", "Peak T (K)", "Outlet NH3", "Best train"]
+    for name, train, result in rows:
+        feasible = result.isFeasible()
+        if not feasible.any():
+            table.add_row([name, 0, "-", "-", "-", "-"])
+            continue
+        best = np.argmax(np.where(feasible, result.overallConversion, -np.inf))
+        table.add_row([name, int(feasible.sum()), round(float(result.overallConversion[best]), 5),
+                       round(float(result.peakTemp[best]), 2), round(float(result.outlet.moleFractionNH3[best]), 5),
+                       describeCase(train, best)])
+    table.align["Best train"] = "l"
+    return table
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    design = ConverterTrain(bedLengths=(R1Config.baseLength, R2Config.baseLength),
+                            interstages=(IndirectCooling(R2Config.incomingTemp),), incomingTemp=R1Config.incomingTemp)
+    result = runTrain(R1Config, 248.153, 1041.55, design)
+    print("Design train (R-601 -> cooler -> R-602): overall conversion ", round(float(result.overallConversion[0]), 5),
+          "    outlet T ", round(float(result.outlet.temp[0]), 3), "K    cooler duty ",
+          round(float(result.interstageDuties[0][0]) / 1e3, 3), "MW")
+
+    generator = np.random.default_rng(0)
+    rows = []
+    for name, layout in layouts.items():
+        train = sampleTrain(layout, numberOfCandidates, generator)
+        # candidates running far past the catalyst limit overflow - they are screened out as infeasible
+        with np.errstate(invalid="ignore", over="ignore"):
+            rows.append((name, train, runTrain(R1Config, 248.153, 1041.55, train)))
+    print(screeningTable(rows))
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
@@ -0,0 +1,254 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Registry of the correlation sets behind ReactorCalcs, selected per run:                    #
+#                    fugacity (fugacityModel) - calcFugacityH2 / N2 / NH3                                     #
+#                    rate     (rateModel)     - calcReactionRateConstant, calcRateOfReactionNH3               #
+#                - A set is a pair of mixin classes with the same methods: one over NumPy arrays (batch       #
+#                  engine, complex-step safe) and one over Python floats with the math module (the per-step   #
+#                  reactorSim.Reactor, where NumPy's per-call overhead dominates). Both are checked against   #
+#                  each other on a (T, P, X) grid when the set is registered.                                 #
+#                - withCorrelations mixes the chosen sets into an engine class. ReactorState and Reactor do   #
+#                  that on construction, so type(reactor) carries the sets into equilibriumCalcs and          #
+#                  pelletModel like any other ReactorCalcs method.                                            #
+#                - Cubic equations of state (pengRobinson, soaveRedlichKwong): cubicEquationOfState.py        #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - BatchConfig(..., fugacityModel="idealGas", rateModel="temkinPyzhevPressure")                               #
+# - Reactor(..., fugacityModel="idealGas")  /  ReactorConfig(..., fugacityModel="idealGas")                     #
+# - registerCorrelationSet(CorrelationSet("myFits", "fugacity", MyFugacityCalcs, MyFugacityCalcsScalar))       #
+#   raises ValueError when the two implementations disagree                                                   #
+# - python correlationSets.py   verification, per-call cost and R-601 outlet for every registered combination  #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import math
+import types
+import numpy as np
+from reactorCalcs_1 import FugacityCalcs, KineticsCalcs, R, ReactorCalcs
+from cubicEquationOfState import (PengRobinsonFugacity, PengRobinsonFugacityScalar, SoaveRedlichKwongFugacity,
+                                  SoaveRedlichKwongFugacityScalar)
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+verificationTolerance = 1e-12           #        relative, scalar against array                                 #
+verificationTemps = (450, 950, 11)      # K      (low, high, points) of the verification grid                  #
+verificationPressures = (100, 350, 6)   # atm                                                                   #
+verificationConversions = (0, 0.4, 5)   #                                                                       #
+correlationMethods = {
+    "fugacity": ("calcFugacityH2", "calcFugacityN2", "calcFugacityNH3"),
+    "rate": ("calcReactionRateConstant", "calcRateOfReactionNH3"),
+}
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass(frozen=True)
+class CorrelationSet:
+    name: str
+    kind: str                           # "fugacity" or "rate"
+    arrayCalcs: type                    # mixin with the kind's methods over NumPy arrays
+    scalarCalcs: type                   # the same methods over Python floats
+    description: str = ""
+
+    def __post_init__(self):
+        if self.kind not in correlationMethods:
+            raise ValueError("kind must be one of %s, not %r" % (tuple(correlationMethods), self.kind))
+        for calcs in (self.arrayCalcs, self.scalarCalcs):
+            missing = [method for method in correlationMethods[self.kind] if not hasattr(calcs, method)]
+            if missing:
+                raise ValueError("%s lacks %s" % (calcs.__name__, ", ".join(missing)))
+
+
+# scalar mixins override only the methods that call NumPy - plain arithmetic is shared with the array set
+
+class GillespieBeattieScalar:
+    calcFugacityN2 = FugacityCalcs.calcFugacityN2
+    calcFugacityNH3 = FugacityCalcs.calcFugacityNH3
+
+    def calcFugacityH2(self):
+        return math.exp(
+            math.exp(-3.8402 * (self.temp**0.125) + 0.541) * self.pressure
+            - math.exp(-0.1263 * (self.temp**0.5) - 15.98) * self.pressure**2
+            + 300 * math.exp(-0.011901 * self.temp - 5.941) * math.exp(-self.pressure / 300)
+        )
+
+
+class IdealGasFugacity:
+    # phi = 1 - in the shape (and dtype) of temp * pressure
+    def calcFugacityH2(self):
+        return 1 + 0 * (self.temp * self.pressure)
+
+    calcFugacityN2 = calcFugacityNH3 = calcFugacityH2
+
+
+class IdealGasFugacityScalar:
+    def calcFugacityH2(self):
+        return 1.0
+
+    calcFugacityN2 = calcFugacityNH3 = calcFugacityH2
+
+
+class TemkinPyzhevScalar:
+    calcRateOfReactionNH3 = KineticsCalcs.calcRateOfReactionNH3
+
+    def calcReactionRateConstant(self):
+        return self.ko * math.exp(-self.E / (R * (self.temp)))
+
+
+class TemkinPyzhevPressure:
+    # original Temkin-Pyzhev form in partial pressures - the kinetics ignore the fugacity coefficients, so the rate
+    # vanishes at the ideal-gas equilibrium (pair with fugacityModel="idealGas" for a consistent equilibrium)
+    def calcReactionRateConstant(self):
+        return self.ko * np.exp(-self.E / (R * (self.temp)))
+
+    def calcRateOfReactionNH3(self):
+        pressureH2 = self.moleFractionH2 * self.pressure
+        pressureN2 = self.moleFractionN2 * self.pressure
+        pressureNH3 = self.moleFractionNH3 * self.pressure
+        return 2 * self.reactionRateConstant * (
+            self.equilibriumConstant**2 * pressureN2 * (pressureH2**3 / pressureNH3**2) ** self.alpha
+            - (pressureNH3**2 / pressureH2**3) ** (1 - self.alpha)
+        )
+
+
+class TemkinPyzhevPressureScalar:
+    calcReactionRateConstant = TemkinPyzhevScalar.calcReactionRateConstant
+    calcRateOfReactionNH3 = TemkinPyzhevPressure.calcRateOfReactionNH3
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+registry = {kind: {} for kind in correlationMethods}
+composedClasses = {}
+
+
+def buildVerificationState():
+    # every input of the correlation methods on a (T, P, X) grid of the R-601 feed, from the default set
+    temps, pressures, conversions = np.meshgrid(np.linspace(*verificationTemps), np.linspace(*verificationPressures),
+                                                np.linspace(*verificationConversions), indexing="ij")
+    state = types.SimpleNamespace(
+        temp=temps.ravel(), pressure=pressures.ravel(), conversionN2=conversions.ravel(),
+        initialMoleFractionH2=0.714089, initialMoleFractionN2=0.238253, initialMoleFractionNH3=0.0213228,
+        initialMoleFractionAr=0.0262431, F=1041.55, Fn2=248.153,
+        ko=ReactorCalcs.ko, E=ReactorCalcs.E, alpha=ReactorCalcs.alpha,
+    )
+    for name in ("MoleFractionH2", "MoleFractionN2", "MoleFractionNH3", "MoleFractionAr", "FugacityH2", "FugacityN2",
+                 "FugacityNH3", "ActivationCoefficientH2", "ActivationCoefficientN2", "ActivationCoefficientNH3",
+                 "ReactionRateConstant", "EquilibriumConstant"):
+        setattr(state, name[0].lower() + name[1:], getattr(ReactorCalcs, "calc" + name)(state))
+    return state
+
+
+def verifyCorrelationSet(correlationSet):
+    # -> {method: largest relative scalar-array difference}; ValueError above verificationTolerance
+    state = buildVerificationState()
+    numberOfPoints = state.temp.size
+    points = [types.SimpleNamespace(**{name: float(np.broadcast_to(value, (numberOfPoints,))[i])
+                                       for name, value in vars(state).items()}) for i in range(numberOfPoints)]
+    deviations = {}
+    for method in correlationMethods[correlationSet.kind]:
+        arrayValues = np.broadcast_to(getattr(correlationSet.arrayCalcs, method)(state), (numberOfPoints,))
+        scalarValues = np.array([getattr(correlationSet.scalarCalcs, method)(point) for point in points])
+        deviations[method] = float(np.max(np.abs(scalarValues - arrayValues)
+                                          / np.maximum(np.abs(arrayValues), np.finfo(float).tiny)))
+        if not deviations[method] <= verificationTolerance:
+            raise ValueError("%s correlation set %r: scalar and array %s differ by %.3g (relative)"
+                             % (correlationSet.kind, correlationSet.name, method, deviations[method]))
+    return deviations
+
+
+def registerCorrelationSet(correlationSet):
+    verifyCorrelationSet(correlationSet)
+    registry[correlationSet.kind][correlationSet.name] = correlationSet
+    return correlationSet
+
+
+def findCorrelationSet(kind, name):
+    if name not in registry[kind]:
+        raise ValueError("%sModel must be one of %s, not %r" % (kind, tuple(registry[kind]), name))
+    return registry[kind][name]
+
+
+def withCorrelations(cls, fugacityModel, rateModel, scalar=False):
+    # cls with the chosen sets mixed in ahead of its own methods (cls itself when it already has them)
+    key = (cls, fugacityModel, rateModel, scalar)
+    if key not in composedClasses:
+        correlationSets = (findCorrelationSet("fugacity", fugacityModel), findCorrelationSet("rate", rateModel))
+        mixins = tuple(correlationSet.scalarCalcs if scalar else correlationSet.arrayCalcs
+                       for correlationSet in correlationSets)
+        mixins = tuple(mixin for mixin in mixins if mixin not in cls.__mro__)
+        if not mixins:
+            composedClasses[key] = cls
+        else:
+            composed = type("%s[%s, %s]" % (cls.__name__, fugacityModel, rateModel), mixins + (cls,),
+                            {"fugacityModel": fugacityModel, "rateModel": rateModel})
+            composed.arrayCalcs = withCorrelations(ReactorCalcs, fugacityModel, rateModel) if scalar else composed
+            composedClasses[key] = composed
+    return composedClasses[key]
+
+
+registerCorrelationSet(CorrelationSet("gillespieBeattie", "fugacity", FugacityCalcs, GillespieBeattieScalar,
+                                      "Gillespie-Beattie fits (design basis)"))
+registerCorrelationSet(CorrelationSet("idealGas", "fugacity", IdealGasFugacity, IdealGasFugacityScalar,
+                                      "ideal gas, phi = 1"))
+registerCorrelationSet(CorrelationSet("pengRobinson", "fugacity", PengRobinsonFugacity, PengRobinsonFugacityScalar,
+                                      "Peng-Robinson, local mixture"))
+registerCorrelationSet(CorrelationSet("soaveRedlichKwong", "fugacity", SoaveRedlichKwongFugacity,
+                                      SoaveRedlichKwongFugacityScalar, "Soave-Redlich-Kwong, local mixture"))
+registerCorrelationSet(CorrelationSet("temkinPyzhev", "rate", KineticsCalcs, TemkinPyzhevScalar,
+                                      "Temkin-Pyzhev in activities, Dyson-Simon (design basis)"))
+registerCorrelationSet(CorrelationSet("temkinPyzhevPressure", "rate", TemkinPyzhevPressure, TemkinPyzhevPressureScalar,
+                                      "Temkin-Pyzhev in partial pressures"))
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    import itertools
+    import timeit
+    from prettytable import PrettyTable
+    from reactorEngine import BatchConfig, runBatch
+    from reactorSim import R1Config, Reactor
+
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = "Registered correlation sets - scalar against array"
+    table.field_names = ["Kind", "Name", "Description", "Method", "Max relative difference",
+                         "Scalar call (us)", "NumPy on a float (us)", "Array, per point (us)"]
+    state = buildVerificationState()
+    point = types.SimpleNamespace(**{name: float(np.ravel(value)[0]) for name, value in vars(state).items()})
+    for kind, correlationSets in registry.items():
+        for name, correlationSet in correlationSets.items():
+            for index, (method, deviation) in enumerate(verifyCorrelationSet(correlationSet).items()):
+                scalarCall = getattr(correlationSet.scalarCalcs, method)
+                arrayCall = getattr(correlationSet.arrayCalcs, method)
+                table.add_row([kind if index == 0 else "", name if index == 0 else "",
+                               correlationSet.description if index == 0 else "", method, "%.2e" % deviation,
+                               round(min(timeit.repeat(lambda: scalarCall(point), number=2000, repeat=3)) / 2e-3, 3),
+                               round(min(timeit.repeat(lambda: arrayCall(point), number=2000, repeat=3)) / 2e-3, 3),
+                               round(min(timeit.repeat(lambda: arrayCall(state), number=200, repeat=3)) / 2e-4
+                                     / state.temp.size, 4)])
+    print(table)
+
+    # R-601 design bed with every combination: batch engine (array sets) against reactorSim.Reactor (scalar sets)
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = "R-601 outlet (%.2f m) by correlation set" % R1Config.baseLength
+    table.field_names = ["Fugacity", "Rate", "Outlet T (K)", "Conversion N2", "Reactor (scalar) - runBatch (K)"]
+    iterations = int(round(R1Config.baseLength / R1Config.StepSize))
+    for fugacityModel, rateModel in itertools.product(registry["fugacity"], registry["rate"]):
+        config = BatchConfig.fromReactorConfig(R1Config, 248.153, 1041.55, bedLength=R1Config.baseLength,
+                                               fugacityModel=fugacityModel, rateModel=rateModel)
+        result = runBatch(config)
+        reactor = Reactor(R1Config.StepSize, R1Config.incomingTemp, R1Config.constantPressure, R1Config.baseLength,
+                          R1Config.initialMoleFractionH2, R1Config.initialMoleFractionN2,
+                          R1Config.initialMoleFractionNH3, R1Config.initialMoleFractionAr, 248.153, 1041.55,
+                          fugacityModel=fugacityModel, rateModel=rateModel)
+        reactor.run(iterations)
+        table.add_row([fugacityModel, rateModel, round(float(result.temp[0]), 4),
+                       round(float(result.conversionN2[0]), 6), "%.2e" % (reactor.temp - float(result.temp[0]))])
+    print(table)
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
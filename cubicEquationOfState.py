@@ -0,0 +1,246 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Fugacity coefficients of the H2 / N2 / NH3 / Ar mixture from a cubic equation of state     #
+#                  (Peng-Robinson or Soave-Redlich-Kwong, van der Waals one-fluid mixing rules), in place of  #
+#                  the Gillespie-Beattie fits that only hold near the original design pressure.               #
+#                - The cubic in Z is solved in closed form (Cardano, trigonometric form for three real roots) #
+#                  over whole arrays of (T, P, y), then polished by one Newton step in the full coefficients, #
+#                  which also carries complex-step derivatives through the root.                              #
+#                - Composition-independent coefficients (sqrt(a_i) and b_i factors, kappa_i, 1 - k_ij) are    #
+#                  computed once per equation of state; the solved mixture is cached on the state, so the     #
+#                  three calcFugacity calls of a step share a single cubic solve.                             #
+#                - Registered in correlationSets.py as fugacityModel="pengRobinson" / "soaveRedlichKwong".    #
+#                  The coefficients depend on the local composition (fugacityDependsOnComposition), which     #
+#                  updateRates, solveEquilibriumConversion and pelletModel provide before calling them.       #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - BatchConfig(..., fugacityModel="pengRobinson")  /  Reactor(..., fugacityModel="soaveRedlichKwong")        #
+# - lnPhi = calcLogFugacityCoefficients(pengRobinson, T, P, (yH2, yN2, yNH3, yAr))   shape (4,) + shape of T  #
+# - binary interaction parameters: CubicEOS(..., binaryInteraction=kij) with kij a 4 x 4 symmetric array      #
+# - python cubicEquationOfState.py   coefficients against the Gillespie-Beattie fits, equilibrium conversion  #
+#   and per-step cost over 150 - 300 atm                                                                      #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import math
+import numpy as np
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+components = ("H2", "N2", "NH3", "Ar")
+criticalTemp = (33.19, 126.2, 405.4, 150.86)            # K                                                   #
+criticalPressure = (12.96, 33.54, 112.05, 48.34)        # atm                                                 #
+acentricFactor = (-0.216, 0.0377, 0.2526, -0.002)       #                                                     #
+# no binary interaction by default (k_ij = 0) - H2, N2 and Ar are far above their critical temperatures       #
+binaryInteraction = ((0.0,) * 4,) * 4                                                                         #
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class CubicEOS:
+    name: str
+    omegaA: float
+    omegaB: float
+    delta1: float                       # Z^3 form with (Z + delta1 B)(Z + delta2 B) in the attraction term
+    delta2: float
+    kappaCoeff: tuple                   # kappa = c0 + c1 w + c2 w^2 of the Soave alpha function
+    binaryInteraction: tuple = binaryInteraction
+
+    def __post_init__(self):
+        # reduced coefficients: sqrt(A_i) = sqrtACoeff_i (1 + kappa_i (1 - sqrt(T / Tc_i))) sqrt(P) / T
+        #                       B_i       = bCoeff_i P / T
+        temp, pressure, omega = (np.array(value, dtype=float) for value in
+                                 (criticalTemp, criticalPressure, acentricFactor))
+        self.kappa = self.kappaCoeff[0] + self.kappaCoeff[1] * omega + self.kappaCoeff[2] * omega**2
+        self.sqrtACoeff = np.sqrt(self.omegaA) * temp / np.sqrt(pressure)
+        self.bCoeff = self.omegaB * temp / pressure
+        self.inverseSqrtCriticalTemp = 1 / np.sqrt(temp)
+        self.interaction = 1 - np.array(self.binaryInteraction, dtype=float)
+        # the same as Python floats for the scalar solver
+        self.componentCoeff = tuple(zip(self.sqrtACoeff.tolist(), self.kappa.tolist(),
+                                        self.inverseSqrtCriticalTemp.tolist(), self.bCoeff.tolist()))
+        self.interactionRows = tuple(tuple(row) for row in self.interaction.tolist())
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def solveCubicGasRoot(c2, c1, c0):
+    # largest real root of Z^3 + c2 Z^2 + c1 Z + c0 = 0 (gas or supercritical root), elementwise in closed form on
+    # the real parts, then one Newton step in the full coefficients
+    a2, a1, a0 = np.real(c2), np.real(c1), np.real(c0)
+    p = a1 - a2**2 / 3
+    halfQ = a2**3 / 27 - a2 * a1 / 6 + a0 / 2
+    discriminant = halfQ**2 + (p / 3) ** 3
+    sqrtDiscriminant = np.sqrt(np.maximum(discriminant, 0))
+    oneRealRoot = np.cbrt(-halfQ + sqrtDiscriminant) + np.cbrt(-halfQ - sqrtDiscriminant)
+    radius = np.sqrt(np.maximum(-p / 3, 0))
+    cosine = np.clip(-halfQ / np.where(radius > 0, radius, 1) ** 3, -1, 1)
+    threeRealRoots = 2 * radius * np.cos(np.arccos(cosine) / 3)
+    root = np.where(discriminant > 0, oneRealRoot, threeRealRoots) - a2 / 3
+    return root - (((root + c2) * root + c1) * root + c0) / ((3 * root + 2 * c2) * root + c1)
+
+
+def solveCubicGasRootScalar(c2, c1, c0):
+    p = c1 - c2**2 / 3
+    halfQ = c2**3 / 27 - c2 * c1 / 6 + c0 / 2
+    discriminant = halfQ**2 + (p / 3) ** 3
+    if discriminant > 0:
+        sqrtDiscriminant = math.sqrt(discriminant)
+        root = (math.copysign(abs(-halfQ + sqrtDiscriminant) ** (1 / 3), -halfQ + sqrtDiscriminant)
+                + math.copysign(abs(-halfQ - sqrtDiscriminant) ** (1 / 3), -halfQ - sqrtDiscriminant))
+    else:
+        radius = math.sqrt(max(-p / 3, 0))
+        cosine = min(max(-halfQ / (radius if radius > 0 else 1) ** 3, -1), 1)
+        root = 2 * radius * math.cos(math.acos(cosine) / 3)
+    root -= c2 / 3
+    return root - (((root + c2) * root + c1) * root + c0) / ((3 * root + 2 * c2) * root + c1)
+
+
+def calcLogFugacityCoefficients(eos, temp, pressure, moleFractions):
+    # ln phi_i of the gas root for (H2, N2, NH3, Ar) - shape (4,) + broadcast shape of the inputs, complex kept
+    temp, pressure, *moleFractions = np.broadcast_arrays(temp, pressure, *moleFractions)
+    y = np.stack(moleFractions)
+    expand = (slice(None),) + (None,) * temp.ndim
+    sqrtA = (eos.sqrtACoeff[expand] * (1 + eos.kappa[expand] * (1 - np.sqrt(temp) * eos.inverseSqrtCriticalTemp[expand]))
+             * np.sqrt(pressure) / temp)
+    componentB = eos.bCoeff[expand] * pressure / temp
+    # sum_j y_j A_ij with A_ij = sqrt(A_i A_j) (1 - k_ij)
+    attraction = sqrtA * np.tensordot(eos.interaction, y * sqrtA, axes=1)
+    A = np.sum(y * attraction, axis=0)
+    B = np.sum(y * componentB, axis=0)
+    u, w = eos.delta1 + eos.delta2, eos.delta1 * eos.delta2
+    Z = solveCubicGasRoot((u - 1) * B - 1, A + w * B**2 - u * B * (B + 1), -(A * B + w * B**2 * (B + 1)))
+    ratio = componentB / B
+    logTerm = np.log((Z + eos.delta1 * B) / (Z + eos.delta2 * B))
+    return (ratio * (Z - 1) - np.log(Z - B)
+            - A / ((eos.delta1 - eos.delta2) * B) * (2 * attraction / A - ratio) * logTerm)
+
+
+def calcLogFugacityCoefficientsScalar(eos, temp, pressure, moleFractions):
+    sqrtTemp, sqrtPressure = math.sqrt(temp), math.sqrt(pressure)
+    sqrtA = [coeff * (1 + kappa * (1 - sqrtTemp * inverseSqrtTc)) * sqrtPressure / temp
+             for coeff, kappa, inverseSqrtTc, _ in eos.componentCoeff]
+    componentB = [bCoeff * pressure / temp for *_, bCoeff in eos.componentCoeff]
+    weighted = [moleFraction * value for moleFraction, value in zip(moleFractions, sqrtA)]
+    attraction = [value * sum(k * term for k, term in zip(row, weighted))
+                  for value, row in zip(sqrtA, eos.interactionRows)]
+    A = sum(moleFraction * value for moleFraction, value in zip(moleFractions, attraction))
+    B = sum(moleFraction * value for moleFraction, value in zip(moleFractions, componentB))
+    u, w = eos.delta1 + eos.delta2, eos.delta1 * eos.delta2
+    Z = solveCubicGasRootScalar((u - 1) * B - 1, A + w * B**2 - u * B * (B + 1), -(A * B + w * B**2 * (B + 1)))
+    logTerm = math.log((Z + eos.delta1 * B) / (Z + eos.delta2 * B))
+    scale = A / ((eos.delta1 - eos.delta2) * B)
+    logZB = math.log(Z - B)
+    return tuple(b / B * (Z - 1) - logZB - scale * (2 * a / A - b / B) * logTerm
+                 for a, b in zip(attraction, componentB))
+
+
+def cachedLogFugacityCoefficients(eos, calcLogFugacity, state):
+    # one cubic solve per state and step - keyed on the identity of the inputs, which the march replaces each step
+    key = (eos, calcLogFugacity, state.temp, state.pressure, state.moleFractionH2, state.moleFractionN2,
+           state.moleFractionNH3, state.moleFractionAr)
+    cached = getattr(state, "eosCache", None)
+    if cached is None or any(new is not old for new, old in zip(key, cached[0])):
+        state.eosCache = cached = (key, calcLogFugacity(eos, state.temp, state.pressure, key[4:]))
+    return cached[1]
+
+
+def buildFugacityCalcs(eos, scalar=False):
+    # correlation-set mixin (correlationSets.py) with calcFugacityH2 / N2 / NH3 from eos
+    calcLogFugacity = calcLogFugacityCoefficientsScalar if scalar else calcLogFugacityCoefficients
+    exp = math.exp if scalar else np.exp
+
+    def fugacityMethod(index):
+        def calcFugacity(self):
+            return exp(cachedLogFugacityCoefficients(eos, calcLogFugacity, self)[index])
+        return calcFugacity
+
+    name = eos.name[0].upper() + eos.name[1:] + "Fugacity" + ("Scalar" if scalar else "")
+    return type(name, (), {"fugacityDependsOnComposition": True, "calcFugacityH2": fugacityMethod(0),
+                           "calcFugacityN2": fugacityMethod(1), "calcFugacityNH3": fugacityMethod(2)})
+
+
+pengRobinson = CubicEOS("pengRobinson", 0.45723553, 0.07779607, 1 + math.sqrt(2), 1 - math.sqrt(2),
+                        (0.37464, 1.54226, -0.26992))
+soaveRedlichKwong = CubicEOS("soaveRedlichKwong", 0.42748023, 0.08664035, 1.0, 0.0, (0.480, 1.574, -0.176))
+PengRobinsonFugacity = buildFugacityCalcs(pengRobinson)
+PengRobinsonFugacityScalar = buildFugacityCalcs(pengRobinson, scalar=True)
+SoaveRedlichKwongFugacity = buildFugacityCalcs(soaveRedlichKwong)
+SoaveRedlichKwongFugacityScalar = buildFugacityCalcs(soaveRedlichKwong, scalar=True)
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    import timeit
+    import types
+    from prettytable import PrettyTable
+    from equilibriumCalcs import solveEquilibriumConversion
+    from reactorCalcs_1 import ReactorCalcs
+    from correlationSets import withCorrelations
+
+    feed = (0.714089, 0.238253, 0.0213228, 0.0262431)           # R-601 feed - H2, N2, NH3, Ar
+    models = ("gillespieBeattie", "pengRobinson", "soaveRedlichKwong")
+    equationsOfState = {eos.name: eos for eos in (pengRobinson, soaveRedlichKwong)}
+    calcs = {model: withCorrelations(ReactorCalcs, model, "temkinPyzhev") for model in models}
+
+    def fugacityCoefficients(model, temp, pressure):
+        state = types.SimpleNamespace(temp=temp, pressure=pressure, moleFractionH2=feed[0], moleFractionN2=feed[1],
+                                      moleFractionNH3=feed[2], moleFractionAr=feed[3])
+        return [float(getattr(calcs[model], "calcFugacity" + name)(state)) for name in components[:3]]
+
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = "Fugacity coefficients of the R-601 feed"
+    table.field_names = ["T (K)", "P (atm)", "Model", "phi H2", "phi N2", "phi NH3"]
+    for temp in (650, 750):
+        for pressure in (150, 225, 300):
+            for index, model in enumerate(models):
+                table.add_row([temp if index == 0 else "", pressure if index == 0 else "", model]
+                              + [round(value, 4) for value in fugacityCoefficients(model, temp, pressure)])
+    print(table)
+
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = "Equilibrium N2 conversion of the R-601 feed"
+    table.field_names = ["T (K)"] + ["%s, %d atm" % (model, pressure) for pressure in (150, 300) for model in models]
+    temps = np.arange(650, 801, 25)
+    conversions = [solveEquilibriumConversion(calcs[model], temps, pressure, *feed)
+                   for pressure in (150, 300) for model in models]
+    for row, temp in enumerate(temps):
+        table.add_row([temp] + [round(float(conversion[row]), 4) for conversion in conversions])
+    print(table)
+
+    # cost of the three fugacity calls of one integration step for a batch of cases
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = "Fugacity calls per integration step (150 - 300 atm, 600 - 800 K)"
+    table.field_names = ["Model", "Cases", "Per step (ms)", "Per case (us)", "Without the mixture cache (ms)"]
+    random = np.random.default_rng(0)
+    for numberOfCases in (1000, 100000):
+        temp = random.uniform(600, 800, numberOfCases)
+        pressure = random.uniform(150, 300, numberOfCases)
+        moleFractions = [np.full(numberOfCases, value) for value in feed]
+        for model in models:
+            def step():
+                # a new state each step, as the march replaces temp with a new array
+                state = types.SimpleNamespace(temp=temp.copy(), pressure=pressure, moleFractionH2=moleFractions[0],
+                                              moleFractionN2=moleFractions[1], moleFractionNH3=moleFractions[2],
+                                              moleFractionAr=moleFractions[3])
+                for name in components[:3]:
+                    getattr(calcs[model], "calcFugacity" + name)(state)
+
+            def uncached():
+                for _ in components[:3]:
+                    calcLogFugacityCoefficients(equationsOfState[model], temp, pressure, moleFractions)
+
+            perStep = min(timeit.repeat(step, number=10, repeat=3)) / 10
+            table.add_row([model, numberOfCases, round(perStep * 1e3, 3), round(perStep * 1e6 / numberOfCases, 4),
+                           "-" if model == "gillespieBeattie"
+                           else round(min(timeit.repeat(uncached, number=10, repeat=3)) / 10 * 1e3, 3)])
+    print(table)
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
@@ -0,0 +1,143 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Equilibrium N2 conversion of the ammonia synthesis reaction for a given (T, P, feed).       #
+#                - Solves  ln K(T) = ln [ a_NH3 / (a_N2^0.5 * a_H2^1.5) ]  for the conversion X, where K is     #
+#                  calcEquilibriumConstant and the activities a_i = phi_i * y_i * P come from the fugacity,    #
+#                  mole fraction and activation coefficient correlations of the reactor model itself - the     #
+#                  same condition at which calcRateOfReactionNH3 is zero.                                     #
+#                - Safeguarded Newton (bisection fallback inside the physical bracket of X), vectorized over   #
+#                  any number of (T, P, feed) points and warm-startable from a previous solution.              #
+#                - EquilibriumTable precomputes X on a (T, P, feed NH3 fraction) grid for a fixed H2/N2 ratio  #
+#                  and Ar fraction, so equilibrium curves of whole sweeps are a single interpolation call.    #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - calcs is the class that provides the correlations (reactorCalcs_1.ReactorCalcs or a subclass)            #
+# - X = solveEquilibriumConversion(ReactorCalcs, temp, pressure, yH2, yN2, yNH3, yAr)                          #
+# - table = EquilibriumTable.build(ReactorCalcs, (550, 850), (150, 300), (0, 0.1));  X = table(T, P, yNH3)    #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import types
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+conversionTolerance = 1e-12                                                                                   #
+maxIterations = 100                                                                                           #
+complexStep = 1e-20                     # dg/dX by complex step through the mole fraction correlations        #
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class EquilibriumTable:
+    temp: np.ndarray                    # K     - grid axes
+    pressure: np.ndarray                # atm
+    initialMoleFractionNH3: np.ndarray
+    ratioH2N2: float                    # feed basis of the table
+    initialMoleFractionAr: float
+    conversionN2: np.ndarray            # (nTemp, nPressure, nNH3)
+    method: str = "cubic"
+
+    def __post_init__(self):
+        self.interpolator = RegularGridInterpolator(
+            (self.temp, self.pressure, self.initialMoleFractionNH3), self.conversionN2, method=self.method)
+
+    @classmethod
+    def build(cls, calcs, tempRange, pressureRange, moleFractionNH3Range, ratioH2N2=3.0,
+              initialMoleFractionAr=0.0262431, shape=(121, 31, 21), method="cubic"):
+        temp = np.linspace(*tempRange, shape[0])
+        pressure = np.linspace(*pressureRange, shape[1])
+        moleFractionNH3 = np.linspace(*moleFractionNH3Range, shape[2])
+        T, P, yNH3 = np.meshgrid(temp, pressure, moleFractionNH3, indexing="ij")
+        yN2 = (1 - yNH3 - initialMoleFractionAr) / (1 + ratioH2N2)
+        conversionN2 = solveEquilibriumConversion(calcs, T, P, ratioH2N2 * yN2, yN2, yNH3, initialMoleFractionAr)
+        return cls(temp, pressure, moleFractionNH3, ratioH2N2, initialMoleFractionAr, conversionN2, method)
+
+    def __call__(self, temp, pressure, initialMoleFractionNH3):
+        points = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in
+                                       (temp, pressure, initialMoleFractionNH3)))
+        return self.interpolator(np.stack(points, axis=-1))
+
+    def save(self, path):
+        np.savez(path, **{field.name: np.asarray(getattr(self, field.name)) for field in dataclasses.fields(self)})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            fields = {field.name: data[field.name] for field in dataclasses.fields(cls)}
+        fields["ratioH2N2"] = float(fields["ratioH2N2"])
+        fields["initialMoleFractionAr"] = float(fields["initialMoleFractionAr"])
+        fields["method"] = str(fields["method"])
+        return cls(**fields)
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def calcConversionBracket(yH2, yN2, yNH3, F, Fn2):
+    # open interval of X with every mole fraction positive (X < 0: NH3 in the feed decomposes)
+    lower = -yNH3 * F / (2 * Fn2)
+    upper = np.minimum(yN2 * F / Fn2, yH2 / (3 * yN2))
+    return lower, upper
+
+
+def solveEquilibriumConversion(calcs, temp, pressure, initialMoleFractionH2, initialMoleFractionN2,
+                               initialMoleFractionNH3, initialMoleFractionAr, F=1.0, Fn2=None, initialGuess=None):
+    # real part only - the equilibrium conversion is a reported quantity, it carries no complex-step derivative
+    temp, pressure, yH2, yN2, yNH3, yAr, F = np.broadcast_arrays(*(np.real(np.asarray(value, dtype=complex))
+        for value in (temp, pressure, initialMoleFractionH2, initialMoleFractionN2, initialMoleFractionNH3,
+                      initialMoleFractionAr, F)))
+    Fn2 = F * yN2 if Fn2 is None else np.broadcast_to(np.real(Fn2), F.shape)
+    state = types.SimpleNamespace(
+        temp=temp, pressure=pressure, F=F, Fn2=Fn2,
+        initialMoleFractionH2=yH2, initialMoleFractionN2=yN2,
+        initialMoleFractionNH3=yNH3, initialMoleFractionAr=yAr,
+    )
+
+    def updateFugacities():
+        state.fugacityN2 = calcs.calcFugacityN2(state)
+        state.fugacityH2 = calcs.calcFugacityH2(state)
+        state.fugacityNH3 = calcs.calcFugacityNH3(state)
+
+    if not calcs.fugacityDependsOnComposition:
+        updateFugacities()
+    logK = np.log(calcs.calcEquilibriumConstant(state))
+
+    def residual(conversionN2):         # ln K - ln Q(X), decreasing in X
+        state.conversionN2 = conversionN2
+        state.moleFractionH2 = calcs.calcMoleFractionH2(state)
+        state.moleFractionN2 = calcs.calcMoleFractionN2(state)
+        state.moleFractionNH3 = calcs.calcMoleFractionNH3(state)
+        if calcs.fugacityDependsOnComposition:
+            # equation-of-state coefficients follow the composition at X (and its complex step)
+            state.moleFractionAr = calcs.calcMoleFractionAr(state)
+            updateFugacities()
+        activityN2 = calcs.calcActivationCoefficientN2(state)
+        activityH2 = calcs.calcActivationCoefficientH2(state)
+        activityNH3 = calcs.calcActivationCoefficientNH3(state)
+        return logK - (np.log(activityNH3) - 0.5 * np.log(activityN2) - 1.5 * np.log(activityH2))
+
+    lower, upper = calcConversionBracket(yH2, yN2, yNH3, F, Fn2)
+    lower, upper = np.array(lower, dtype=float), np.array(upper, dtype=float)
+    midpoint = 0.5 * (lower + upper)
+    if initialGuess is None:
+        conversionN2 = midpoint
+    else:
+        guess = np.broadcast_to(np.real(initialGuess), midpoint.shape)
+        conversionN2 = np.where((guess > lower) & (guess < upper), guess, midpoint)
+
+    for _ in range(maxIterations):
+        value = residual(conversionN2 + 1j * complexStep)
+        g, dg = value.real, value.imag / complexStep
+        lower = np.where(g > 0, conversionN2, lower)
+        upper = np.where(g > 0, upper, conversionN2)
+        newton = conversionN2 - g / dg
+        # Newton steps that leave the bracket by more than round-off fall back to bisection
+        inside = (newton >= lower - conversionTolerance) & (newton <= upper + conversionTolerance)
+        newConversion = np.where(inside, np.clip(newton, lower, upper), 0.5 * (lower + upper))
+        converged = np.abs(newConversion - conversionN2) < conversionTolerance
+        conversionN2 = newConversion
+        if np.all(converged):
+            break
+    return conversionN2
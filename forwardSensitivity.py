@@ -0,0 +1,155 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Forward sensitivities of the reactor outlet (conversion, temperature, pressure, mole        #
+#                  fractions) to the inlet temperature, pressure and feed NH3 fraction, carried through the    #
+#                  integration alongside the state.                                                           #
+#                - Complex-step differentiation: each parameter gets its own copy of the case with an          #
+#                  imaginary perturbation i*h, and the batched engine integrates the copies together. The      #
+#                  imaginary part of the outlet / h is the derivative to machine precision (no subtractive     #
+#                  cancellation, unlike the 1 K finite differences of the optimisation scripts).              #
+#                - optimiseInletTemperature() uses the gradients in SLSQP to find the maximum conversion that  #
+#                  keeps the outlet below the catalyst temperature limit in a handful of solves.              #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - result = runBatchWithSensitivities(config)   ->  result.derivatives["incomingTemp"]["conversionN2"]       #
+# - Every function of the physics must stay complex-analytic (no abs(), real comparisons or int casts on the  #
+#   state) for the derivatives to hold                                                                        #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import numpy as np
+from scipy.optimize import minimize
+from reactorEngine import BatchConfig, BatchResult, catalystMaxTemp, runBatch
+from reactorSim import R1Config, R2Config, R2FN2, R2F
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+complexStep = 1e-20                     # h, far below round-off of the real part                             #
+sensitivityParameters = ("incomingTemp", "pressure", "initialMoleFractionNH3")                                #
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class SensitivityResult:
+    result: BatchResult                 # unperturbed outlet state (real)
+    derivatives: dict                   # derivatives[parameter][output] - one entry per case
+    # profile derivatives, (nRecords, nCases), only when recordEvery is given
+    tempProfileDerivatives: dict = None
+    conversionProfileDerivatives: dict = None
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def perturbationDirections(config, parameter):
+    # field: weight per unit change of the parameter
+    if parameter != "initialMoleFractionNH3":
+        return {parameter: 1.0}
+    # NH3 added at the expense of H2 and N2 in their feed ratio, so the mole fractions stay normalised and the
+    # N2 feed rate follows F * yN2
+    yH2 = np.asarray(config.initialMoleFractionH2, dtype=float)
+    yN2 = np.asarray(config.initialMoleFractionN2, dtype=float)
+    shareN2 = yN2 / (yH2 + yN2)
+    return {
+        "initialMoleFractionNH3": 1.0,
+        "initialMoleFractionH2": -(1 - shareN2),
+        "initialMoleFractionN2": -shareN2,
+        "Fn2": -shareN2 * np.asarray(config.F, dtype=float),
+    }
+
+
+def runBatchWithSensitivities(config, parameters=sensitivityParameters, recordEvery=None,
+                              upperTempLimit=catalystMaxTemp):
+    numberOfCases = config.numberOfCases
+    numberOfParameters = len(parameters)
+    # case-major copies: rows [p * nCases, (p + 1) * nCases) carry the perturbation of parameter p
+    fields = {name: np.tile(np.broadcast_to(np.asarray(getattr(config, name), dtype=complex), (numberOfCases,)),
+                            numberOfParameters) for name in BatchConfig.caseFields}
+    for p, parameter in enumerate(parameters):
+        rows = slice(p * numberOfCases, (p + 1) * numberOfCases)
+        for name, weight in perturbationDirections(config, parameter).items():
+            fields[name][rows] += 1j * complexStep * np.broadcast_to(weight, (numberOfCases,))
+    perturbed = runBatch(dataclasses.replace(config, **fields), recordEvery, upperTempLimit)
+
+    def split(values):
+        return np.asarray(values).reshape((numberOfParameters, numberOfCases) + np.shape(values)[1:])
+
+    def splitProfile(values):
+        return np.asarray(values).reshape(values.shape[0], numberOfParameters, numberOfCases)
+
+    # every copy has the same real part to O(h^2), so the first one is the unperturbed solution
+    result = BatchResult(
+        peakTemp=split(perturbed.peakTemp)[0],
+        limitCrossingLength=split(perturbed.limitCrossingLength)[0],
+        **{name: split(getattr(perturbed, name))[0].real for name in BatchResult.stateFields},
+    )
+    derivatives = {parameter: {name: split(getattr(perturbed, name))[p].imag / complexStep
+                               for name in BatchResult.stateFields} for p, parameter in enumerate(parameters)}
+    sensitivity = SensitivityResult(result, derivatives)
+    if recordEvery:
+        result.length = perturbed.length
+        result.tempProfile = splitProfile(perturbed.tempProfile)[:, 0].real
+        result.conversionProfile = splitProfile(perturbed.conversionProfile)[:, 0].real
+        result.pressureProfile = splitProfile(perturbed.pressureProfile)[:, 0].real
+        sensitivity.tempProfileDerivatives = {parameter: splitProfile(perturbed.tempProfile)[:, p].imag / complexStep
+                                              for p, parameter in enumerate(parameters)}
+        sensitivity.conversionProfileDerivatives = {
+            parameter: splitProfile(perturbed.conversionProfile)[:, p].imag / complexStep
+            for p, parameter in enumerate(parameters)}
+    return sensitivity
+
+
+def optimiseInletTemperature(config, bounds, upperTempLimit=catalystMaxTemp, initialTemp=None):
+    # maximise the outlet N2 conversion of a single case subject to outlet temperature <= upperTempLimit
+    evaluations = {}
+
+    def evaluate(incomingTemp):
+        key = float(incomingTemp[0])
+        if key not in evaluations:
+            evaluations[key] = runBatchWithSensitivities(
+                dataclasses.replace(config, incomingTemp=key), ("incomingTemp",), upperTempLimit=upperTempLimit)
+        return evaluations[key]
+
+    optimum = minimize(
+        lambda x: -evaluate(x).result.conversionN2[0],
+        x0=[np.mean(bounds) if initialTemp is None else initialTemp],
+        jac=lambda x: [-evaluate(x).derivatives["incomingTemp"]["conversionN2"][0]],
+        bounds=[bounds],
+        constraints=[{
+            "type": "ineq",
+            "fun": lambda x: upperTempLimit - evaluate(x).result.temp[0],
+            "jac": lambda x: [[-evaluate(x).derivatives["incomingTemp"]["temp"][0]]],
+        }],
+        method="SLSQP",
+        options={"ftol": 1e-9},
+    )
+    optimum.solves = len(evaluations)
+    optimum.outlet = evaluate(optimum.x).result
+    return optimum
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    reactors = [("R-601", BatchConfig.fromReactorConfig(R1Config, 248.153, 1041.55, bedLength=R1Config.baseLength),
+                 [550, 740]),
+                ("R-602", BatchConfig.fromReactorConfig(R2Config, R2FN2, R2F, bedLength=R2Config.baseLength),
+                 [500, 740])]
+    for name, config, bounds in reactors:
+        sensitivity = runBatchWithSensitivities(config)
+        print("---------------------------------------------------------------------")
+        print(name, "Final Conversion: ", round(sensitivity.result.conversionN2[0], 5),
+              "    Final Temperature: ", round(sensitivity.result.temp[0], 3), "K")
+        for parameter, derivatives in sensitivity.derivatives.items():
+            print(name, "d/d(%s)" % parameter, "    conversion: ", "%.6g" % derivatives["conversionN2"][0],
+                  "    temperature: ", "%.6g" % derivatives["temp"][0])
+
+        optimum = optimiseInletTemperature(config, bounds)
+        print(name, "Optimal Inlet Temperature (SLSQP): ", round(optimum.x[0], 3), "K",
+              "    Conversion: ", round(optimum.outlet.conversionN2[0], 5),
+              "    Outlet Temperature: ", round(optimum.outlet.temp[0], 3), "K",
+              "    solves: ", optimum.solves)
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
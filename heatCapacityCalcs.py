@@ -0,0 +1,90 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Heat capacities of H2, N2, NH3 and Ar and of their mixtures, shared by the reactor model    #
+#                  (ReactorCalcs.calcSpecificHeat) and the heat exchanger duty scripts.                        #
+#                - Each Cp(T) is a cubic polynomial, so the enthalpy change between T1 and T2 and the mean    #
+#                  Cp over [T1, T2] are evaluated in closed form instead of averaging Cp one kelvin at a time. #
+#                - Every function takes scalars or NumPy arrays (temperatures, pressures, mole fractions and   #
+#                  flowrates broadcast against each other), so thousands of stream cases take a single call.  #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import numpy as np
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+calToJ = 4.184      # kcal -> kJ                                                                              #
+# Cp = 4.184 * (a + b*T + c*T^2 + d*T^3)          - kJ/kmol/K   (coefficients in kcal/kmol/K, T in K)          #
+coefficientsH2 = (6.952, -4.576e-4, 9.563e-7, -2.079e-10)                                                     #
+coefficientsN2 = (6.903, -3.753e-4, 1.93e-6, -6.861e-10)                                                      #
+coefficientsAr = (4.9675, 0.0, 0.0, 0.0)                                                                      #
+# NH3 has a pressure correction, see calcCoefficientsNH3()                                                    #
+molecularWeightH2 = 2.016       # kg/kmol                                                                     #
+molecularWeightN2 = 28.0134                                                                                   #
+molecularWeightNH3 = 17.0305                                                                                  #
+molecularWeightAr = 39.948                                                                                    #
+# =========================================================================================================== #
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def calcCoefficientsNH3(pressure):      # pressure in atm
+    return (
+        6.5846 + 96.1678 - 0.067571 * pressure,
+        -6.1251e-3 - 0.2225 + 1.6847e-4 * pressure,
+        2.3663e-6 + 1.289e-4 - 1.0095e-7 * pressure,
+        -1.5981e-9,
+    )
+
+
+def calcPolynomialHeatCapacity(temp, coefficients):            # kJ/kmol/K
+    a, b, c, d = coefficients
+    return calToJ * (a + temp * (b + temp * (c + temp * d)))
+
+
+def calcPolynomialEnthalpy(temp, coefficients):                # kJ/kmol, integral of Cp from 0 K
+    a, b, c, d = coefficients
+    return calToJ * temp * (a + temp * (b / 2 + temp * (c / 3 + temp * (d / 4))))
+
+
+def calcComponentHeatCapacities(temp, pressure):                # kJ/kmol/K - (H2, N2, NH3, Ar)
+    return (
+        calcPolynomialHeatCapacity(temp, coefficientsH2),
+        calcPolynomialHeatCapacity(temp, coefficientsN2),
+        calcPolynomialHeatCapacity(temp, calcCoefficientsNH3(pressure)),
+        calcPolynomialHeatCapacity(temp, coefficientsAr),
+    )
+
+
+def calcComponentEnthalpyChanges(T1, T2, pressure):             # kJ/kmol - (H2, N2, NH3, Ar), from T1 to T2
+    coefficientsNH3 = calcCoefficientsNH3(pressure)
+    return tuple(
+        calcPolynomialEnthalpy(T2, coefficients) - calcPolynomialEnthalpy(T1, coefficients)
+        for coefficients in (coefficientsH2, coefficientsN2, coefficientsNH3, coefficientsAr)
+    )
+
+
+def calcMixtureHeatCapacity(temp, yH2, yN2, yNH3, yAr, pressure):      # kJ/kmol/K
+    CpH2, CpN2, CpNH3, CpAr = calcComponentHeatCapacities(temp, pressure)
+    return CpH2 * yH2 + CpN2 * yN2 + CpAr * yAr + CpNH3 * yNH3
+
+
+def calcMixtureEnthalpyChange(T1, T2, yH2, yN2, yNH3, yAr, pressure):  # kJ/kmol, from T1 to T2
+    dHH2, dHN2, dHNH3, dHAr = calcComponentEnthalpyChanges(T1, T2, pressure)
+    return dHH2 * yH2 + dHN2 * yN2 + dHAr * yAr + dHNH3 * yNH3
+
+
+def calcMeanHeatCapacity(T1, T2, yH2, yN2, yNH3, yAr, pressure):       # kJ/kmol/K, mean over [T1, T2]
+    T1, T2 = np.asarray(T1, dtype=float), np.asarray(T2, dtype=float)
+    sameTemp = T1 == T2
+    deltaT = np.where(sameTemp, 1.0, T2 - T1)
+    meanCp = calcMixtureEnthalpyChange(T1, T2, yH2, yN2, yNH3, yAr, pressure) / deltaT
+    return np.where(sameTemp, calcMixtureHeatCapacity(T1, yH2, yN2, yNH3, yAr, pressure), meanCp)
+
+
+def calcMolecularWeight(yH2, yN2, yNH3, yAr):                          # kg/kmol
+    return molecularWeightH2 * yH2 + molecularWeightN2 * yN2 + molecularWeightNH3 * yNH3 + molecularWeightAr * yAr
+
+
+def calcHeatDuty(T1, T2, yH2, yN2, yNH3, yAr, massFlowrate, pressure):  # kW, heat added to take the stream T1 -> T2
+    # massFlowrate in kg/s. Negative duty = heat removed (cooler)
+    return (calcMixtureEnthalpyChange(T1, T2, yH2, yN2, yNH3, yAr, pressure) * massFlowrate
+            / calcMolecularWeight(yH2, yN2, yNH3, yAr))
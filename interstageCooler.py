@@ -0,0 +1,93 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Interstage cooler between R-601 and R-602.                                                 #
+#                - Takes the bed 1 outlet state (temperature, composition, molar flowrate, pressure) straight  #
+#                  from a completed reactor run, or arrays of them from a whole sweep, and returns the heat    #
+#                  that must be removed to bring the gas to the R-602 inlet temperature (R2Config.incomingTemp)#
+#                - The duty uses the closed-form Cp integral of heatCapacityCalcs.py, so a sweep of any size   #
+#                  is a single vectorized call.                                                               #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import numpy as np
+from heatCapacityCalcs import calcMixtureEnthalpyChange
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class CoolerInlet:
+    temp: np.ndarray                # K
+    moleFractionH2: np.ndarray
+    moleFractionN2: np.ndarray
+    moleFractionNH3: np.ndarray
+    moleFractionAr: np.ndarray
+    molarFlowrate: np.ndarray       # kmol/hr
+    pressure: np.ndarray            # atm
+
+    @classmethod
+    def fromReactor(cls, reactor, index=-1):
+        # index selects the axial position of the bed outlet in the reactor history (default: end of the run)
+        pressure = reactor._pressure[index] if len(reactor._pressure) > 1 else reactor.pressure
+        conversionN2 = reactor._conversionN2[index]
+        return cls(
+            reactor._temp[index],
+            reactor._moleFractionH2[index],
+            reactor._moleFractionN2[index],
+            reactor._moleFractionNH3[index],
+            reactor._moleFractionAr[index],
+            reactor.F - 2 * reactor.Fn2 * conversionN2,
+            pressure,
+        )
+
+    @classmethod
+    def fromProfile(cls, profile, position, F, Fn2):
+        # any axial position of a completed reactor run (runQuery.DenseProfile.fromReactor) taken as the bed outlet
+        state = profile.stateAt(position, ("temp", "conversionN2", "moleFractionH2", "moleFractionN2",
+                                           "moleFractionNH3", "moleFractionAr", "pressure"))
+        return cls(
+            state["temp"],
+            state["moleFractionH2"],
+            state["moleFractionN2"],
+            state["moleFractionNH3"],
+            state["moleFractionAr"],
+            F - 2 * Fn2 * state["conversionN2"],
+            state["pressure"],
+        )
+
+    @classmethod
+    def fromReactors(cls, reactors, index=-1):
+        inlets = [cls.fromReactor(reactor, index) for reactor in reactors]
+        return cls(*(np.array([getattr(inlet, field.name) for inlet in inlets]) for field in dataclasses.fields(cls)))
+
+
+@dataclasses.dataclass
+class InterstageCooler:
+    outletTemp: float                               # K         - R-602 inlet temperature
+    overallHeatTransferCoefficient: float = None    # kW/m2/K   - only needed for calcArea()
+    coolantInletTemp: float = None                  # K
+    coolantOutletTemp: float = None                 # K
+
+    def calcDuty(self, inlet):          # kW, heat removed from the process gas (positive when cooling)
+        enthalpyChange = calcMixtureEnthalpyChange(
+            inlet.temp,
+            self.outletTemp,
+            inlet.moleFractionH2,
+            inlet.moleFractionN2,
+            inlet.moleFractionNH3,
+            inlet.moleFractionAr,
+            inlet.pressure,
+        )                                                               # kJ/kmol
+        return -enthalpyChange * np.asarray(inlet.molarFlowrate) / 3600
+
+    def calcLMTD(self, inlet):          # K, counter-current
+        hotEndDifference = np.asarray(inlet.temp) - self.coolantOutletTemp
+        coldEndDifference = self.outletTemp - self.coolantInletTemp
+        ratio = hotEndDifference / coldEndDifference
+        with np.errstate(divide="ignore", invalid="ignore"):
+            logMean = (hotEndDifference - coldEndDifference) / np.log(ratio)
+        return np.where(np.isclose(ratio, 1.0), coldEndDifference, logMean)
+
+    def calcArea(self, inlet):          # m2
+        return self.calcDuty(inlet) / (self.overallHeatTransferCoefficient * self.calcLMTD(inlet))
@@ -0,0 +1,265 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Multi-objective design of the R-601 -> cooler -> R-602 train with NSGA-II.                 #
+#                - Decision variables: both inlet temperatures, both bed lengths and the inlet pressure.       #
+#                - Objectives: overall N2 conversion (max), total catalyst volume of the 0.55 m beds (min),    #
+#                  interstage cooler duty (min) and pressure drop over both beds (min, Ergun equation -       #
+#                  the beds are run non-isobaric).                                                            #
+#                - Constraints: the catalyst temperature limit must not be reached inside either bed, and the #
+#                  interstage exchanger must cool (bed 1 outlet at or above the bed 2 inlet temperature).     #
+#                - Every generation is evaluated as one batch (bed 1, then bed 2 fed with the bed 1 outlet)   #
+#                  over one process pool kept for the whole optimisation; designs seen before are taken from  #
+#                  an evaluation cache.                                                                       #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - Adjust decisionBounds, populationSize and numberOfGenerations below, then run the script                 #
+# - The Pareto set is printed as a table, sorted by overall conversion                                        #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+populationSize = 40
+numberOfGenerations = 25
+decisionBounds = {
+    # name:             (low,   high)
+    "incomingTemp1":    (620,   720),       # K
+    "incomingTemp2":    (640,   720),       # K
+    "bedLength1":       (1.0,   4.0),       # m
+    "bedLength2":       (2.0,   8.0),       # m
+    "pressure":         (150,   300),       # atm
+}
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import concurrent.futures
+import os
+import numpy as np
+from prettytable import PrettyTable
+import reactorCalcs_1
+from interstageCooler import CoolerInlet, InterstageCooler
+from reactorEngine import BatchConfig, catalystMaxTemp, runBatchParallel
+from reactorSim import R1Config
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+objectiveNames = ("Overall conversion N2", "Catalyst volume (m3)", "Cooler duty (MW)", "Pressure drop (atm)")
+objectiveSigns = np.array([-1, 1, 1, 1])   # NSGA-II minimises sign * objective
+# crossover / mutation distribution indices and probabilities (Deb's usual values)
+crossoverEta = 15
+mutationEta = 20
+crossoverProbability = 0.9
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+class TrainEvaluator:
+    # objectives of candidate designs, batched over a process pool, with a cache of every design seen
+    # use as a context manager - the pool is started on the first evaluation and shut down on exit
+
+    def __init__(self, feedConfig, Fn2, F, upperTempLimit=catalystMaxTemp, workers=None):
+        self.feedConfig = feedConfig
+        self.Fn2 = Fn2
+        self.F = F
+        self.upperTempLimit = upperTempLimit
+        self.workers = workers or os.cpu_count()
+        self.cache = {}
+        self.solves = 0
+        self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __call__(self, designs):
+        # designs: (n, 5) in decisionBounds order -> objectives (n, 4), constraint violation (n,)
+        keys = [tuple(np.round(design, 9)) for design in designs]
+        new = sorted({key for key in keys if key not in self.cache})
+        if new:
+            objectives, violation = self.evaluate(np.array(new))
+            self.cache.update({key: (objectives[i], violation[i]) for i, key in enumerate(new)})
+            self.solves += len(new)
+        return (np.array([self.cache[key][0] for key in keys]),
+                np.array([self.cache[key][1] for key in keys]))
+
+    def evaluate(self, designs):
+        incomingTemp1, incomingTemp2, bedLength1, bedLength2, pressure = designs.T
+        chunkSize = -(-len(designs) // self.workers)                    # one chunk per worker
+        if self.executor is None and self.workers > 1:
+            self.executor = concurrent.futures.ProcessPoolExecutor(self.workers)
+        bed1 = runBatchParallel(BatchConfig.fromReactorConfig(
+            self.feedConfig, self.Fn2, self.F,
+            incomingTemp=incomingTemp1, bedLength=bedLength1, pressure=pressure, isobaric=False,
+        ), upperTempLimit=self.upperTempLimit, workers=self.workers, chunkSize=chunkSize, executor=self.executor)
+
+        F2 = self.F - 2 * self.Fn2 * bed1.conversionN2
+        Fn22 = self.Fn2 * (1 - bed1.conversionN2)
+        bed2 = runBatchParallel(BatchConfig(
+            incomingTemp=incomingTemp2,
+            pressure=bed1.pressure,
+            bedLength=bedLength2,
+            initialMoleFractionH2=bed1.moleFractionH2,
+            initialMoleFractionN2=bed1.moleFractionN2,
+            initialMoleFractionNH3=bed1.moleFractionNH3,
+            initialMoleFractionAr=bed1.moleFractionAr,
+            F=F2,
+            Fn2=Fn22,
+            isobaric=False,
+            densityModel=self.feedConfig.densityModel,
+            effFactorModel=self.feedConfig.effFactorModel,
+            fugacityModel=self.feedConfig.fugacityModel,
+            rateModel=self.feedConfig.rateModel,
+        ), upperTempLimit=self.upperTempLimit, workers=self.workers, chunkSize=chunkSize, executor=self.executor)
+
+        coolerDuty = InterstageCooler(outletTemp=incomingTemp2).calcDuty(CoolerInlet(
+            bed1.temp, bed1.moleFractionH2, bed1.moleFractionN2, bed1.moleFractionNH3, bed1.moleFractionAr,
+            F2, bed1.pressure)) / 1e3                                                               # MW
+        objectives = np.stack([
+            1 - (1 - bed1.conversionN2) * (1 - bed2.conversionN2),                                  # overall
+            reactorCalcs_1.A * (bedLength1 + bedLength2),
+            coolerDuty,
+            pressure - bed2.pressure,
+        ], axis=1)
+        # K over the limits - a bed 1 outlet below incomingTemp2 would need a heater (negative duty), not a cooler
+        violation = (np.maximum(bed1.peakTemp - self.upperTempLimit, 0)
+                     + np.maximum(bed2.peakTemp - self.upperTempLimit, 0)
+                     + np.maximum(incomingTemp2 - bed1.temp.real, 0))
+        # non-physical designs (NaN anywhere) are infeasible
+        failed = ~np.all(np.isfinite(objectives), axis=1)
+        objectives[failed] = np.inf * objectiveSigns
+        violation[failed | ~np.isfinite(violation)] = np.inf
+        return objectives, violation
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def constrainedDominance(objectives, violation):
+    # dominates[i, j]: design i constraint-dominates design j (Deb) - objectives already in minimisation form
+    feasible = violation <= 0
+    better = np.all(objectives[:, None, :] <= objectives[None, :, :], axis=2)
+    strictlyBetter = np.any(objectives[:, None, :] < objectives[None, :, :], axis=2)
+    paretoDominates = better & strictlyBetter
+    bothFeasible = feasible[:, None] & feasible[None, :]
+    bothInfeasible = ~feasible[:, None] & ~feasible[None, :]
+    return ((bothFeasible & paretoDominates)
+            | (feasible[:, None] & ~feasible[None, :])
+            | (bothInfeasible & (violation[:, None] < violation[None, :])))
+
+
+def nonDominatedSort(objectives, violation):
+    # list of fronts (index arrays), best first
+    dominates = constrainedDominance(objectives, violation)
+    dominationCount = dominates.sum(axis=0)
+    fronts = []
+    remaining = np.ones(len(objectives), dtype=bool)
+    while remaining.any():
+        front = np.flatnonzero(remaining & (dominationCount == 0))
+        fronts.append(front)
+        remaining[front] = False
+        dominationCount = dominationCount - dominates[front].sum(axis=0)
+        dominationCount[~remaining] = -1
+    return fronts
+
+
+def crowdingDistance(objectives):
+    distance = np.zeros(len(objectives))
+    if len(objectives) <= 2:
+        return np.full(len(objectives), np.inf)
+    for column in objectives.T:
+        order = np.argsort(column)
+        span = column[order[-1]] - column[order[0]]
+        distance[order[[0, -1]]] = np.inf
+        if span > 0 and np.isfinite(span):
+            distance[order[1:-1]] += (column[order[2:]] - column[order[:-2]]) / span
+    return distance
+
+
+def rankPopulation(objectives, violation):
+    # (rank, crowding distance) of every design
+    rank = np.empty(len(objectives), dtype=int)
+    crowding = np.empty(len(objectives))
+    for r, front in enumerate(nonDominatedSort(objectives, violation)):
+        rank[front] = r
+        crowding[front] = crowdingDistance(objectives[front])
+    return rank, crowding
+
+
+def tournamentSelection(rank, crowding, numberOfParents, generator):
+    first, second = generator.integers(0, len(rank), size=(2, numberOfParents))
+    firstWins = (rank[first] < rank[second]) | ((rank[first] == rank[second]) & (crowding[first] > crowding[second]))
+    return np.where(firstWins, first, second)
+
+
+def sbxCrossover(parents1, parents2, low, high, generator):
+    # simulated binary crossover, bounded
+    u = generator.random(parents1.shape)
+    beta = np.where(u <= 0.5, (2 * u) ** (1 / (crossoverEta + 1)), (1 / (2 * (1 - u))) ** (1 / (crossoverEta + 1)))
+    cross = (generator.random(len(parents1)) < crossoverProbability)[:, None] & (generator.random(parents1.shape) < 0.5)
+    child1 = np.where(cross, 0.5 * ((1 + beta) * parents1 + (1 - beta) * parents2), parents1)
+    child2 = np.where(cross, 0.5 * ((1 - beta) * parents1 + (1 + beta) * parents2), parents2)
+    return np.clip(np.concatenate([child1, child2]), low, high)
+
+
+def polynomialMutation(designs, low, high, generator):
+    probability = 1 / designs.shape[1]
+    u = generator.random(designs.shape)
+    delta = np.where(u < 0.5, (2 * u) ** (1 / (mutationEta + 1)) - 1, 1 - (2 * (1 - u)) ** (1 / (mutationEta + 1)))
+    mutate = generator.random(designs.shape) < probability
+    return np.clip(designs + mutate * delta * (high - low), low, high)
+
+
+def runNSGA2(evaluator, bounds=decisionBounds, populationSize=populationSize, generations=numberOfGenerations,
+             seed=None, verbose=True):
+    generator = np.random.default_rng(seed)
+    low = np.array([bound[0] for bound in bounds.values()])
+    high = np.array([bound[1] for bound in bounds.values()])
+    population = low + generator.random((populationSize, len(bounds))) * (high - low)
+    objectives, violation = evaluator(population)
+
+    for generation in range(generations):
+        rank, crowding = rankPopulation(objectives * objectiveSigns, violation)
+        parents = population[tournamentSelection(rank, crowding, populationSize, generator)]
+        offspring = polynomialMutation(
+            sbxCrossover(parents[0::2], parents[1::2], low, high, generator), low, high, generator)
+        offspringObjectives, offspringViolation = evaluator(offspring)
+
+        # elitist survival: best fronts of parents + offspring, last front cut by crowding distance
+        combined = np.concatenate([population, offspring])
+        combinedObjectives = np.concatenate([objectives, offspringObjectives])
+        combinedViolation = np.concatenate([violation, offspringViolation])
+        rank, crowding = rankPopulation(combinedObjectives * objectiveSigns, combinedViolation)
+        survivors = np.lexsort((-crowding, rank))[:populationSize]
+        population, objectives, violation = combined[survivors], combinedObjectives[survivors], combinedViolation[survivors]
+        if verbose:
+            print("Generation", generation + 1, "of", generations, "    feasible: ", int(np.sum(violation <= 0)),
+                  "    best conversion: ", round(np.max(np.where(violation <= 0, objectives[:, 0], 0)), 5),
+                  "    solves: ", evaluator.solves)
+
+    rank, _ = rankPopulation(objectives * objectiveSigns, violation)
+    pareto = (rank == 0) & (violation <= 0)
+    return population[pareto], objectives[pareto]
+
+
+def paretoTable(designs, objectives):
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = "R-601 / R-602 Pareto set"
+    table.field_names = ["T in 1 (K)", "T in 2 (K)", "L1 (m)", "L2 (m)", "P (atm)"] + list(objectiveNames)
+    for i in np.argsort(-objectives[:, 0]):
+        table.add_row([round(value, 2) for value in designs[i]] + [round(value, 4) for value in objectives[i]])
+    return table
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    with TrainEvaluator(R1Config, 248.153, 1041.55) as evaluator:
+        designs, objectives = runNSGA2(evaluator, seed=0)
+    print(paretoTable(designs, objectives))
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
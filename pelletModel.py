@@ -0,0 +1,277 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Rigorous catalyst effectiveness factor from the pellet diffusion-reaction problem, in place #
+#                  of the fitted effFactorCoeff polynomial (valid over the design-report range only).         #
+#                - Isothermal spherical pellet, N2 as the key component, equal effective diffusivities:       #
+#                                                                                                             #
+#                  (1/xi^2) d/dxi (xi^2 dy/dxi) = Rp^2 r_N2(y) / (De c (1 - voidage)),   y(1) = y_N2 bulk     #
+#                                                                                                             #
+#                  H2 and NH3 follow y by stoichiometry, the rate is ReactorCalcs.calcRateOfReactionNH3, and   #
+#                  eta = (pellet average rate) / (rate at the bulk composition).                             #
+#                - Orthogonal collocation in xi^2 (Villadsen & Michelsen), Newton's method vectorized over any #
+#                  number of (T, X, P) points with complex-step rate derivatives.                            #
+#                - EffFactorTable caches eta on a (T, X, P) grid per feed and kinetics, looked up by trilinear #
+#                  interpolation - a reactor run with effFactorModel = "pellet" costs little more than one     #
+#                  with the polynomial.                                                                      #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - Reactor(..., effFactorModel="pellet") / ReactorConfig(..., effFactorModel="pellet")                      #
+# - BatchConfig(..., effFactorModel="pellet") - one table per distinct feed / kinetics; batches where these   #
+#   differ case by case solve the pellet at every step instead                                                #
+# - python pelletModel.py   compares the table, the direct solution and the polynomial                        #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+pelletPorosity = 0.5                    # -                                                                     #
+tortuosity = 3.5                        # -                                                                     #
+poreDiameter = 30e-9                    # m         - mean pore diameter (Knudsen diffusion)                   #
+diffusivityN2H2 = 7.6e-5                # m2/s      - N2 in H2 at 298.15 K and 1 atm                            #
+numberOfCollocationPoints = 10          # interior points                                                       #
+tableTempRange = (450, 950)             # K                                                                     #
+tableConversionRange = (0, 0.5)                                                                               #
+tablePressureRange = (100, 350)         # atm                                                                   #
+tableShape = (101, 51, 11)              # (nTemp, nConversion, nPressure)                                      #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import math
+import types
+import numpy as np
+from scipy.special import roots_sh_jacobi
+from pressureDrop_Ergun import dp, voidage
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+gasConstant = 8.314                     # kJ/kmol/K                                                             #
+atm = 101325                            # Pa per atm                                                            #
+molecularWeightN2 = 28.0134             # kg/kmol                                                               #
+pelletRadius = dp / 2                   # m                                                                     #
+newtonTolerance = 1e-12                                                                                       #
+maxIterations = 50                                                                                            #
+complexStep = 1e-20                                                                                           #
+# everything the effectiveness factor depends on apart from the state - part of the reactor cache key          #
+pelletParameters = (pelletRadius, voidage, pelletPorosity, tortuosity, poreDiameter, diffusivityN2H2,
+                    numberOfCollocationPoints)
+# feed and kinetics of a reactor - one EffFactorTable per distinct set of values
+feedFields = ("initialMoleFractionH2", "initialMoleFractionN2", "initialMoleFractionNH3", "initialMoleFractionAr",
+              "F", "Fn2", "ko", "E", "alpha")
+effFactorTables = {}
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class EffFactorTable:
+    temp: np.ndarray                    # K     - uniform grid axes
+    conversion: np.ndarray
+    pressure: np.ndarray                # atm
+    effFactor: np.ndarray               # (nTemp, nConversion, nPressure)
+
+    @classmethod
+    def build(cls, calcs, feed, tempRange=tableTempRange, conversionRange=tableConversionRange,
+              pressureRange=tablePressureRange, shape=tableShape):
+        # feed: name -> value for every name in feedFields
+        temp = np.linspace(*tempRange, shape[0])
+        conversion = np.linspace(*conversionRange, shape[1])
+        pressure = np.linspace(*pressureRange, shape[2])
+        T, X, P = np.meshgrid(temp, conversion, pressure, indexing="ij")
+        return cls(temp, conversion, pressure, solvePelletEffFactor(calcs, T, X, P, **feed))
+
+    def __post_init__(self):
+        self.axes = [(axis[0], axis[1] - axis[0], len(axis) - 2) for axis in (self.temp, self.conversion, self.pressure)]
+        # the 8 corner values of every grid cell side by side, so a lookup is one gather
+        nT, nX, nP = self.effFactor.shape
+        corners = [self.effFactor[di:nT - 1 + di, dj:nX - 1 + dj, dk:nP - 1 + dk]
+                   for di in (0, 1) for dj in (0, 1) for dk in (0, 1)]
+        self.corners = np.stack(corners, axis=-1).reshape(-1, 8)
+        self.cellStrides = ((nX - 1) * (nP - 1), nP - 1, 1)
+        self.cornerList = self.corners.tolist()
+
+    def __call__(self, temp, conversionN2, pressure):
+        # trilinear; complex inputs (complex-step derivatives) carry through the interpolation weights
+        if all(isinstance(value, (float, int)) for value in (temp, conversionN2, pressure)):
+            return self.lookupScalar(temp, conversionN2, pressure)
+        cell = 0
+        weights = []
+        for (start, spacing, lastCell), stride, point in zip(self.axes, self.cellStrides,
+                                                              (temp, conversionN2, pressure)):
+            position = (np.asarray(point) - start) / spacing
+            index = np.clip(np.floor(np.real(position)).astype(np.intp), 0, lastCell)
+            cell = cell + stride * index
+            fraction = position - index
+            weights.append((1 - fraction, fraction))
+        (t0, t1), (x0, x1), (p0, p1) = weights
+        values = self.corners[cell]
+        return ((t0 * x0) * (p0 * values[..., 0] + p1 * values[..., 1])
+                + (t0 * x1) * (p0 * values[..., 2] + p1 * values[..., 3])
+                + (t1 * x0) * (p0 * values[..., 4] + p1 * values[..., 5])
+                + (t1 * x1) * (p0 * values[..., 6] + p1 * values[..., 7]))
+
+    def lookupScalar(self, temp, conversionN2, pressure):
+        # plain floats (reactorSim.Reactor) - Python arithmetic is faster than NumPy calls for one point
+        cell = 0
+        weights = []
+        for (start, spacing, lastCell), stride, point in zip(self.axes, self.cellStrides,
+                                                              (temp, conversionN2, pressure)):
+            position = (point - start) / spacing
+            index = min(max(math.floor(position), 0), lastCell)
+            cell += stride * index
+            weights.append(position - index)
+        t, x, p = weights
+        v = self.cornerList[cell]
+        return ((1 - t) * (1 - x) * ((1 - p) * v[0] + p * v[1]) + (1 - t) * x * ((1 - p) * v[2] + p * v[3])
+                + t * (1 - x) * ((1 - p) * v[4] + p * v[5]) + t * x * ((1 - p) * v[6] + p * v[7]))
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def collocationMatrices(n=numberOfCollocationPoints):
+    # sphere, symmetric trial functions in u = xi^2: points (n interior + surface), Laplacian matrix and the
+    # quadrature weights of the integral of xi^2 f over [0, 1] - Lagrange basis, well conditioned for any n
+    roots, _ = roots_sh_jacobi(n, 2.5, 1.5)            # weight (1 - u) u^0.5
+    u = np.append(roots, 1.0)
+    difference = u[:, None] - u[None, :]
+    np.fill_diagonal(difference, 1.0)
+    barycentric = 1 / np.prod(difference, axis=1)
+    first = (barycentric[None, :] / barycentric[:, None]) / difference
+    np.fill_diagonal(first, 0.0)
+    np.fill_diagonal(first, -first.sum(axis=1))
+    laplacian = 4 * u[:, None] * (first @ first) + 6 * first        # d2/dxi2 + (2 / xi) d/dxi in u
+    # integral of xi^2 f dxi = integral of 0.5 u^0.5 f du, by Gauss-Jacobi quadrature of the interpolant
+    nodes, nodeWeights = roots_sh_jacobi(n + 1, 1.5, 1.5)            # weight u^0.5
+    lagrange = barycentric[None, :] / (nodes[:, None] - u[None, :])
+    lagrange /= lagrange.sum(axis=1, keepdims=True)
+    return np.sqrt(u), laplacian, 0.5 * nodeWeights @ lagrange
+
+
+def calcEffectiveDiffusivity(temp, pressure):      # m2/s, molecular (Fuller scaling) and Knudsen in series
+    molecular = diffusivityN2H2 * (temp / 298.15) ** 1.75 / pressure
+    knudsen = poreDiameter / 3 * np.sqrt(8 * gasConstant * 1e3 * temp / (np.pi * molecularWeightN2))
+    return pelletPorosity / tortuosity / (1 / molecular + 1 / knudsen)
+
+
+def solvePelletEffFactor(calcs, temp, conversionN2, pressure, initialMoleFractionH2, initialMoleFractionN2,
+                         initialMoleFractionNH3, initialMoleFractionAr, F, Fn2, ko, E, alpha):
+    # real part only, like the equilibrium conversion - eta carries no complex-step derivative here
+    values = np.broadcast_arrays(*(np.real(np.asarray(value, dtype=complex)) for value in
+                                   (temp, conversionN2, pressure, initialMoleFractionH2, initialMoleFractionN2,
+                                    initialMoleFractionNH3, initialMoleFractionAr, F, Fn2, ko, E, alpha)))
+    shape = values[0].shape
+    temp, conversionN2, pressure, yH2, yN2, yNH3, yAr, F, Fn2, ko, E, alpha = (value.ravel() for value in values)
+
+    # bulk (pellet surface) composition from the same mole fraction correlations as the bed
+    bulk = types.SimpleNamespace(conversionN2=conversionN2, F=F, Fn2=Fn2, initialMoleFractionH2=yH2,
+                                 initialMoleFractionN2=yN2, initialMoleFractionNH3=yNH3, initialMoleFractionAr=yAr)
+    surfaceN2 = calcs.calcMoleFractionN2(bulk)[:, None]
+    surfaceH2 = calcs.calcMoleFractionH2(bulk)[:, None]
+    surfaceNH3 = calcs.calcMoleFractionNH3(bulk)[:, None]
+
+    # fugacity coefficients are held at the surface composition across the pellet
+    state = types.SimpleNamespace(temp=temp[:, None], pressure=pressure[:, None], ko=ko[:, None], E=E[:, None],
+                                  alpha=alpha[:, None], moleFractionH2=surfaceH2, moleFractionN2=surfaceN2,
+                                  moleFractionNH3=surfaceNH3, moleFractionAr=calcs.calcMoleFractionAr(bulk)[:, None])
+    state.fugacityN2 = calcs.calcFugacityN2(state)
+    state.fugacityH2 = calcs.calcFugacityH2(state)
+    state.fugacityNH3 = calcs.calcFugacityNH3(state)
+    state.reactionRateConstant = calcs.calcReactionRateConstant(state)
+    state.equilibriumConstant = calcs.calcEquilibriumConstant(state)
+
+    def rate(moleFractionN2):           # kmol NH3 / m3 bed / hr at pellet N2 mole fraction y
+        state.moleFractionN2 = moleFractionN2
+        state.moleFractionH2 = surfaceH2 + 3 * (moleFractionN2 - surfaceN2)
+        state.moleFractionNH3 = surfaceNH3 - 2 * (moleFractionN2 - surfaceN2)
+        state.activationCoefficientN2 = calcs.calcActivationCoefficientN2(state)
+        state.activationCoefficientH2 = calcs.calcActivationCoefficientH2(state)
+        state.activationCoefficientNH3 = calcs.calcActivationCoefficientNH3(state)
+        return calcs.calcRateOfReactionNH3(state)
+
+    xi, laplacian, weights = collocationMatrices()
+    n = len(xi) - 1
+    concentration = pressure * atm / (gasConstant * 1e3 * temp)                                   # kmol/m3
+    scale = (pelletRadius**2 / (calcEffectiveDiffusivity(temp, pressure) * concentration * (1 - voidage))
+             / 2 / 3600)[:, None]                                                     # N2 = NH3 / 2, per second
+    # mole fractions stay positive: H2 limits how far y can fall, NH3 how far it can rise (reverse reaction)
+    lower = np.maximum(surfaceN2 - surfaceH2 / 3, 0) + 1e-12
+    upper = surfaceN2 + surfaceNH3 / 2 - 1e-12
+
+    moleFractionN2 = np.repeat(surfaceN2, n, axis=1)
+    for _ in range(maxIterations):
+        value = rate(moleFractionN2 + 1j * complexStep)
+        residual = laplacian[:n, :n] @ moleFractionN2.T + laplacian[:n, n:] @ surfaceN2.T - (scale * value.real).T
+        jacobian = laplacian[:n, :n] - np.eye(n) * (scale * value.imag / complexStep)[:, None, :]
+        step = np.linalg.solve(jacobian, residual.T[..., None])[..., 0]
+        newMoleFractionN2 = np.clip(moleFractionN2 - step, lower, upper)
+        converged = np.max(np.abs(newMoleFractionN2 - moleFractionN2)) < newtonTolerance
+        moleFractionN2 = newMoleFractionN2
+        if converged:
+            break
+
+    pelletRates = np.concatenate([rate(moleFractionN2), rate(surfaceN2)], axis=1)
+    surfaceRate = pelletRates[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        effFactor = 3 * (pelletRates @ weights) / surfaceRate
+    # exactly at equilibrium the ratio is 0 / 0 - take the neighbouring limit from the linearised problem as 1
+    return np.where(surfaceRate != 0, effFactor, 1.0).reshape(shape)
+
+
+def feedOf(reactor):
+    return {name: np.real(np.asarray(getattr(reactor, name), dtype=complex)) for name in feedFields}
+
+
+def findEffFactorTable(reactor):
+    # shared table of the reactor's feed and kinetics, None when they differ from case to case
+    feed = feedOf(reactor)
+    if not all(np.ptp(value) == 0 for value in feed.values()):
+        return None
+    feed = {name: float(np.ravel(value)[0]) for name, value in feed.items()}
+    key = (reactor.arrayCalcs, pelletParameters) + tuple(feed.values())
+    if key not in effFactorTables:
+        effFactorTables[key] = EffFactorTable.build(reactor.arrayCalcs, feed)
+    return effFactorTables[key]
+
+
+def calcPelletEffFactor(reactor):
+    # ReactorCalcs.calcEffFactor for effFactorModel = "pellet"; feed and kinetics are fixed during a run, so the
+    # table is found on the first step only
+    if "effFactorTable" not in vars(reactor):
+        reactor.effFactorTable = findEffFactorTable(reactor)
+    if reactor.effFactorTable is None:
+        effFactor = solvePelletEffFactor(reactor.arrayCalcs, reactor.temp, reactor.conversionN2, reactor.pressure,
+                                         **feedOf(reactor))
+    else:
+        effFactor = reactor.effFactorTable(reactor.temp, reactor.conversionN2, reactor.pressure)
+    return effFactor * reactor.effFactorScale
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    import time
+    from prettytable import PrettyTable
+    from reactorCalcs_1 import ReactorCalcs
+    from reactorSim import R1Config
+    feed = dict(initialMoleFractionH2=R1Config.initialMoleFractionH2, initialMoleFractionN2=R1Config.initialMoleFractionN2,
+                initialMoleFractionNH3=R1Config.initialMoleFractionNH3, initialMoleFractionAr=R1Config.initialMoleFractionAr,
+                F=1041.55, Fn2=248.153, ko=ReactorCalcs.ko, E=ReactorCalcs.E, alpha=ReactorCalcs.alpha)
+    start = time.perf_counter()
+    table = EffFactorTable.build(ReactorCalcs, feed)
+    buildTime = time.perf_counter() - start
+
+    temp, conversionN2 = np.meshgrid(np.arange(500, 801, 50), [0.0, 0.05, 0.1, 0.15])
+    direct = solvePelletEffFactor(ReactorCalcs, temp, conversionN2, 225, **feed)
+    interpolated = table(temp, conversionN2, 225)
+    polynomialState = types.SimpleNamespace(temp=temp, conversionN2=conversionN2,
+                                            effFactorCoeff=ReactorCalcs.effFactorCoeff)
+    polynomial = ReactorCalcs.calcPolynomialEffFactor(polynomialState)
+
+    output = PrettyTable()
+    output._set_double_border_style()
+    output.title = "R-601 effectiveness factor at 225 atm (table built in %.2f s)" % buildTime
+    output.field_names = ["T (K)", "Conversion N2", "Pellet (direct)", "Pellet (table)", "Polynomial"]
+    for index in np.ndindex(temp.shape):
+        output.add_row([temp[index], conversionN2[index], round(direct[index], 4), round(interpolated[index], 4),
+                        round(polynomial[index], 4)])
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
@@ -0,0 +1,224 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Two-dimensional (radial + axial) packed bed for hot-spot assessment of cooled or larger-    #
+#                  diameter beds, where the plug flow model only gives the cross-section average.            #
+#                - Pseudo-homogeneous, plug flow with radial dispersion (Peclet numbers on the pellet          #
+#                  diameter), kinetics of ReactorCalcs in every radial cell:                                  #
+#                                                                                                             #
+#                  dX/dz = (dp / Pe_m) (1/r) d/dr (r dX/dr) + eta r A / (2 Fn2)                               #
+#                  dT/dz = (dp / Pe_h) (1/r) d/dr (r dT/dr) + eta r (-dH) A / (F Cp)                          #
+#                                                                                                             #
+#                  symmetry at the axis; at the wall dX/dr = 0 and -lambda_er dT/dr = h_w (T - T_coolant)    #
+#                  (h_w = 0: adiabatic wall, the radial profile stays flat and the 1-D model is recovered).  #
+#                - Marches along z with the step of the 1-D model: reaction explicit as in calcNewTemp, radial #
+#                  dispersion implicit - one tridiagonal solve (solve_banded) per variable and step, so the    #
+#                  cost grows linearly with the number of radial cells.                                      #
+#                - Reports the radial temperature maximum of every axial slice and where it lies.             #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - bed = RadialBed(BatchConfig.fromReactorConfig(R1Config, 248.153, 1041.55, bedLength=2.1),                #
+#                   wallHeatTransferCoefficient=0.5, coolantTemp=623.15)                                      #
+# - result = bed.run()    ->  result.maxTemp (per slice), result.temp (nRecords, nRadialCells), ...           #
+# - Isobaric configs only                                                                                      #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+numberOfRadialCells = 20
+radialPecletHeat = 5                    # G Cp dp / lambda_er                                                   #
+radialPecletMass = 10                   # u dp / D_er                                                           #
+cooledWallHeatTransferCoefficient = 0.5     # kW/m2/K - wall cooled bed compared in main()                      #
+coolantTemp = 623.15                        # K                                                                 #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import os
+import pathlib
+import time
+import numpy as np
+from scipy.linalg import solve_banded
+import matplotlib.pyplot as plt
+import matplotlib.backends.backend_pdf
+import reactorCalcs_1
+from pressureDrop_Ergun import dp
+from reactorEngine import BatchConfig, ReactorState, catalystMaxTemp, runBatch
+from reactorSim import R1Config
+storagePath = os.path.join(pathlib.Path(__file__).parent.absolute(), "Figures")
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class RadialResult:
+    radius: np.ndarray                  # m     cell centres (nRadialCells,)
+    length: np.ndarray                  # m     every step (nSteps + 1,)
+    maxTemp: np.ndarray                 # K     radial maximum of each slice
+    maxTempRadius: np.ndarray           # m     where it lies
+    meanTemp: np.ndarray                # K     cup-mixing (area-weighted, uniform velocity)
+    meanConversion: np.ndarray
+    recordLength: np.ndarray            # m     (nRecords,)
+    temp: np.ndarray                    # K     (nRecords, nRadialCells)
+    conversionN2: np.ndarray            #       (nRecords, nRadialCells)
+    limitCrossingLength: float          # m     first slice whose maximum reaches the limit, NaN if never
+    wallTime: float                     # s
+
+    @property
+    def peakTemp(self):
+        return self.maxTemp.max()
+
+
+class RadialBed:
+
+    def __init__(self, config, numberOfRadialCells=numberOfRadialCells, bedDiameter=reactorCalcs_1.diameter_internal,
+                 wallHeatTransferCoefficient=0.0, coolantTemp=coolantTemp, radialPecletHeat=radialPecletHeat,
+                 radialPecletMass=radialPecletMass):
+        if not config.isobaric:
+            raise ValueError("RadialBed needs an isobaric config - the momentum balance is not part of the model")
+        if config.numberOfCases != 1:
+            raise ValueError("RadialBed simulates one bed - give a single-case config")
+        self.config = config
+        self.numberOfRadialCells = numberOfRadialCells
+        self.bedRadius = bedDiameter / 2
+        self.area = np.pi * self.bedRadius**2
+        self.wallHeatTransferCoefficient = wallHeatTransferCoefficient      # kW/m2/K, 0 = adiabatic wall
+        self.coolantTemp = coolantTemp
+        self.heatDispersion = dp / radialPecletHeat                         # m
+        self.massDispersion = dp / radialPecletMass                         # m
+
+        self.cellWidth = self.bedRadius / numberOfRadialCells
+        self.radius = (np.arange(numberOfRadialCells) + 0.5) * self.cellWidth
+        faces = np.arange(1, numberOfRadialCells) * self.cellWidth
+        ringArea = np.pi * ((self.radius + self.cellWidth / 2) ** 2 - (self.radius - self.cellWidth / 2) ** 2)
+        self.areaWeights = ringArea / ringArea.sum()
+        # finite volume (1/r) d/dr (r d/dr): coupling of each cell to its outer and inner neighbour
+        self.outerCoupling = np.append(faces / (self.radius[:-1] * self.cellWidth**2), 0.0)
+        self.innerCoupling = np.insert(faces / (self.radius[1:] * self.cellWidth**2), 0, 0.0)
+
+    def dispersionMatrix(self, dispersion, stepSize, wallCoupling=0.0):
+        # banded form of (I - dz * dispersion * L) for solve_banded((1, 1), ...)
+        banded = np.zeros((3, self.numberOfRadialCells))
+        diagonal = self.outerCoupling + self.innerCoupling
+        diagonal[-1] += wallCoupling
+        banded[0, 1:] = -stepSize * dispersion * self.outerCoupling[:-1]
+        banded[1] = 1 + stepSize * dispersion * diagonal
+        banded[2, :-1] = -stepSize * dispersion * self.innerCoupling[1:]
+        return banded
+
+    def calcWallCoupling(self, specificHeat):
+        # wall film in series with half a cell of radial conduction, lambda_er = (dp / Pe_h) G Cp
+        if self.wallHeatTransferCoefficient == 0:
+            return 0.0
+        conductivity = self.heatDispersion * float(self.config.F) / 3600 / self.area * specificHeat     # kW/m/K
+        resistance = self.cellWidth / 2 + conductivity / self.wallHeatTransferCoefficient                # m
+        return self.bedRadius / (self.radius[-1] * self.cellWidth * resistance)
+
+    def run(self, recordEvery=10, stepSize=None, upperTempLimit=catalystMaxTemp):
+        stepSize = reactorCalcs_1.stepSize if stepSize is None else stepSize
+        numberOfSteps = int(round(float(self.config.bedLength) / stepSize))
+        state = ReactorState(dataclasses.replace(self.config, incomingTemp=np.full(self.numberOfRadialCells,
+                                                                                    float(self.config.incomingTemp))))
+        temp, conversionN2 = state.temp.astype(float), state.conversionN2.astype(float)
+        massMatrix = self.dispersionMatrix(self.massDispersion, stepSize)
+        state.area = self.area
+
+        maxTemp, maxTempRadius = np.empty(numberOfSteps + 1), np.empty(numberOfSteps + 1)
+        meanTemp, meanConversion = np.empty(numberOfSteps + 1), np.empty(numberOfSteps + 1)
+        records = list(range(0, numberOfSteps + 1, recordEvery))
+        recordTemp = np.empty((len(records), self.numberOfRadialCells))
+        recordConversion = np.empty((len(records), self.numberOfRadialCells))
+
+        start = time.perf_counter()
+        for step in range(numberOfSteps + 1):
+            hottest = np.argmax(temp)
+            maxTemp[step], maxTempRadius[step] = temp[hottest], self.radius[hottest]
+            meanTemp[step], meanConversion[step] = self.areaWeights @ temp, self.areaWeights @ conversionN2
+            if step % recordEvery == 0:
+                recordTemp[step // recordEvery], recordConversion[step // recordEvery] = temp, conversionN2
+            if step == numberOfSteps:
+                break
+
+            # same explicit step as updateAll in every radial cell
+            state.temp, state.conversionN2 = temp, conversionN2
+            state.updateRates()
+            conversionSource = state.calcChangeOfConversionAcrossBed().real
+            tempSource = state.calcChangeInTempAcrossBed().real
+
+            wallCoupling = self.calcWallCoupling(state.specificHeat[-1].real)
+            tempRhs = temp + stepSize * tempSource
+            tempRhs[-1] += stepSize * self.heatDispersion * wallCoupling * self.coolantTemp
+            temp = solve_banded((1, 1), self.dispersionMatrix(self.heatDispersion, stepSize, wallCoupling), tempRhs)
+            conversionN2 = solve_banded((1, 1), massMatrix, conversionN2 + stepSize * conversionSource)
+        wallTime = time.perf_counter() - start
+
+        crossing = np.flatnonzero(maxTemp >= upperTempLimit)
+        return RadialResult(
+            radius=self.radius,
+            length=stepSize * np.arange(numberOfSteps + 1),
+            maxTemp=maxTemp,
+            maxTempRadius=maxTempRadius,
+            meanTemp=meanTemp,
+            meanConversion=meanConversion,
+            recordLength=stepSize * np.array(records),
+            temp=recordTemp,
+            conversionN2=recordConversion,
+            limitCrossingLength=crossing[0] * stepSize if len(crossing) else np.nan,
+            wallTime=wallTime,
+        )
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def plotRadialResult(result, title, upperTempLimit=catalystMaxTemp, snapshots=6):
+    fig1, ax = plt.subplots()
+    ax.plot(result.length, result.maxTemp, color="red", label="Radial Maximum Temperature")
+    ax.plot(result.length, result.meanTemp, color="blue", label="Cup-Mixing Temperature")
+    ax.axhline(upperTempLimit, color="red", linestyle="dotted", label="Catalyst Max Temperature")
+    ax.set_xlabel("Length of Bed (m)")
+    ax.set_ylabel("Temperature (K)")
+    plt.title(title + " - axial profiles")
+
+    fig2, ax = plt.subplots()
+    for i in np.linspace(0, len(result.recordLength) - 1, snapshots).astype(int):
+        ax.plot(result.radius, result.temp[i], label="z = %.2f m" % result.recordLength[i])
+    ax.set_xlabel("Radius (m)")
+    ax.set_ylabel("Temperature (K)")
+    plt.title(title + " - radial profiles")
+    return [fig1, fig2]
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    config = BatchConfig.fromReactorConfig(R1Config, 248.153, 1041.55, bedLength=R1Config.baseLength)
+    plugFlow = runBatch(config)
+    adiabatic = RadialBed(config).run()
+    print("R-601 adiabatic wall - outlet temperature 2-D: ", round(adiabatic.meanTemp[-1], 6), "K    1-D: ",
+          round(float(plugFlow.temp[0]), 6), "K")
+
+    cooled = RadialBed(config, wallHeatTransferCoefficient=cooledWallHeatTransferCoefficient).run()
+    hotSpot = np.argmax(cooled.maxTemp)
+    print("R-601 cooled wall (h_w =", cooledWallHeatTransferCoefficient, "kW/m2/K, coolant", coolantTemp, "K)")
+    print("    hot spot: ", round(cooled.maxTemp[hotSpot], 3), "K at z =", round(cooled.length[hotSpot], 3),
+          "m, r =", round(cooled.maxTempRadius[hotSpot], 4), "m")
+    print("    outlet cup-mixing temperature: ", round(cooled.meanTemp[-1], 3), "K    conversion: ",
+          round(cooled.meanConversion[-1], 5))
+    print("    temperature limit reached at: ", cooled.limitCrossingLength, "m")
+    print("    radial cells: ", len(cooled.radius), "    computing time: ", round(cooled.wallTime, 2), "s")
+
+    figs = plotRadialResult(cooled, "R-601 cooled wall")
+    pp = matplotlib.backends.backend_pdf.PdfPages(os.path.join(storagePath, "RADIAL_BED.pdf"))
+    for fig in figs:
+        fig.set_size_inches(9.0, 5)
+        fig.gca().grid(True, linestyle=':')
+        fig.gca().legend(loc="best", fontsize=7)
+        pp.savefig(fig, bbox_inches="tight", dpi=300)
+    pp.close()
+
+    showFig = input("Show figures? (y/n): ")
+    if showFig == "y":
+        plt.show()
+    else:
+        plt.close("all")
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
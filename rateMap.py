@@ -0,0 +1,180 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Rate map: for a fixed pressure and feed, dX/dz and dT/dz of the reactor model depend on     #
+#                  temperature and conversion only. They are tabulated once on a fine (T, X) grid             #
+#                  (reactorEngine.evaluateLocalRates) and beds are then integrated by bicubic spline lookup.  #
+#                - One table serves every inlet temperature of a sweep; the whole sweep is integrated as one   #
+#                  array with the same step size as the direct model.                                        #
+#                - main() measures the accuracy and the run time against the direct model (runBatch).         #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - rateMap = RateMap.build(config)          (isobaric configs only - pressure is part of the table)         #
+# - result = integrateBed(rateMap, incomingTemp=np.arange(550, 740), bedLength=2.1)                          #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+tempRange = (500, 900)                  # K
+conversionRange = (0, 0.5)
+gridShape = (401, 251)                  # (nTemp, nConversion)
+sweepTemps = (550, 740)                 # K, inlet temperatures compared in main() (1 K apart)
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import time
+import numpy as np
+from scipy.interpolate import RectBivariateSpline
+from prettytable import PrettyTable
+import reactorCalcs_1
+from reactorEngine import BatchConfig, catalystMaxTemp, evaluateLocalRates, runBatch
+from reactorSim import R1Config, R2Config, R2FN2, R2F
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+# p(t) = [1, t, t^2, t^3] . hermiteMatrix . [p(0), p(1), p'(0), p'(1)]                                        #
+hermiteMatrix = np.array([[1, 0, 0, 0], [0, 0, 1, 0], [-3, 3, -2, -1], [2, -2, 1, 1]], dtype=float)
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class RateMap:
+    config: BatchConfig                 # pressure and feed the table was built for
+    temp: np.ndarray                    # K     (nTemp,)
+    conversion: np.ndarray              #       (nConversion,)
+    conversionRate: np.ndarray          # dX/dz, 1/m  (nTemp, nConversion)
+    tempRate: np.ndarray                # dT/dz, K/m  (nTemp, nConversion)
+
+    def __post_init__(self):
+        # bicubic Hermite patch per grid cell from the values and derivatives of an interpolating spline, so a
+        # lookup is an index calculation and one small product instead of a FITPACK call per step
+        self.tempStep = self.temp[1] - self.temp[0]
+        self.conversionStep = self.conversion[1] - self.conversion[0]
+        patches = np.stack([self.calcPatchCoefficients(table) for table in (self.conversionRate, self.tempRate)],
+                           axis=2)
+        self.cellsPerTemp = len(self.conversion) - 1
+        self.coefficients = patches.reshape(-1, 2, 16)      # (nCells, dX/dz | dT/dz, 16)
+
+    def calcPatchCoefficients(self, table):         # (nTemp - 1, nConversion - 1, 4, 4)
+        spline = RectBivariateSpline(self.temp, self.conversion, table, kx=3, ky=3)
+        f = spline(self.temp, self.conversion)
+        ft = spline(self.temp, self.conversion, dx=1) * self.tempStep
+        fx = spline(self.temp, self.conversion, dy=1) * self.conversionStep
+        ftx = spline(self.temp, self.conversion, dx=1, dy=1) * self.tempStep * self.conversionStep
+        # rows: value / T-derivative at the two T corners, columns: value / X-derivative at the two X corners
+        F = np.empty(f[:-1, :-1].shape + (4, 4))
+        for i, (value, derivative) in enumerate(((f, fx), (ft, ftx))):
+            for corner in range(2):
+                rows = slice(corner, corner + f.shape[0] - 1)
+                F[..., 2 * i + corner, 0] = value[rows, :-1]
+                F[..., 2 * i + corner, 1] = value[rows, 1:]
+                F[..., 2 * i + corner, 2] = derivative[rows, :-1]
+                F[..., 2 * i + corner, 3] = derivative[rows, 1:]
+        return hermiteMatrix @ F @ hermiteMatrix.T
+
+    @classmethod
+    def build(cls, config, tempRange=tempRange, conversionRange=conversionRange, shape=gridShape):
+        if not config.isobaric:
+            raise ValueError("RateMap needs an isobaric config - pressure is not a table axis")
+        temp = np.linspace(*tempRange, shape[0])
+        conversion = np.linspace(*conversionRange, shape[1])
+        T, X = np.meshgrid(temp, conversion, indexing="ij")
+        conversionRate, tempRate, _ = evaluateLocalRates(config, T, X)
+        return cls(config, temp, conversion, conversionRate.real, tempRate.real)
+
+    def __call__(self, temp, conversionN2):
+        # 1-D arrays of points
+        t = (temp - self.temp[0]) / self.tempStep
+        x = (conversionN2 - self.conversion[0]) / self.conversionStep
+        i = np.clip(t.astype(np.intp), 0, len(self.temp) - 2)
+        j = np.clip(x.astype(np.intp), 0, self.cellsPerTemp - 1)
+        t, x = t - i, x - j
+        tPowers = np.array([np.ones_like(t), t, t * t, t * t * t])
+        xPowers = np.array([np.ones_like(x), x, x * x, x * x * x])
+        monomials = (tPowers[:, None, :] * xPowers[None, :, :]).reshape(16, -1)
+        conversionRate, tempRate = np.einsum("nkc,cn->kn", self.coefficients[i * self.cellsPerTemp + j], monomials)
+        return conversionRate, tempRate
+
+    def contains(self, temp, conversionN2):
+        return ((temp >= self.temp[0]) & (temp <= self.temp[-1])
+                & (conversionN2 >= self.conversion[0]) & (conversionN2 <= self.conversion[-1]))
+
+
+@dataclasses.dataclass
+class RateMapResult:
+    temp: np.ndarray                    # K, outlet
+    conversionN2: np.ndarray
+    peakTemp: np.ndarray                # K
+    limitCrossingLength: np.ndarray     # m, NaN if never
+    leftTable: np.ndarray               # True where the trajectory went outside the tabulated range
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def integrateBed(rateMap, incomingTemp, bedLength, stepSize=None, upperTempLimit=catalystMaxTemp):
+    # explicit Euler in z, same scheme and default step as the direct model
+    stepSize = reactorCalcs_1.stepSize if stepSize is None else stepSize
+    temp = np.atleast_1d(np.asarray(incomingTemp, dtype=float)).copy()
+    conversionN2 = np.zeros_like(temp)
+    peakTemp = temp.copy()
+    limitCrossingLength = np.full(temp.shape, np.nan)
+    leftTable = np.zeros(temp.shape, dtype=bool)
+    for step in range(1, int(round(bedLength / stepSize)) + 1):
+        leftTable |= ~rateMap.contains(temp, conversionN2)
+        conversionRate, tempRate = rateMap(temp, conversionN2)
+        conversionN2 += stepSize * conversionRate
+        temp += stepSize * tempRate
+        np.maximum(peakTemp, temp, out=peakTemp)
+        crossing = (temp >= upperTempLimit) & np.isnan(limitCrossingLength)
+        limitCrossingLength[crossing] = step * stepSize
+    return RateMapResult(temp, conversionN2, peakTemp, limitCrossingLength, leftTable)
+
+
+def compareWithDirectModel(config, incomingTemp, bedLength, rateMap=None):
+    # accuracy and run time of the lookup integration against the direct model, same inlets and bed length
+    start = time.perf_counter()
+    rateMap = RateMap.build(config) if rateMap is None else rateMap
+    buildTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    lookup = integrateBed(rateMap, incomingTemp, bedLength)
+    lookupTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    direct = runBatch(dataclasses.replace(config, incomingTemp=np.asarray(incomingTemp, dtype=float),
+                                          bedLength=bedLength))
+    directTime = time.perf_counter() - start
+
+    valid = ~lookup.leftTable
+    return {
+        "cases": len(lookup.temp),
+        "casesOutsideTable": int(np.count_nonzero(lookup.leftTable)),
+        "maxConversionError": np.max(np.abs(lookup.conversionN2 - direct.conversionN2)[valid]),
+        "maxTempError": np.max(np.abs(lookup.temp - direct.temp)[valid]),
+        "buildTime": buildTime,
+        "lookupTime": lookupTime,
+        "directTime": directTime,
+    }
+
+
+def accuracyTable(title, report):
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = title
+    table.field_names = ["Cases", "Outside table", "Max |dX|", "Max |dT| (K)", "Table build (s)",
+                         "Lookup sweep (s)", "Direct sweep (s)"]
+    table.add_row([report["cases"], report["casesOutsideTable"], "%.2e" % report["maxConversionError"],
+                   "%.2e" % report["maxTempError"], round(report["buildTime"], 3), round(report["lookupTime"], 3),
+                   round(report["directTime"], 3)])
+    return table
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    incomingTemp = np.arange(*sweepTemps)
+    for name, config, baseLength in [("R-601", BatchConfig.fromReactorConfig(R1Config, 248.153, 1041.55), R1Config.baseLength),
+                                     ("R-602", BatchConfig.fromReactorConfig(R2Config, R2FN2, R2F), R2Config.baseLength)]:
+        report = compareWithDirectModel(config, incomingTemp, baseLength)
+        print(accuracyTable(name + " rate map vs direct model, inlet %d-%d K" % sweepTemps, report))
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
@@ -0,0 +1,260 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Persistent on-disk cache of whole reactor runs.                                            #
+#                - A run is keyed by a hash of the reactor inputs (ReactorConfig values, Fn2, F), the          #
+#                  correlation-set version and the integrator settings (step size, number of iterations).     #
+#                - Every history list of the reactor (temperature, conversion, mole fractions, ...) is stored, #
+#                  so a cache hit restores the final state AND the profiles used by the plotting code.        #
+#                - Batched runs (reactorEngine.runBatch over a process pool) are stored the same way, keyed    #
+#                  by a hash of every per-case input array - sweeps rerun with the same inputs load instantly.#
+#                  The composition, sensitivity and surrogate sweeps use this store; the random Monte Carlo   #
+#                  and NSGA-II batches never repeat, so they run uncached rather than evict reusable runs.    #
+#                - The cache is bounded in size, least recently used runs are evicted first.                  #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - Replace     R1.run(iterations)     with     runCached(R1, iterations)                                     #
+# - Replace     runBatchParallel(config, ...)  with  runBatchCached(config, ...)                              #
+# - Show the cache contents:           python reactorCache.py info                                            #
+# - Invalidate every cached run:       python reactorCache.py clear                                           #
+# - The size limit (MB) can be changed with the REACTOR_CACHE_MAX_MB environment variable                     #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import argparse
+import dataclasses
+import hashlib
+import json
+import os
+import pathlib
+import numpy as np
+import pelletModel
+import reactorCalcs_1
+from reactorEngine import BatchResult, catalystMaxTemp, runBatchParallel
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+cacheDirectory = os.path.join(pathlib.Path(__file__).parent.absolute(), ".reactorCache")
+cacheSizeLimit = float(os.environ.get("REACTOR_CACHE_MAX_MB", 1024)) * 1e6      # bytes                      #
+cacheFormatVersion = 1                                                          # layout of the stored files  #
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+class ResultCache:
+
+    def __init__(self, directory=cacheDirectory, maxBytes=cacheSizeLimit):
+        self.directory = directory
+        self.maxBytes = maxBytes
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def load(self, key, reactor):
+        path = self.path(key)
+        try:
+            with np.load(path) as stored:
+                history = {name: stored[name].tolist() for name in stored.files}
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError):
+            # truncated or corrupt file - drop it and recompute
+            self.invalidate(key)
+            return False
+        vars(reactor).update(history)
+        try:
+            os.utime(path)                # mark as most recently used
+        except FileNotFoundError:
+            pass
+        return True
+
+    def loadBatch(self, key):
+        # BatchResult of a batched run, None when not cached
+        path = self.path(key)
+        try:
+            with np.load(path) as stored:
+                fields = {name: stored[name] for name in stored.files}
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self.invalidate(key)
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:         # evicted by another process after it was read
+            pass
+        return BatchResult(**fields)
+
+    def store(self, key, reactor):
+        self.write(key, {name: np.asarray(value) for name, value in vars(reactor).items() if isinstance(value, list)})
+
+    def storeBatch(self, key, result):
+        self.write(key, {field.name: getattr(result, field.name) for field in dataclasses.fields(result)
+                         if getattr(result, field.name) is not None})
+
+    def write(self, key, arrays):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        temporaryPath = path + ".%d.tmp" % os.getpid()
+        with open(temporaryPath, "wb") as file:
+            np.savez(file, **arrays)
+        os.replace(temporaryPath, path)     # atomic, concurrent scripts never see a half written run
+        self.evict()
+
+    def entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                # processes sharing the cache (process pool workers, concurrent scripts) evict at the same time
+                try:
+                    status = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, entry.path))
+        return sorted(entries)
+
+    def evict(self):
+        entries = self.entries()
+        totalSize = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if totalSize <= self.maxBytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            totalSize -= size
+
+    def invalidate(self, key):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.remove(path)
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def runKeyFields(reactor, iterations):
+    return {
+        "cacheFormatVersion": cacheFormatVersion,
+        "correlationSetVersion": reactorCalcs_1.correlationSetVersion,
+        # ---- integrator settings ----
+        "iterations": int(iterations),
+        "stepSize": reactorCalcs_1.stepSize,
+        "reactorStepSize": reactor._stepSize,
+        # ---- kinetic constants and bed geometry ----
+        "ko": reactor.ko,
+        "E": reactor.E,
+        "R": reactorCalcs_1.R,
+        "alpha": reactor.alpha,
+        "effFactorCoeff": repr(list(reactor.effFactorCoeff)),
+        "effFactorModel": reactor.effFactorModel,
+        "fugacityModel": reactor.fugacityModel,
+        "rateModel": reactor.rateModel,
+        "pelletParameters": repr(pelletModel.pelletParameters),
+        "A": reactor.area,
+        "wallHeatRemoval": reactor.wallHeatRemoval,
+        # ---- reactor configuration ----
+        "incomingTemp": reactor.incomingTemp,
+        "pressure": reactor.pressure,
+        "isobaric": reactor.isobaric,
+        "densityModel": reactor.densityModel,
+        "viscosity": reactor.viscosity,
+        "bedLength": reactor.bedLength,
+        "initialMoleFractionH2": reactor.initialMoleFractionH2,
+        "initialMoleFractionN2": reactor.initialMoleFractionN2,
+        "initialMoleFractionNH3": reactor.initialMoleFractionNH3,
+        "initialMoleFractionAr": reactor.initialMoleFractionAr,
+        "Fn2": reactor.Fn2,
+        "F": reactor.F,
+    }
+
+
+def runKey(reactor, iterations):
+    # repr() keeps every bit of the floats so that 673.15 and 673.1500001 never share a key
+    fields = {name: value if isinstance(value, str) else repr(float(value))
+              for name, value in runKeyFields(reactor, iterations).items()}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+
+
+def batchKeyFields(config, recordEvery, upperTempLimit):
+    calcs = reactorCalcs_1.ReactorCalcs
+    fields = {
+        "cacheFormatVersion": cacheFormatVersion,
+        "correlationSetVersion": reactorCalcs_1.correlationSetVersion,
+        "stepSize": reactorCalcs_1.stepSize,
+        "recordEvery": repr(recordEvery),
+        "upperTempLimit": upperTempLimit,
+        "R": reactorCalcs_1.R,
+        "effFactorCoeff": repr(list(calcs.effFactorCoeff)),
+        "pelletParameters": repr(pelletModel.pelletParameters),
+        "A": calcs.area,
+        "viscosity": calcs.viscosity,
+        "isobaric": repr(config.isobaric),
+        "densityModel": config.densityModel,
+        "effFactorModel": config.effFactorModel,
+        "fugacityModel": config.fugacityModel,
+        "rateModel": config.rateModel,
+    }
+    # every per-case input by its exact bytes (dtype and shape included)
+    for name in config.caseFields:
+        value = np.ascontiguousarray(getattr(config, name))
+        fields[name] = "%s%s:%s" % (value.dtype.str, value.shape, hashlib.sha256(value.tobytes()).hexdigest())
+    return fields
+
+
+def batchKey(config, recordEvery, upperTempLimit):
+    fields = {name: value if isinstance(value, str) else repr(float(value))
+              for name, value in batchKeyFields(config, recordEvery, upperTempLimit).items()}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+
+
+defaultCache = ResultCache()
+
+
+def runCached(reactor, iterations, cache=None):
+    # must be called on a freshly constructed reactor, in place of reactor.run(iterations)
+    cache = defaultCache if cache is None else cache
+    key = runKey(reactor, iterations)
+    if not cache.load(key, reactor):
+        reactor.run(iterations)
+        cache.store(key, reactor)
+    return reactor
+
+
+def runBatchCached(config, recordEvery=None, upperTempLimit=catalystMaxTemp, workers=None, cache=None, chunkSize=512,
+                   executor=None):
+    # runBatchParallel(config, ...) through the on-disk cache - chunkSize and executor only affect how it is run
+    cache = defaultCache if cache is None else cache
+    key = batchKey(config, recordEvery, upperTempLimit)
+    result = cache.loadBatch(key)
+    if result is None:
+        result = runBatchParallel(config, recordEvery, upperTempLimit, workers, chunkSize, executor)
+        cache.storeBatch(key, result)
+    return result
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    parser = argparse.ArgumentParser(description="Manage the on-disk cache of reactor runs.")
+    parser.add_argument("command", choices=["info", "clear"])
+    args = parser.parse_args()
+
+    entries = defaultCache.entries()
+    if args.command == "clear":
+        defaultCache.clear()
+        print("Removed", len(entries), "cached reactor runs from", defaultCache.directory)
+    else:
+        print("Cache directory: ", defaultCache.directory)
+        print("Cached runs:     ", len(entries))
+        print("Size:            ", round(sum(size for _, size, _ in entries) / 1e6, 3), "MB of",
+              round(defaultCache.maxBytes / 1e6, 3), "MB")
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
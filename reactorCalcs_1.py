@@ -16,6 +16,7 @@ E = 1.7056e5        # activation energy               - Activation energy for am
 R = 8.314           # Universal Gas Constant:         - R = 8.314 J/mol-K                                     #
 alpha = 0.5         # Temkin parameter:               - can range from: 0.5 - 0.75                            #
 #                                                       (0.5 is most common and is used in this calculation)  #
+correlationSetVersion = "3"  # bump whenever a correlation below changes - invalidates cached reactor runs    #
 # ==================================   I N P U T   V A R I A B L E S   ====================================== #
 diameter_internal = 0.55 # internal diameter of packed bed - m                                                #
 A = np.pi * (diameter_internal / 2) ** 2            # cross-sectional area of packed bed    - m^2                        #
@@ -24,15 +25,27 @@ F = 1041.55        # total feed molar flowrate              - kmol/hr
 Fn2 = 248.153         # total feed flowrate for nitrogen    - kmol/hr                                         #
 stepSize = 0.001    # increment size for each step           - 1/iterations                                   #
 #                                                                                                             #
+# ---------------------------------- N O N - I S O B A R I C   M O D E -------------------------------------- #
+MW_H2 = 2.016       # molecular weights                      - kg/kmol                                        #
+MW_N2 = 28.0134                                                                                               #
+MW_NH3 = 17.0305                                                                                              #
+MW_Ar = 39.948                                                                                                #
+atm = 101325        # Pa per atm                                                                              #
+# - pellet diameter, bed voidage and gas viscosity for the Ergun equation are taken from pressureDrop_Ergun.py  #
 # =========================================================================================================== #
 # ===================================   I M P O R T   L I B R A R I E S   =================================== #
 import numpy as np
 from reactorUtils import ReactorBase
+from pressureDrop_Ergun import calcErgunPressureGradient, mu_1
+from heatCapacityCalcs import calcMixtureHeatCapacity
+from equilibriumCalcs import solveEquilibriumConversion
+from pelletModel import calcPelletEffFactor
 # =========================================================================================================== #
 
 # =============================================   C L A S S E S   =========================================== #
 
 class FugacityCalcs(ReactorBase):
+    # Gillespie-Beattie fits of the fugacity coefficients
     def calcFugacityN2(self):
         fugacity = (
             0.93431737
@@ -105,18 +118,74 @@ class ActivationCoefficientCalcs(ReactorBase):
         pass
 
 
-class ReactorCalcs(FugacityCalcs, MoleFractionCalcs, ActivationCoefficientCalcs):
-    def calcEffFactor(self):
-        effFactorCoeff = [
-            -8.2125534,
-            0.03774149,
-            6.190112,
-            -5.354571e-5,
-            -20.86963,
-            2.379142e-8,
-            27.88403,
-        ]
+class KineticsCalcs(ReactorBase):
+    # Temkin-Pyzhev rate in activities (Dyson-Simon form)
+    def calcReactionRateConstant(self):
+        return self.ko * np.exp(-self.E / (R * (self.temp)))
+        # UNITS: J/mol/K
 
+    def calcRateOfReactionNH3(self):
+        return (
+            2
+            * self.reactionRateConstant
+            * (
+                self.equilibriumConstant**2
+                * self.activationCoefficientN2
+                * (
+                    (
+                        self.activationCoefficientH2**3
+                        / self.activationCoefficientNH3**2
+                    )
+                    ** self.alpha
+                )
+                - (
+                    (
+                        self.activationCoefficientNH3**2
+                        / self.activationCoefficientH2**3
+                    )
+                    ** (1 - self.alpha)
+                )
+            )
+        )
+
+
+class ReactorCalcs(FugacityCalcs, MoleFractionCalcs, ActivationCoefficientCalcs, KineticsCalcs):
+    # kinetic parameters are class attributes so that a single instance can override them
+    # (reactorEngine.ReactorState holds one value per case for uncertainty and sensitivity studies)
+    ko = ko
+    E = E
+    alpha = alpha
+    effFactorCoeff = [
+        -8.2125534,
+        0.03774149,
+        6.190112,
+        -5.354571e-5,
+        -20.86963,
+        2.379142e-8,
+        27.88403,
+    ]
+    effFactorScale = 1.0    # multiplies the pellet model effectiveness factor (the polynomial scales its coefficients)
+    viscosity = mu_1        # Pa.s - gas viscosity for the Ergun equation (Aspen average, see pressureDrop_Ergun.py)
+    # bed geometry and heat removal - reactorGeometry sets both every step for A(z) and cooled beds
+    area = A                # m^2 - flow cross-section (catalyst volume per metre of flow path)
+    wallHeatRemoval = 0.0   # kJ/hr per metre of flow path - heat passed to a coolant (0 = adiabatic bed)
+    # correlation sets (correlationSets.py) - the engines swap the fugacity and rate methods for the chosen ones
+    # by subclassing, so type(reactor) carries them into equilibriumCalcs and pelletModel
+    fugacityModel = "gillespieBeattie"
+    rateModel = "temkinPyzhev"
+    arrayCalcs = None       # same correlations over arrays - for the vectorized helpers (set below)
+    fugacityDependsOnComposition = False    # True: calcFugacity* read moleFraction* (cubicEquationOfState.py)
+
+    def calcEffFactor(self):
+        if self.effFactorModel == "polynomial":
+            return self.calcPolynomialEffFactor()
+        if self.effFactorModel == "pellet":
+            return calcPelletEffFactor(self)
+        raise ValueError("effFactorModel must be 'polynomial' or 'pellet', not %r" % (self.effFactorModel,))
+
+    def calcPolynomialEffFactor(self):
+        # fitted over the design-report range only
+        effFactorCoeff = self.effFactorCoeff
         effFactor = (
             effFactorCoeff[0]
             + effFactorCoeff[1] * self.temp
@@ -140,57 +209,17 @@ class ReactorCalcs(FugacityCalcs, MoleFractionCalcs, ActivationCoefficientCalcs)
         return heatOfReaction
 
 
-    def calcSpecificHeat(self):         
-        #                     UNITS: kcal/kmol/K
-        specificHeat = (
-            #                 # specific_heat_hydrogen * yH2
-            (
-                4.184
-                * (
-                    6.952
-                    - 4.576e-4 * self.temp
-                    + 9.563e-7 * self.temp**2
-                    - 2.079e-10 * self.temp**3
-                )
-                * self.moleFractionH2
-            )
-            #        # + specific_heat_nitrogen * yN2
-            + (
-                4.184
-                * (
-                    6.903
-                    - 3.753e-4 * self.temp
-                    + 1.93e-6 * self.temp**2
-                    - 6.861e-10 * self.temp**3
-                )
-                * self.moleFractionN2
-            )
-            #        # + specific_heat_argon * yAr
-                + (4.9675
-                   * self.moleFractionAr) * 4.184
-            # + specific_heat_ammonia * yNH3
-            + (4.184 *
-                (
-                    6.5846 * 1
-                    - 6.1251e-3 * self.temp
-                    + 2.3663e-6 * self.temp**2
-                    - 1.5981e-9 * self.temp**3
-                    + (
-                        96.1678
-                        - 0.067571 * self.pressure
-                        + (-0.2225 + 1.6847e-4 * self.pressure) * self.temp
-                        + (1.289e-4 - 1.0095e-7 * self.pressure) * self.temp**2
-                    )
-                )
-            )
-            * self.moleFractionNH3
-        ) 
-        return specificHeat
-
+    def calcSpecificHeat(self):
+        #                     UNITS: kJ/kmol/K  (polynomials shared with the duty calculations, see heatCapacityCalcs.py)
+        return calcMixtureHeatCapacity(
+            self.temp,
+            self.moleFractionH2,
+            self.moleFractionN2,
+            self.moleFractionNH3,
+            self.moleFractionAr,
+            self.pressure,
+        )
 
-    def calcReactionRateConstant(self):
-        return ko * np.exp(-E / (R * (self.temp)))
-        # UNITS: J/mol/K
 
     def calcEquilibriumConstant(self):
         return 10 ** (
@@ -201,37 +230,13 @@ class ReactorCalcs(FugacityCalcs, MoleFractionCalcs, ActivationCoefficientCalcs)
             + 2.689
         )
 
-    def calcRateOfReactionNH3(self):
-        return (
-            2
-            * self.reactionRateConstant
-            * (
-                self.equilibriumConstant**2
-                * self.activationCoefficientN2
-                * (
-                    (
-                        self.activationCoefficientH2**3
-                        / self.activationCoefficientNH3**2
-                    )
-                    ** alpha
-                )
-                - (
-                    (
-                        self.activationCoefficientNH3**2
-                        / self.activationCoefficientH2**3
-                    )
-                    ** (1 - alpha)
-                )
-            )
-        )
-
     def calcChangeInTempAcrossBed(self):
         return (
-            self.effFactor * (-self.heatOfReaction) * A * self.rateOfReactionNH3
+            self.effFactor * (-self.heatOfReaction) * self.area * self.rateOfReactionNH3 - self.wallHeatRemoval
         ) / (self.F * self.specificHeat)
 
     def calcChangeOfConversionAcrossBed(self):
-        return (self.effFactor * self.rateOfReactionNH3 * A) / (self.Fn2 * 2)
+        return (self.effFactor * self.rateOfReactionNH3 * self.area) / (self.Fn2 * 2)
 
     def calcNewConversion(self):
         return self.conversionN2 + (stepSize * self.calcChangeOfConversionAcrossBed())
@@ -241,10 +246,98 @@ class ReactorCalcs(FugacityCalcs, MoleFractionCalcs, ActivationCoefficientCalcs)
         return newTemp
     
     def calcNewEquilibriumConversion(self):
-        return (self.equilibriumConstant*100)/(self.equilibriumConstant*100 + 1)
+        # local equilibrium conversion of the feed at the current T and P, warm-started from the last value
+        return solveEquilibriumConversion(
+            self.arrayCalcs,
+            self.temp,
+            self.pressure,
+            self.initialMoleFractionH2,
+            self.initialMoleFractionN2,
+            self.initialMoleFractionNH3,
+            self.initialMoleFractionAr,
+            self.F,
+            self.Fn2,
+            initialGuess=self.equilibriumConversion,
+        )
+
+    # ------------------------------ non-isobaric mode (pressure as a state variable) ------------------------ #
+    def calcMeanMolecularWeight(self):      # kg/kmol
+        return (
+            self.moleFractionH2 * MW_H2
+            + self.moleFractionN2 * MW_N2
+            + self.moleFractionNH3 * MW_NH3
+            + self.moleFractionAr * MW_Ar
+        )
+
+    def calcInitialMeanMolecularWeight(self):       # kg/kmol
+        return (
+            self.initialMoleFractionH2 * MW_H2
+            + self.initialMoleFractionN2 * MW_N2
+            + self.initialMoleFractionNH3 * MW_NH3
+            + self.initialMoleFractionAr * MW_Ar
+        )
+
+    def calcCompressibility(self):
+        if self.densityModel == "idealGas":
+            return 1.0
+        if self.densityModel == "fugacity":
+            # virial-consistent estimate, ln(phi_mix) = Z - 1  (Ar is taken as ideal, phi = 1)
+            return (
+                1
+                + self.moleFractionH2 * np.log(self.fugacityH2)
+                + self.moleFractionN2 * np.log(self.fugacityN2)
+                + self.moleFractionNH3 * np.log(self.fugacityNH3)
+            )
+        raise ValueError("densityModel must be 'idealGas' or 'fugacity', not %r" % (self.densityModel,))
+
+    def calcGasDensity(self):           # kg/m^3
+        return (self.pressure * atm * self.calcMeanMolecularWeight()) / (
+            self.calcCompressibility() * R * 1e3 * self.temp
+        )
+
+    def calcPressureGradient(self):     # atm/m
+        massFlowrate = self.F * self.calcInitialMeanMolecularWeight() / 3600          # kg/s, conserved along the bed
+        superficialVelocity = massFlowrate / (self.gasDensity * self.area)           # m/s
+        laminar, turbulent = calcErgunPressureGradient(superficialVelocity, self.gasDensity, self.viscosity)
+        return -(laminar + turbulent) / atm
+
+    def calcNewPressure(self):
+        return self.pressure + (stepSize * self.calcPressureGradient())
+
+
+ReactorCalcs.arrayCalcs = ReactorCalcs
 
 
 class ReactorUpdates(ReactorCalcs):
+    def updateAll(self):
+        # one integration step along the bed - shared by reactorSim.Reactor and reactorEngine.ReactorState
+        self.updateRates()
+        if not self.isobaric:
+            self.updateGasDensity()
+            self.updatePressure()
+        self.updateConversionN2()
+        self.updateTemp()
+
+    def updateRates(self):
+        # every local quantity up to the rate of reaction at the current temperature, conversion and pressure
+        self.updateEffFactor()
+        self.updateHeatOfReaction()
+        self.updateSpecificHeat()
+        self.updateMoleFractionN2()
+        self.updateMoleFractionH2()
+        self.updateMoleFractionNH3()
+        self.updateMoleFractionAr()
+        # after the mole fractions - equation-of-state fugacities depend on the local composition
+        self.updateFugacityN2()
+        self.updateFugacityH2()
+        self.updateFugacityNH3()
+        self.updateActivationCoefficientN2()
+        self.updateActivationCoefficientH2()
+        self.updateActivationCoefficientNH3()
+        self.updateReactionRateConstant()
+        self.updateEquilibriumConstant()
+        self.updateRateOfReactionNH3()
+
     def updateEffFactor(self):
         self.effFactor = self.calcEffFactor()
 
@@ -303,4 +396,11 @@ class ReactorUpdates(ReactorCalcs):
         self.steps = self.step + self._stepSize
 
     def updateEquilibriumConversion(self):
+        # not part of updateAll - the equilibrium does not feed the integration, call it where it is reported
         self.equilibriumConversion = self.calcNewEquilibriumConversion()
+
+    def updateGasDensity(self):
+        self.gasDensity = self.calcGasDensity()
+
+    def updatePressure(self):
+        self.pressure = self.calcNewPressure()
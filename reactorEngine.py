@@ -0,0 +1,254 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Batched reactor engine: integrates many reactor cases at once with NumPy arrays.           #
+#                - The physics is NOT re-implemented here. ReactorState runs the same ReactorUpdates.updateAll #
+#                  step as reactorSim.Reactor, but every attribute holds one value per case and no history is #
+#                  kept, so thousands of cases cost little more than one.                                     #
+#                - Kinetic parameters (ko, E, alpha, effectiveness factor scale), inlet conditions, feed and   #
+#                  bed length may all differ from case to case.                                               #
+#                - runBatchParallel() splits a batch into chunks over a process pool.                         #
+#                - evaluateLocalRates() gives dX/dz and dT/dz at arbitrary (T, X) points without integrating.  #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - config = BatchConfig.fromReactorConfig(R1Config, Fn2=248.153, F=1041.55, incomingTemp=np.arange(550, 740))#
+# - result = runBatch(config)                   ->  result.conversionN2, result.temp, ... one entry per case  #
+# - runBatch(config, recordEvery=10)            ->  also result.tempProfile, result.conversionProfile         #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import concurrent.futures
+import dataclasses
+import os
+import numpy as np
+import reactorCalcs_1
+from reactorCalcs_1 import ReactorUpdates
+from correlationSets import withCorrelations
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+catalystMaxTemp = 803.15            # K - same limit as upperTempLimit in reactorSim.py                       #
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+def asFloatArray(value):
+    # at least 1-D and at least float (integer inputs such as pressure=225 would truncate the state), complex kept
+    return np.atleast_1d(np.asarray(value, dtype=np.result_type(value, 1.0)))
+
+
+class ReactorState(ReactorUpdates):
+    # plain attributes in place of ReactorBase's history-backed properties - only the current value is held
+    temp = conversionN2 = pressure = gasDensity = None
+    effFactor = heatOfReaction = specificHeat = None
+    moleFractionH2 = moleFractionN2 = moleFractionNH3 = moleFractionAr = None
+    initialMoleFractionH2 = initialMoleFractionN2 = initialMoleFractionNH3 = initialMoleFractionAr = None
+    fugacityH2 = fugacityN2 = fugacityNH3 = None
+    activationCoefficientH2 = activationCoefficientN2 = activationCoefficientNH3 = None
+    reactionRateConstant = equilibriumConstant = equilibriumConversion = rateOfReactionNH3 = None
+
+    def __new__(cls, config):
+        # array implementations of the run's correlation sets (correlationSets.py)
+        return super().__new__(withCorrelations(cls, config.fugacityModel, config.rateModel))
+
+    def __init__(self, config):
+        (self.temp, self.pressure, self.bedLength, self.initialMoleFractionH2, self.initialMoleFractionN2,
+         self.initialMoleFractionNH3, self.initialMoleFractionAr, self.F, self.Fn2, self.ko, self.E, self.alpha,
+         effFactorScale) = np.broadcast_arrays(*(asFloatArray(getattr(config, name)) for name in config.caseFields))
+        self.incomingTemp = self.temp
+        self.conversionN2 = np.zeros_like(self.temp)
+        self.moleFractionH2 = self.initialMoleFractionH2
+        self.moleFractionN2 = self.initialMoleFractionN2
+        self.moleFractionNH3 = self.initialMoleFractionNH3
+        self.moleFractionAr = self.initialMoleFractionAr
+        self.effFactorCoeff = [coefficient * effFactorScale for coefficient in ReactorUpdates.effFactorCoeff]
+        self.effFactorScale = effFactorScale
+        self.effFactorModel = config.effFactorModel
+        self.isobaric = config.isobaric
+        self.densityModel = config.densityModel
+        self.fugacityModel = config.fugacityModel
+        self.rateModel = config.rateModel
+
+    def copyOutletState(self):
+        return {name: np.array(getattr(self, name)) for name in BatchResult.stateFields}
+
+
+@dataclasses.dataclass
+class BatchConfig:
+    # every field except the model options (isobaric ... rateModel) may be a scalar or an array, one entry per case
+    incomingTemp: np.ndarray                        # K
+    pressure: np.ndarray                            # atm (inlet pressure when isobaric is False)
+    bedLength: np.ndarray                           # m
+    initialMoleFractionH2: np.ndarray
+    initialMoleFractionN2: np.ndarray
+    initialMoleFractionNH3: np.ndarray
+    initialMoleFractionAr: np.ndarray
+    F: np.ndarray                                   # kmol/hr   - total feed
+    Fn2: np.ndarray = None                          # kmol/hr   - N2 feed, F * yN2 when not given
+    ko: np.ndarray = reactorCalcs_1.ko
+    E: np.ndarray = reactorCalcs_1.E
+    alpha: np.ndarray = reactorCalcs_1.alpha
+    effFactorScale: np.ndarray = 1.0                # multiplies the effectiveness factor polynomial
+    isobaric: bool = True
+    densityModel: str = "idealGas"
+    effFactorModel: str = "polynomial"
+    fugacityModel: str = "gillespieBeattie"         # correlation sets (correlationSets.py)
+    rateModel: str = "temkinPyzhev"
+
+    caseFields = ("incomingTemp", "pressure", "bedLength", "initialMoleFractionH2", "initialMoleFractionN2",
+                  "initialMoleFractionNH3", "initialMoleFractionAr", "F", "Fn2", "ko", "E", "alpha", "effFactorScale")
+
+    def __post_init__(self):
+        if self.Fn2 is None:
+            self.Fn2 = np.asarray(self.F) * np.asarray(self.initialMoleFractionN2)
+
+    @classmethod
+    def fromReactorConfig(cls, config, Fn2, F, **overrides):
+        fields = dict(
+            incomingTemp=config.incomingTemp,
+            pressure=config.constantPressure,
+            bedLength=config.BedLengthcalc,
+            initialMoleFractionH2=config.initialMoleFractionH2,
+            initialMoleFractionN2=config.initialMoleFractionN2,
+            initialMoleFractionNH3=config.initialMoleFractionNH3,
+            initialMoleFractionAr=config.initialMoleFractionAr,
+            F=F,
+            Fn2=Fn2,
+            isobaric=config.isobaric,
+            densityModel=config.densityModel,
+            effFactorModel=config.effFactorModel,
+            fugacityModel=config.fugacityModel,
+            rateModel=config.rateModel,
+        )
+        fields.update(overrides)
+        return cls(**fields)
+
+    @property
+    def numberOfCases(self):
+        return np.broadcast(*(np.asarray(getattr(self, name)) for name in self.caseFields)).size
+
+    def subset(self, index):
+        # the cases selected by index (slice or index array), as a new BatchConfig
+        def select(value):
+            value = np.asarray(value)
+            return value if value.ndim == 0 else np.broadcast_to(value, (self.numberOfCases,))[index]
+        return dataclasses.replace(self, **{name: select(getattr(self, name)) for name in self.caseFields})
+
+
+@dataclasses.dataclass
+class BatchResult:
+    # outlet state of every case, taken at the end of that case's own bed
+    temp: np.ndarray                    # K
+    conversionN2: np.ndarray
+    pressure: np.ndarray                # atm
+    moleFractionH2: np.ndarray
+    moleFractionN2: np.ndarray
+    moleFractionNH3: np.ndarray
+    moleFractionAr: np.ndarray
+    peakTemp: np.ndarray                # K - maximum temperature inside the bed
+    limitCrossingLength: np.ndarray     # m - first position where the temperature reaches the limit, NaN if never
+    # profiles, (nRecords, nCases), only when runBatch(..., recordEvery=k)
+    length: np.ndarray = None           # m
+    tempProfile: np.ndarray = None
+    conversionProfile: np.ndarray = None
+    pressureProfile: np.ndarray = None
+
+    stateFields = ("temp", "conversionN2", "pressure", "moleFractionH2", "moleFractionN2", "moleFractionNH3",
+                   "moleFractionAr")
+
+    @classmethod
+    def concatenate(cls, results):
+        def join(values, axis):
+            return None if values[0] is None else np.concatenate(values, axis=axis)
+        # profiles are joined along the cases axis, the shared length axis is taken from the first chunk
+        fields = {field.name: join([getattr(result, field.name) for result in results], 0 if field.name in
+                  cls.stateFields + ("peakTemp", "limitCrossingLength") else 1)
+                  for field in dataclasses.fields(cls) if field.name != "length"}
+        fields["length"] = results[0].length
+        return cls(**fields)
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def runBatch(config, recordEvery=None, upperTempLimit=catalystMaxTemp):
+    state = ReactorState(config)
+    numberOfCases = state.temp.size
+    stepsPerCase = np.rint(state.bedLength.real / reactorCalcs_1.stepSize).astype(int)
+    iterations = int(stepsPerCase.max())
+    uniformLength = bool(np.all(stepsPerCase == iterations))
+    outletAtStep = {step: np.flatnonzero(stepsPerCase == step) for step in np.unique(stepsPerCase)}
+
+    outlet = state.copyOutletState()
+    peakTemp = np.array(state.temp.real, dtype=float)
+    limitCrossingLength = np.full(numberOfCases, np.nan)
+
+    if recordEvery:
+        numberOfRecords = iterations // recordEvery + 1
+        length = reactorCalcs_1.stepSize * recordEvery * np.arange(numberOfRecords)
+        tempProfile = np.empty((numberOfRecords, numberOfCases), dtype=state.temp.dtype)
+        conversionProfile = np.empty((numberOfRecords, numberOfCases), dtype=state.temp.dtype)
+        pressureProfile = np.empty((numberOfRecords, numberOfCases), dtype=state.temp.dtype)
+        tempProfile[0], conversionProfile[0], pressureProfile[0] = state.temp, state.conversionN2, state.pressure
+
+    for step in range(1, iterations + 1):
+        state.updateAll()
+        temp = state.temp.real
+        if uniformLength:
+            np.maximum(peakTemp, temp, out=peakTemp)
+            crossing = temp >= upperTempLimit
+        else:
+            insideBed = step <= stepsPerCase
+            np.maximum(peakTemp, temp, out=peakTemp, where=insideBed)
+            crossing = (temp >= upperTempLimit) & insideBed
+        if crossing.any():
+            crossing &= np.isnan(limitCrossingLength)
+            limitCrossingLength[crossing] = step * reactorCalcs_1.stepSize
+        if step in outletAtStep:
+            finished = outletAtStep[step]
+            for name in BatchResult.stateFields:
+                outlet[name][finished] = np.broadcast_to(getattr(state, name), state.temp.shape)[finished]
+        if recordEvery and step % recordEvery == 0:
+            record = step // recordEvery
+            tempProfile[record], conversionProfile[record] = state.temp, state.conversionN2
+            pressureProfile[record] = state.pressure
+
+    result = BatchResult(peakTemp=peakTemp, limitCrossingLength=limitCrossingLength, **outlet)
+    if recordEvery:
+        result.length, result.tempProfile, result.conversionProfile = length, tempProfile, conversionProfile
+        result.pressureProfile = pressureProfile
+    return result
+
+
+def evaluateLocalRates(config, temp, conversionN2):
+    # dX/dz and dT/dz at arbitrary (T, X) points of the feed in config, without integrating (X-T diagrams, rate maps)
+    temp, conversionN2 = np.broadcast_arrays(asFloatArray(temp), asFloatArray(conversionN2))
+    state = ReactorState(dataclasses.replace(config, incomingTemp=temp))
+    state.conversionN2 = conversionN2
+    state.updateMoleFractionN2()
+    state.updateMoleFractionH2()
+    state.updateMoleFractionNH3()
+    state.updateMoleFractionAr()
+    state.updateRates()
+    return state.calcChangeOfConversionAcrossBed(), state.calcChangeInTempAcrossBed(), state
+
+
+def _runChunk(arguments):
+    config, recordEvery, upperTempLimit = arguments
+    return runBatch(config, recordEvery, upperTempLimit)
+
+
+def splitIntoChunks(config, chunkSize):
+    return [config.subset(slice(start, start + chunkSize)) for start in range(0, config.numberOfCases, chunkSize)]
+
+
+def runBatchParallel(config, recordEvery=None, upperTempLimit=catalystMaxTemp, workers=None, chunkSize=512,
+                     executor=None):
+    # executor: a running process pool to reuse across calls (optimisers) - otherwise one is started per call
+    chunks = splitIntoChunks(config, chunkSize)
+    arguments = [(chunk, recordEvery, upperTempLimit) for chunk in chunks]
+    if executor is not None and len(chunks) > 1:
+        return BatchResult.concatenate(list(executor.map(_runChunk, arguments)))
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    if executor is not None or workers <= 1:
+        return BatchResult.concatenate([_runChunk(argument) for argument in arguments])
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        results = list(executor.map(_runChunk, arguments))
+    return BatchResult.concatenate(results)
@@ -0,0 +1,266 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Pluggable reactor geometry and heat removal on the kinetic core of ReactorCalcs:           #
+#                  * AxialFlowBed      - fixed cross-section (the design beds, adiabatic)                      #
+#                  * RadialFlowBed     - annular bed, flow area 2 pi r H varying along the (inward or outward) #
+#                                        flow path                                                            #
+#                  * CooledTubeBed     - catalyst in tubes, heat passed through the tube wall to a coolant     #
+#                  + Coolant           - coolant stream with its own energy balance, co- or counter-current   #
+#                - Every geometry only supplies the flow area A(s) and the cooled perimeter P(s) along the flow  #
+#                  path s. Both are tabulated once on the step grid; each step of the march sets              #
+#                  ReactorCalcs.area and .wallHeatRemoval and calls the same updateAll as runBatch, so a new   #
+#                  geometry adds no work per step.                                                            #
+#                - Counter-current coolant (inlet at the bed outlet) is solved by shooting on its outlet        #
+#                  temperature at the bed inlet - secant iterations, all cases of a batch at once.            #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - result = runGeometry(BatchConfig.fromReactorConfig(R1Config, 248.153, 1041.55), RadialFlowBed(0.3, 1.2,   #
+#                        0.8))                                   ->  BatchResult of the radial-flow bed        #
+# - result = runGeometry(config, CooledTubeBed(0.05, 250, 4.0), Coolant(0.3, 150, 600, "counter"))             #
+#                        ->  GeometryResult, with the coolant outlet temperature and profile                  #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+shootingTolerance = 1e-6                # K   coolant inlet temperature mismatch (counter-current)             #
+maxShootingIterations = 30
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import numpy as np
+from prettytable import PrettyTable
+import reactorCalcs_1
+from reactorEngine import BatchConfig, BatchResult, ReactorState, catalystMaxTemp, runBatch
+from reactorSim import R1Config
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+coolantFlows = {"co": 1, "counter": -1}    # sign of dTc/ds - the counter-current coolant flows against s        #
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class AxialFlowBed:
+    diameter: float = reactorCalcs_1.diameter_internal      # m
+    bedLength: float = 2.1                                  # m
+
+    @property
+    def pathLength(self):
+        return self.bedLength
+
+    @property
+    def catalystVolume(self):
+        return np.pi * self.diameter**2 / 4 * self.bedLength
+
+    def area(self, position):
+        return np.full(np.shape(position), np.pi * self.diameter**2 / 4)
+
+    def cooledPerimeter(self, position):
+        return np.zeros(np.shape(position))
+
+
+@dataclasses.dataclass
+class RadialFlowBed:
+    innerRadius: float                                      # m     centre pipe
+    outerRadius: float                                      # m     basket
+    height: float                                           # m
+    inward: bool = True                                     # gas enters at the basket and leaves by the centre
+
+    @property
+    def pathLength(self):
+        return self.outerRadius - self.innerRadius
+
+    @property
+    def catalystVolume(self):
+        return np.pi * (self.outerRadius**2 - self.innerRadius**2) * self.height
+
+    def radius(self, position):
+        return self.outerRadius - position if self.inward else self.innerRadius + position
+
+    def area(self, position):
+        return 2 * np.pi * self.radius(np.asarray(position, dtype=float)) * self.height
+
+    def cooledPerimeter(self, position):
+        return np.zeros(np.shape(position))
+
+
+@dataclasses.dataclass
+class CooledTubeBed:
+    tubeDiameter: float                                     # m     inside diameter, catalyst in the tubes
+    numberOfTubes: int
+    bedLength: float                                        # m
+
+    @property
+    def pathLength(self):
+        return self.bedLength
+
+    @property
+    def catalystVolume(self):
+        return self.numberOfTubes * np.pi * self.tubeDiameter**2 / 4 * self.bedLength
+
+    def area(self, position):
+        return np.full(np.shape(position), self.numberOfTubes * np.pi * self.tubeDiameter**2 / 4)
+
+    def cooledPerimeter(self, position):
+        return np.full(np.shape(position), self.numberOfTubes * np.pi * self.tubeDiameter)
+
+
+@dataclasses.dataclass
+class Coolant:
+    heatTransferCoefficient: float                          # kW/m2/K   overall, bed to coolant
+    flowHeatCapacity: float                                 # kW/K      coolant mass flow x Cp
+    inletTemp: float                                        # K
+    flow: str = "counter"                                   # "co" | "counter"
+
+    def __post_init__(self):
+        if self.flow not in coolantFlows:
+            raise ValueError("flow must be 'co' or 'counter', not %r" % (self.flow,))
+
+
+@dataclasses.dataclass
+class GeometryResult(BatchResult):
+    coolantOutletTemp: np.ndarray = None        # K  (at the bed inlet for counter-current flow)
+    coolantTempProfile: np.ndarray = None       # K  (nRecords, nCases), only with recordEvery
+    shootingIterations: int = 0                 # marches of the counter-current shooting
+    shootingSlope: np.ndarray = None            # d(coolant inlet mismatch)/d(coolant outlet temperature), converged
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def marchGeometry(config, area, cooledPerimeter, coolant=None, coolantStartTemp=None, recordEvery=None,
+                  upperTempLimit=catalystMaxTemp):
+    # explicit march along the flow path; area / cooledPerimeter tabulated at the start of every step
+    state = ReactorState(config)
+    stepSize = reactorCalcs_1.stepSize
+    iterations = len(area)
+    peakTemp = np.array(state.temp.real, dtype=float)
+    limitCrossingLength = np.full(state.temp.size, np.nan)
+    coolantTemp = None if coolant is None else np.broadcast_to(coolantStartTemp, state.temp.shape).astype(float)
+    direction = 0 if coolant is None else coolantFlows[coolant.flow]
+
+    if recordEvery:
+        numberOfRecords = iterations // recordEvery + 1
+        profiles = {name: np.empty((numberOfRecords, state.temp.size), dtype=state.temp.dtype)
+                    for name in ("temp", "conversionN2", "pressure", "coolantTemp")}
+        profiles["temp"][0], profiles["conversionN2"][0], profiles["pressure"][0] = (
+            state.temp, state.conversionN2, state.pressure)
+        if coolant is not None:
+            profiles["coolantTemp"][0] = coolantTemp
+
+    for step in range(1, iterations + 1):
+        state.area = area[step - 1]
+        if coolant is not None:
+            heatFlux = coolant.heatTransferCoefficient * cooledPerimeter[step - 1] * (state.temp - coolantTemp)  # kW/m
+            state.wallHeatRemoval = 3600 * heatFlux
+        state.updateAll()
+        if coolant is not None:
+            coolantTemp = coolantTemp + direction * stepSize * heatFlux / coolant.flowHeatCapacity
+
+        temp = state.temp.real
+        np.maximum(peakTemp, temp, out=peakTemp)
+        crossing = (temp >= upperTempLimit) & np.isnan(limitCrossingLength)
+        limitCrossingLength[crossing] = step * stepSize
+        if recordEvery and step % recordEvery == 0:
+            record = step // recordEvery
+            profiles["temp"][record], profiles["conversionN2"][record] = state.temp, state.conversionN2
+            profiles["pressure"][record] = state.pressure
+            if coolant is not None:
+                profiles["coolantTemp"][record] = coolantTemp
+
+    result = GeometryResult(peakTemp=peakTemp, limitCrossingLength=limitCrossingLength, **state.copyOutletState())
+    if coolant is not None:
+        # coolant temperature at s = L: its outlet for co-current flow, its inlet (the shooting residual) otherwise
+        result.coolantOutletTemp = coolantTemp
+    if recordEvery:
+        result.length = stepSize * recordEvery * np.arange(numberOfRecords)
+        result.tempProfile, result.conversionProfile = profiles["temp"], profiles["conversionN2"]
+        result.pressureProfile = profiles["pressure"]
+        if coolant is not None:
+            result.coolantTempProfile = profiles["coolantTemp"]
+    return result
+
+
+def tabulateGeometry(config, geometry):
+    # config with the flow path of the geometry as bed length, A(s) and P(s) at the start of every step
+    iterations = int(round(geometry.pathLength / reactorCalcs_1.stepSize))
+    position = reactorCalcs_1.stepSize * np.arange(iterations)
+    return (dataclasses.replace(config, bedLength=geometry.pathLength), geometry.area(position),
+            geometry.cooledPerimeter(position))
+
+
+def runGeometry(config, geometry, coolant=None, recordEvery=None, upperTempLimit=catalystMaxTemp, initialGuess=None,
+                initialSlope=None):
+    # initialGuess / initialSlope (counter-current only): coolant outlet temperature and shooting slope to start
+    # from, e.g. those of a neighbouring sweep point (sweepContinuation) - cold start from the coolant inlet otherwise
+    config, area, cooledPerimeter = tabulateGeometry(config, geometry)
+    if coolant is None or coolant.flow == "co":
+        return marchGeometry(config, area, cooledPerimeter, coolant, None if coolant is None else coolant.inletTemp,
+                             recordEvery, upperTempLimit)
+
+    # counter-current: coolant temperature at s = 0 such that it enters at s = L with coolant.inletTemp
+    def residual(startTemp):
+        result = marchGeometry(config, area, cooledPerimeter, coolant, startTemp, recordEvery, upperTempLimit)
+        return result.coolantOutletTemp - coolant.inletTemp, result
+
+    shape = (config.numberOfCases,)
+    guess = np.array(np.broadcast_to(coolant.inletTemp if initialGuess is None else initialGuess, shape), dtype=float)
+    slope = None if initialSlope is None else np.array(np.broadcast_to(initialSlope, shape), dtype=float)
+    currentResidual, result = residual(guess)
+    marches = 1
+    while not np.all(np.abs(currentResidual) < shootingTolerance):
+        if marches >= maxShootingIterations:
+            raise RuntimeError("counter-current coolant did not converge in %d shooting iterations"
+                               % maxShootingIterations)
+        # secant steps; a cold start first takes a second point 10 K up
+        converged = np.abs(currentResidual) < shootingTolerance
+        newGuess = guess + 10.0 if slope is None else np.where(converged, guess, guess - currentResidual / slope)
+        newResidual, result = residual(newGuess)
+        marches += 1
+        moved = newGuess != guess
+        secant = (newResidual - currentResidual) / np.where(moved, newGuess - guess, 1.0)
+        slope = secant if slope is None else np.where(moved, secant, slope)
+        guess, currentResidual = newGuess, newResidual
+    result.coolantOutletTemp, result.shootingIterations, result.shootingSlope = guess, marches, slope
+    return result
+
+
+def geometryTable(title, rows, upperTempLimit=catalystMaxTemp):
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = title
+    table.field_names = ["Configuration", "Catalyst volume (m3)", "Outlet T (K)", "Conversion N2", "Peak T (K)",
+                         "Coolant outlet T (K)", "Below T limit"]
+    for name, geometry, result in rows:
+        coolantTemp = "-" if result.coolantOutletTemp is None else round(float(result.coolantOutletTemp[0]), 2)
+        table.add_row([name, round(geometry.catalystVolume, 4), round(float(result.temp[0].real), 3),
+                       round(float(result.conversionN2[0].real), 5), round(float(result.peakTemp[0]), 3),
+                       coolantTemp, "yes" if result.peakTemp[0] < upperTempLimit else "no"])
+    return table
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    designBed = AxialFlowBed(bedLength=R1Config.baseLength)
+    config = BatchConfig.fromReactorConfig(R1Config, 248.153, 1041.55, bedLength=designBed.bedLength)
+    # same catalyst volume as the design bed in a radial-flow basket and in a cooled tube bundle
+    radialBed = RadialFlowBed(innerRadius=0.15, outerRadius=0.45, height=designBed.catalystVolume
+                              / (np.pi * (0.45**2 - 0.15**2)))
+    # cooled tubes can be longer than the adiabatic bed without reaching the catalyst limit
+    tubeBed = CooledTubeBed(tubeDiameter=0.05, numberOfTubes=121, bedLength=5.0)
+    coolant = Coolant(heatTransferCoefficient=0.08, flowHeatCapacity=20, inletTemp=600)
+    rows = [
+        ("Axial flow, adiabatic", designBed, runGeometry(config, designBed)),
+        ("Radial flow (inward), adiabatic", radialBed, runGeometry(config, radialBed)),
+        ("Radial flow (outward), adiabatic", dataclasses.replace(radialBed, inward=False),
+         runGeometry(config, dataclasses.replace(radialBed, inward=False))),
+        ("Cooled tubes, co-current", tubeBed, runGeometry(config, tubeBed, dataclasses.replace(coolant, flow="co"))),
+        ("Cooled tubes, counter-current", tubeBed, runGeometry(config, tubeBed, coolant)),
+    ]
+    print(geometryTable("R-601 feed - reactor configurations", rows))
+    plugFlow = runBatch(config)
+    print("Axial flow bed against runBatch - outlet temperature difference: ",
+          float(abs(rows[0][2].temp[0] - plugFlow.temp[0])), "K")
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
@@ -0,0 +1,381 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Local what-if service: the batched reactor engine behind an HTTP/JSON API (asyncio,        #
+#                  standard library only), for tools that cannot run the interactive scripts.                #
+#                - Endpoints                                                                                  #
+#                    POST /run       one reactor case            -> outlet state, peak temperature            #
+#                    POST /sweep     one input over a list        -> one outlet state per value                #
+#                    POST /optimum   inlet temperature of maximum conversion with the peak below the limit    #
+#                    GET  /metrics   latency percentiles per endpoint, cache and batching statistics          #
+#                    GET  /health                                                                             #
+#                - Every case goes through one coalescer: cases arriving within batchWindow (from any number   #
+#                  of simultaneous requests) are integrated as ONE batch, split over a worker process pool.   #
+#                  Identical cases in flight share one integration and finished cases are kept in an LRU      #
+#                  cache.                                                                                     #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - python reactorService.py [--host 127.0.0.1] [--port 8765] [--workers 4]                                    #
+# - curl -d '{"reactor": "R-601", "incomingTemp": 680}' localhost:8765/run                                    #
+# - curl -d '{"reactor": "R-601", "parameter": "pressure", "values": [200, 225, 250]}' localhost:8765/sweep    #
+# - curl -d '{"reactor": "R-602", "bedLength": 5.35, "tempRange": [640, 720]}' localhost:8765/optimum          #
+# - Case inputs not given are taken from R1Config / R2Config (feed from reactorSim). Ctrl+C stops the service  #
+# - Mole fractions not given are rescaled in proportion, so the feed still sums to 1 when only some are set   #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+defaultHost = "127.0.0.1"
+defaultPort = 8765
+batchWindow = 0.005                     # s    wait for more cases before integrating                           #
+maxBatchSize = 4096                     #      cases - a full batch is integrated at once                        #
+chunkSize = 256                         #      cases per worker task                                             #
+resultCacheSize = 100000                #      cases                                                             #
+latencyWindow = 1000                    #      latest requests per endpoint kept for the percentiles             #
+optimumPoints = 41                      #      inlet temperatures per stage of the /optimum grid search          #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import dataclasses
+import json
+import multiprocessing
+import os
+import time
+import numpy as np
+from compositionSweep import checkComposition
+from correlationSets import registry
+from reactorEngine import BatchConfig, BatchResult, catalystMaxTemp, runBatch, splitIntoChunks
+from reactorSim import R1Config, R2Config, R2F, R2FN2
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+reactors = {
+    # name:     (config, Fn2, F)
+    "R-601":    (R1Config, 248.153, 1041.55),
+    "R-602":    (R2Config, R2FN2, R2F),
+}
+caseInputs = ("incomingTemp", "pressure", "bedLength", "initialMoleFractionH2", "initialMoleFractionN2",
+              "initialMoleFractionNH3", "initialMoleFractionAr", "F", "Fn2")
+moleFractionInputs = caseInputs[3:7]
+modelOptions = {"isobaric": (True, False), "densityModel": ("idealGas", "fugacity"),
+                "effFactorModel": ("polynomial", "pellet"), "fugacityModel": tuple(registry["fugacity"]),
+                "rateModel": tuple(registry["rate"])}
+outputFields = BatchResult.stateFields + ("peakTemp", "limitCrossingLength")
+httpReasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               500: "Internal Server Error"}
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass(frozen=True)
+class Case:
+    inputs: tuple                       # values in caseInputs order
+    options: tuple                      # values in modelOptions order - cases of one batch share them
+
+    @classmethod
+    def fromRequest(cls, request, overrides=None):
+        # request fields over the defaults of the chosen reactor; overrides (sweep value) last
+        fields = dict(request, **(overrides or {}))
+        name = fields.pop("reactor", "R-601")
+        if name not in reactors:
+            raise ValueError("reactor must be one of %s, not %r" % (", ".join(reactors), name))
+        config, Fn2, F = reactors[name]
+        values = {
+            "incomingTemp": config.incomingTemp, "pressure": config.constantPressure, "bedLength": config.baseLength,
+            "initialMoleFractionH2": config.initialMoleFractionH2, "initialMoleFractionN2": config.initialMoleFractionN2,
+            "initialMoleFractionNH3": config.initialMoleFractionNH3, "initialMoleFractionAr": config.initialMoleFractionAr,
+            "F": F, "Fn2": Fn2,
+        }
+        options = {"isobaric": config.isobaric, "densityModel": config.densityModel,
+                   "effFactorModel": config.effFactorModel, "fugacityModel": config.fugacityModel,
+                   "rateModel": config.rateModel}
+        for key, value in fields.items():
+            if key in values:
+                values[key] = checkNumber(key, value)
+            elif key in options:
+                if value not in modelOptions[key]:
+                    raise ValueError("%s must be one of %s, not %r" % (key, modelOptions[key], value))
+                options[key] = value
+            else:
+                raise ValueError("unknown field %r" % key)
+        given = [key for key in moleFractionInputs if key in fields]
+        if given:
+            # fractions not given are rescaled in proportion to fill the rest, so one fraction can be swept
+            free = [key for key in moleFractionInputs if key not in fields]
+            remainder = 1 - sum(values[key] for key in given)
+            freeTotal = sum(values[key] for key in free)
+            if free and freeTotal > 0:
+                if remainder < 0:
+                    raise ValueError("given mole fractions (%s) sum above 1" % ", ".join(given))
+                values.update({key: values[key] * remainder / freeTotal for key in free})
+            # a changed feed must still be a mixture - checked as in compositionSweep, then renormalised
+            fractions = np.array([values[key] for key in moleFractionInputs])
+            checkComposition(*fractions)
+            values.update(zip(moleFractionInputs, (fractions / fractions.sum()).tolist()))
+        if "Fn2" not in fields and any(key in fields for key in moleFractionInputs + ("F",)):
+            values["Fn2"] = values["F"] * values["initialMoleFractionN2"]
+        if values["bedLength"] <= 0 or values["F"] <= 0 or values["pressure"] <= 0:
+            raise ValueError("bedLength, F and pressure must be positive")
+        return cls(tuple(values[name] for name in caseInputs), tuple(options[name] for name in modelOptions))
+
+
+class LatencyMetrics:
+
+    def __init__(self, window=latencyWindow):
+        self.latencies = collections.defaultdict(lambda: collections.deque(maxlen=window))
+        self.requests = collections.Counter()
+        self.errors = collections.Counter()
+
+    def record(self, endpoint, seconds, failed):
+        self.latencies[endpoint].append(seconds)
+        self.requests[endpoint] += 1
+        self.errors[endpoint] += failed
+
+    def summary(self):
+        summary = {}
+        for endpoint, latencies in self.latencies.items():
+            p50, p95, p99 = np.percentile(np.array(latencies) * 1e3, [50, 95, 99])
+            summary[endpoint] = {"requests": self.requests[endpoint], "errors": self.errors[endpoint],
+                                 "p50Ms": round(p50, 3), "p95Ms": round(p95, 3), "p99Ms": round(p99, 3),
+                                 "maxMs": round(max(latencies) * 1e3, 3)}
+        return summary
+
+
+class CaseCoalescer:
+    # every case of every request: LRU cache -> shared in-flight integration -> next batch of its model options
+
+    def __init__(self, executor, window=batchWindow, maxBatchSize=maxBatchSize, cacheSize=resultCacheSize):
+        self.executor = executor
+        self.window = window
+        self.maxBatchSize = maxBatchSize
+        self.cacheSize = cacheSize
+        self.cache = collections.OrderedDict()
+        self.inFlight = {}
+        self.pending = {}                   # options -> {case: future}
+        self.timers = {}
+        self.statistics = collections.Counter()
+
+    def submit(self, case):
+        loop = asyncio.get_running_loop()
+        if case in self.cache:
+            self.cache.move_to_end(case)
+            self.statistics["cacheHits"] += 1
+            future = loop.create_future()
+            future.set_result(self.cache[case])
+            return future
+        if case in self.inFlight:
+            self.statistics["coalescedCases"] += 1
+            return self.inFlight[case]
+        future = self.inFlight[case] = loop.create_future()
+        batch = self.pending.setdefault(case.options, {})
+        batch[case] = future
+        if len(batch) >= self.maxBatchSize:
+            self.flush(case.options)
+        elif len(batch) == 1:
+            self.timers[case.options] = loop.call_later(self.window, self.flush, case.options)
+        return future
+
+    async def evaluate(self, cases):
+        return await asyncio.gather(*(self.submit(case) for case in cases))
+
+    def flush(self, options):
+        timer = self.timers.pop(options, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self.pending.pop(options, None)
+        if batch:
+            asyncio.ensure_future(self.integrate(batch))
+
+    async def integrate(self, batch):
+        loop = asyncio.get_running_loop()
+        cases = list(batch)
+        try:
+            chunks = splitIntoChunks(buildBatchConfig(cases), chunkSize)
+            results = await asyncio.gather(*(loop.run_in_executor(self.executor, runBatch, chunk) for chunk in chunks))
+            result = BatchResult.concatenate(results)
+        except Exception as error:
+            for case in cases:
+                self.inFlight.pop(case, None)
+                if not batch[case].done():
+                    batch[case].set_exception(error)
+            return
+        self.statistics["batches"] += 1
+        self.statistics["integratedCases"] += len(cases)
+        self.statistics["largestBatch"] = max(self.statistics["largestBatch"], len(cases))
+        for index, case in enumerate(cases):
+            output = caseOutput(result, index)
+            self.cache[case] = output
+            self.inFlight.pop(case, None)
+            batch[case].set_result(output)
+        while len(self.cache) > self.cacheSize:
+            self.cache.popitem(last=False)
+
+    def summary(self):
+        summary = dict(self.statistics)
+        summary["meanBatchSize"] = round(self.statistics["integratedCases"] / max(self.statistics["batches"], 1), 2)
+        summary["cachedCases"] = len(self.cache)
+        return summary
+
+
+class ReactorService:
+
+    def __init__(self, executor):
+        self.coalescer = CaseCoalescer(executor)
+        self.metrics = LatencyMetrics()
+        self.started = time.time()
+        self.routes = {
+            ("POST", "/run"): self.run,
+            ("POST", "/sweep"): self.sweep,
+            ("POST", "/optimum"): self.optimum,
+            ("GET", "/metrics"): self.metricsSummary,
+            ("GET", "/health"): self.health,
+        }
+
+    async def run(self, request):
+        (output,) = await self.coalescer.evaluate([Case.fromRequest(request)])
+        return output
+
+    async def sweep(self, request):
+        request = dict(request)
+        parameter, values = request.pop("parameter", None), request.pop("values", None)
+        if parameter not in caseInputs:
+            raise ValueError("parameter must be one of %s" % ", ".join(caseInputs))
+        if not isinstance(values, list) or not values:
+            raise ValueError("values must be a non-empty list")
+        outputs = await self.coalescer.evaluate([Case.fromRequest(request, {parameter: value}) for value in values])
+        return {"parameter": parameter, "values": values, "results": outputs}
+
+    async def optimum(self, request):
+        # grid over the inlet temperature, refined once around the best feasible point
+        request = dict(request)
+        tempRange = request.pop("tempRange", (600, 740))
+        if not isinstance(tempRange, (list, tuple)) or len(tempRange) != 2:
+            raise ValueError("tempRange must be [low, high], not %r" % (tempRange,))
+        low, high = (checkNumber("tempRange", value) for value in tempRange)
+        upperTempLimit = checkNumber("upperTempLimit", request.pop("upperTempLimit", catalystMaxTemp))
+        if not low < high:
+            raise ValueError("tempRange must be [low, high] with low < high")
+        best = None
+        for _ in range(2):
+            temps = np.linspace(low, high, optimumPoints)
+            outputs = await self.coalescer.evaluate(
+                [Case.fromRequest(request, {"incomingTemp": float(temp)}) for temp in temps])
+            feasible = [i for i, output in enumerate(outputs) if output["peakTemp"] is not None
+                        and output["peakTemp"] < upperTempLimit and output["conversionN2"] is not None]
+            if not feasible:
+                break
+            index = max(feasible, key=lambda i: outputs[i]["conversionN2"])
+            best = dict(outputs[index], incomingTemp=float(temps[index]))
+            spacing = temps[1] - temps[0]
+            low, high = temps[index] - spacing, temps[index] + spacing
+        if best is None:
+            raise ValueError("no inlet temperature in tempRange keeps the bed below %g K" % upperTempLimit)
+        return best
+
+    async def metricsSummary(self, request):
+        return {"uptimeS": round(time.time() - self.started, 1), "endpoints": self.metrics.summary(),
+                "engine": self.coalescer.summary()}
+
+    async def health(self, request):
+        return {"status": "ok"}
+
+    async def handle(self, method, path, body):
+        # -> (status, JSON-ready payload)
+        handler = self.routes.get((method, path))
+        if handler is None:
+            known = any(route[1] == path for route in self.routes)
+            return (405, {"error": "method not allowed"}) if known else (404, {"error": "unknown endpoint"})
+        start = time.perf_counter()
+        try:
+            request = json.loads(body) if body else {}
+            if not isinstance(request, dict):
+                raise ValueError("request body must be a JSON object")
+            status, payload = 200, await handler(request)
+        except ValueError as error:             # json.JSONDecodeError included
+            status, payload = 400, {"error": str(error)}
+        except Exception as error:
+            status, payload = 500, {"error": "%s: %s" % (type(error).__name__, error)}
+        self.metrics.record(path, time.perf_counter() - start, status != 200)
+        return status, payload
+
+    async def serveConnection(self, reader, writer):
+        try:
+            while True:
+                requestLine = await reader.readline()
+                if not requestLine.strip():
+                    break
+                method, target, version = requestLine.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, payload = await self.handle(method.upper(), target.split("?")[0], body)
+                keepAlive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                content = json.dumps(payload).encode()
+                writer.write(("HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n"
+                              "Connection: %s\r\n\r\n" % (status, httpReasons[status], len(content),
+                                                          "keep-alive" if keepAlive else "close")).encode() + content)
+                await writer.drain()
+                if not keepAlive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass                                # malformed request line / client gone
+        finally:
+            writer.close()
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def checkNumber(key, value):
+    # JSON number -> float, ValueError (400) for anything else
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not np.isfinite(value):
+        raise ValueError("%s must be a finite number, not %r" % (key, value))
+    return float(value)
+
+
+def buildBatchConfig(cases):
+    inputs = np.array([case.inputs for case in cases]).T
+    return BatchConfig(**dict(zip(caseInputs, inputs)), **dict(zip(modelOptions, cases[0].options)))
+
+
+def caseOutput(result, index):
+    # JSON-ready outlet of one case - NaN (limit never reached) becomes null
+    output = {}
+    for name in outputFields:
+        value = float(np.real(getattr(result, name)[index]))
+        output[name] = value if np.isfinite(value) else None
+    return output
+
+
+async def serve(host=defaultHost, port=defaultPort, workers=None):
+    workers = workers or os.cpu_count()
+    # the pool starts its workers lazily, during the first request - spawned rather than forked, so a worker
+    # never inherits the socket of a connection that is open at that moment (the client would wait on its close)
+    with concurrent.futures.ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        service = ReactorService(executor)
+        server = await asyncio.start_server(service.serveConnection, host, port)
+        print("Reactor service on http://%s:%d  (%d workers)  -  Ctrl+C to stop" % (host, port, workers))
+        async with server:
+            await server.serve_forever()
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    parser = argparse.ArgumentParser(description="Serve the reactor model over a local HTTP/JSON API.")
+    parser.add_argument("--host", default=defaultHost)
+    parser.add_argument("--port", type=int, default=defaultPort)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
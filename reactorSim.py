@@ -12,7 +12,8 @@
 # - This program calculates the conversion of N2 to NH3 across a packed bed reactor.                          #
 # - The program uses the following assumptions:                                                               #
 #   - The reactor is isothermal                                                                               #
-#   - The reactor is isobaric                                                                                 #
+#   - The reactor is isobaric (unless ReactorConfig.isobaric = False, then the pressure is integrated along    #
+#     the bed with the Ergun equation and a local gas density - densityModel "idealGas" or "fugacity")        #
 # =========================================================================================================== #
 # ==================================   I N P U T   V A R I A B L E S   ====================================== #
 # ----------------------------------------- Initial Conditions ---------------------------------------------- #
@@ -35,6 +36,10 @@ MW_Ar = 39.948
 # ===================================   I M P O R T   L I B R A R I E S   =================================== #
 import numpy as np
 from reactorCalcs_1 import Fn2, ReactorUpdates
+from correlationSets import withCorrelations
+from reactorCache import runCached
+from interstageCooler import CoolerInlet, InterstageCooler
+from runQuery import DenseProfile
 import matplotlib.pyplot as plt
 import os
 import pathlib
@@ -63,6 +68,11 @@ class ReactorConfig:
     baseLength: float
     upperTempLimit: float = 803.15               # Max K, cannot exceed (catalyst max temp)
     constantPressure: float = 225               # atm (assumed constatn as pressure drop across reactor is negligible
+    isobaric: bool = True                       # False: integrate pressure alongside conversion and temperature
+    densityModel: str = "idealGas"              # "idealGas" or "fugacity" (local density for the Ergun equation)
+    effFactorModel: str = "polynomial"          # "polynomial" or "pellet" (rigorous pellet model, pelletModel.py)
+    fugacityModel: str = "gillespieBeattie"     # correlation sets (correlationSets.py)
+    rateModel: str = "temkinPyzhev"
 
     def __post_init__(self):
         self.chosenLengthIndex = int(self.baseLength / self.StepSize)               # distance along reactor bed locator
@@ -94,32 +104,20 @@ R2Config = ReactorConfig(StepSize=0.001,
 # ===================================   R E A C T O R   S E Q U E N C E   =================================== #
 class Reactor(ReactorUpdates):
 
+    def __new__(cls, *args, fugacityModel="gillespieBeattie", rateModel="temkinPyzhev", **kwargs):
+        # scalar implementations of the chosen correlation sets - one float per call
+        return super().__new__(withCorrelations(cls, fugacityModel, rateModel, scalar=True))
+
     def __init__(self, stepSize, incomingTemp, pressure, bedLength, R1InitialMoleFractionH2, R1InitialMoleFractionN2,
-                 R1InitialMoleFractionNH3, R1InitialMoleFractionAr, Fn2, F):
+                 R1InitialMoleFractionNH3, R1InitialMoleFractionAr, Fn2, F, isobaric=True, densityModel="idealGas",
+                 effFactorModel="polynomial", *, fugacityModel="gillespieBeattie", rateModel="temkinPyzhev"):
         super().__init__(stepSize, incomingTemp, pressure, bedLength, R1InitialMoleFractionH2, R1InitialMoleFractionN2,
-                         R1InitialMoleFractionNH3, R1InitialMoleFractionAr, Fn2, F)
+                         R1InitialMoleFractionNH3, R1InitialMoleFractionAr, Fn2, F, isobaric, densityModel,
+                         effFactorModel, fugacityModel, rateModel)
 
     def run(self, iterations=1):
         for _ in range(iterations):
-            self.updateEffFactor()
-            self.updateFugacityN2()
-            self.updateFugacityH2()
-            self.updateFugacityNH3()
-            self.updateHeatOfReaction()
-            self.updateSpecificHeat()
-            self.updateMoleFractionN2()
-            self.updateMoleFractionH2()
-            self.updateMoleFractionNH3()
-            self.updateMoleFractionAr()
-            self.updateActivationCoefficientN2()
-            self.updateActivationCoefficientH2()
-            self.updateActivationCoefficientNH3()
-            self.updateReactionRateConstant()
-            self.updateEquilibriumConstant()
-            self.updateEquilibriumConversion()
-            self.updateRateOfReactionNH3()
-            self.updateConversionN2()
-            self.updateTemp()
+            self.updateAll()
             self.updateStep()
 
 
@@ -151,11 +149,13 @@ def conversion_pressureR1():
             248.153,
             1041.55,
         )
-        R1.run(int(R1Config.BedLengthcalc / StepSize))
+        runCached(R1, int(R1Config.BedLengthcalc / StepSize))
 
         ax00.plot(R1.steps, R1._temp, "--", color="black")
         ax01.plot(R1.steps, R1._conversionN2, label=str(pressurelist[i]) + "atm")
-        ax00.plot(len([x for x in R1._temp if x < upperTempLimit]) * StepSize,
+        # limit never reached: marker at the bed outlet
+        limitPosition = DenseProfile.fromReactor(R1).positionWhere("temp", upperTempLimit)
+        ax00.plot(R1.bedLength if np.isnan(limitPosition) else limitPosition,
                   upperTempLimit,
                   "ro",
                   markersize=10,
@@ -190,11 +190,12 @@ def conversion_pressureR1():
             R2FN2, 
             R2F
         )
-        R2.run(int(R2Config.BedLengthcalc / StepSize))
+        runCached(R2, int(R2Config.BedLengthcalc / StepSize))
 
         ax02.plot(R2.steps, R2._temp, "--", color="black")
         ax03.plot(R2.steps, R2._conversionN2, label=str(pressurelist[i]) + "atm")
-        ax02.plot(len([x for x in R2._temp if x < upperTempLimit]) * StepSize,
+        limitPosition = DenseProfile.fromReactor(R2).positionWhere("temp", upperTempLimit)
+        ax02.plot(R2.bedLength if np.isnan(limitPosition) else limitPosition,
                   upperTempLimit,
                   "ro",
                   markersize=10,
@@ -250,8 +251,13 @@ def main():
         R1Config.initialMoleFractionAr,
         248.153,
         1041.55,
+        R1Config.isobaric,
+        R1Config.densityModel,
+        R1Config.effFactorModel,
+        fugacityModel=R1Config.fugacityModel,
+        rateModel=R1Config.rateModel,
     )
-    R1.run(int(R1Config.BedLengthcalc / R1Config.StepSize))
+    runCached(R1, int(R1Config.BedLengthcalc / R1Config.StepSize))
 
     R2 = Reactor(
         R2Config.StepSize,
@@ -263,13 +269,21 @@ def main():
         R2Config.initialMoleFractionNH3,
         R2Config.initialMoleFractionAr,
         R2FN2,
-        R2F
+        R2F,
+        R2Config.isobaric,
+        R2Config.densityModel,
+        R2Config.effFactorModel,
+        fugacityModel=R2Config.fugacityModel,
+        rateModel=R2Config.rateModel,
     )
-    R2.run(int(R2Config.BedLengthcalc / R2Config.StepSize))
+    runCached(R2, int(R2Config.BedLengthcalc / R2Config.StepSize))
+    R1Profile = DenseProfile.fromReactor(R1)                # state at any bed length from the one run
+    R2Profile = DenseProfile.fromReactor(R2)
 
     # ----------------------- print various results to 3 d.p --------------------------------#
     print("R-601 Starting Temperature: ", round(R1.incomingTemp, 3), "K")
     print("R-601 Final Temperature: ", round(R1.temp, 3), "K")
+    print("R-601 Final Pressure: ", round(R1.pressure, 3), "atm")
     print("---------------------------------------------------------------------")
     print("R-601 Initial Mole Fraction H2: ", round(R1Config.initialMoleFractionH2, 3))
     print("R-601 Initial Mole Fraction N2: ", round(R1Config.initialMoleFractionN2, 3))
@@ -308,8 +322,16 @@ def main():
             R1.initialMoleFractionAr * MW_Ar + R1.initialMoleFractionH2 * MW_H2 + R1.initialMoleFractionN2 * MW_N2 +
             R1.initialMoleFractionNH3 * MW_NH3, 3), "g mol^-1")
     print("---------------------------------------------------------------------")
+    interstageCooler = InterstageCooler(outletTemp=R2Config.incomingTemp)
+    print("R-601 -> R-602 Interstage Cooler Duty: ",
+          round(interstageCooler.calcDuty(CoolerInlet.fromProfile(R1Profile, R1Config.baseLength, R1.F, R1.Fn2)) / 1e3,
+                3), "MW")
+    print("R-601 Temperature Limit Reached At: ", round(R1Profile.positionWhere("temp", R1Config.upperTempLimit), 4), "m")
+    print("R-602 Temperature Limit Reached At: ", round(R2Profile.positionWhere("temp", R2Config.upperTempLimit), 4), "m")
+    print("---------------------------------------------------------------------")
     print("R-602 Starting Temperature: ", round(R2.incomingTemp, 3), "K")
     print("R-602 Final Temperature: ", round(R2.temp, 3), "K")
+    print("R-602 Final Pressure: ", round(R2.pressure, 3), "atm")
     print("---------------------------------------------------------------------")
     print("R-602 Initial Mole Fraction H2: ", round(R2.initialMoleFractionH2, 3))
     print("R-602 Initial Mole Fraction N2: ", round(R2.initialMoleFractionN2, 3))
@@ -0,0 +1,196 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Polynomial response-surface surrogates of R-601/R-602 for plant-wide what-if studies:       #
+#                  final N2 conversion, outlet temperature and limit-crossing length as functions of inlet     #
+#                  temperature, pressure, feed composition and feed rate.                                     #
+#                - Training cases are drawn by Latin hypercube over the ReactorConfig design space and solved  #
+#                  with the batched engine over a process pool, through the on-disk results store             #
+#                  (reactorCache.runBatchCached).                                                             #
+#                - Least-squares fit on inputs scaled to [-1, 1]; predict() is a single matrix product for any #
+#                  number of points and returns the standard error of prediction of the regression with it.  #
+#                - Surrogates are saved to / loaded from .npz, and validate() reports the errors against fresh #
+#                  full-model solves.                                                                         #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - python reactorSurrogate.py      trains both surrogates, saves them to Surrogates/ and prints the report    #
+# - surrogate = ReactorSurrogate.load("Surrogates/R-601.npz")                                                #
+#   mean, error = surrogate.predict(incomingTemp=..., pressure=..., ...)    (each output: arrays)             #
+# - limitCrossingLength is trained as the bed length when the limit is never reached                         #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+numberOfTrainingSamples = 2048
+numberOfValidationSamples = 256
+polynomialDegree = 4
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import itertools
+import os
+import pathlib
+import numpy as np
+from scipy.stats import qmc
+from prettytable import PrettyTable
+from reactorCache import runBatchCached
+from reactorSim import R1Config, R2Config, R2F
+from sensitivityAnalysis import buildBatchConfig
+surrogatePath = os.path.join(pathlib.Path(__file__).parent.absolute(), "Surrogates")
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+surrogateOutputs = ("conversionN2", "temp", "limitCrossingLength")
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class ReactorSurrogate:
+    inputNames: tuple
+    low: np.ndarray
+    high: np.ndarray
+    exponents: np.ndarray               # (nTerms, nInputs) - monomial powers
+    outputNames: tuple
+    coefficients: np.ndarray            # (nOutputs, nTerms)
+    XtXinverse: np.ndarray              # (nTerms, nTerms) - coefficient covariance / residual variance
+    residualStd: np.ndarray             # (nOutputs,)
+
+    def features(self, inputs):
+        # inputs: name -> array, broadcast against each other
+        columns = np.broadcast_arrays(*(np.asarray(inputs[name], dtype=float) for name in self.inputNames))
+        scaled = 2 * (np.stack([column.ravel() for column in columns], axis=1) - self.low) / (self.high - self.low) - 1
+        # powers of each input looked up from a small table instead of raising every term separately
+        features = np.ones((len(scaled), len(self.exponents)))
+        for i in range(scaled.shape[1]):
+            powers = scaled[:, i, None] ** np.arange(self.exponents[:, i].max() + 1)
+            features *= powers[:, self.exponents[:, i]]
+        return features, columns[0].shape
+
+    def predict(self, **inputs):
+        # returns ({output: mean}, {output: standard error of prediction}), arrays shaped like the inputs
+        X, shape = self.features(inputs)
+        mean = X @ self.coefficients.T
+        leverage = np.sum((X @ self.XtXinverse) * X, axis=1)
+        error = self.residualStd * np.sqrt(1 + leverage[:, None])
+        return ({name: mean[:, o].reshape(shape) for o, name in enumerate(self.outputNames)},
+                {name: error[:, o].reshape(shape) for o, name in enumerate(self.outputNames)})
+
+    def save(self, path):
+        np.savez(path, **{field.name: np.asarray(getattr(self, field.name)) for field in dataclasses.fields(self)})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            fields = {field.name: data[field.name] for field in dataclasses.fields(cls)}
+        fields["inputNames"] = tuple(str(name) for name in fields["inputNames"])
+        fields["outputNames"] = tuple(str(name) for name in fields["outputNames"])
+        return cls(**fields)
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def designSpace(config, F):
+    # name: (low, high)
+    return {
+        "incomingTemp": (config.incomingTemp - 40, config.incomingTemp + 40),           # K
+        "pressure": (150, 300),                                                         # atm
+        "initialMoleFractionNH3": (0.5 * config.initialMoleFractionNH3, 1.5 * config.initialMoleFractionNH3),
+        "ratioH2N2": (2.5, 3.5),
+        "F": (0.8 * F, 1.2 * F),                                                        # kmol/hr
+    }
+
+
+def sampleDesignSpace(space, numberOfSamples, seed=None):
+    unit = qmc.LatinHypercube(len(space), seed=seed).random(numberOfSamples)
+    return {name: low + unit[:, i] * (high - low) for i, (name, (low, high)) in enumerate(space.items())}
+
+
+def solveFullModel(config, inputs, workers=None):
+    inputs = dict(inputs)
+    F = inputs.pop("F")
+    result = runBatchCached(buildBatchConfig(config, F, dict(inputs, bedLength=config.baseLength)), workers=workers)
+    return {
+        "conversionN2": result.conversionN2,
+        "temp": result.temp,
+        "limitCrossingLength": np.where(np.isnan(result.limitCrossingLength), config.baseLength,
+                                        result.limitCrossingLength),
+    }
+
+
+def monomialExponents(numberOfInputs, degree):
+    exponents = [np.zeros(numberOfInputs, dtype=int)]
+    for order in range(1, degree + 1):
+        for combination in itertools.combinations_with_replacement(range(numberOfInputs), order):
+            exponents.append(np.bincount(combination, minlength=numberOfInputs))
+    return np.array(exponents)
+
+
+def trainSurrogate(config, F, numberOfSamples=numberOfTrainingSamples, degree=polynomialDegree, workers=None,
+                   seed=None):
+    space = designSpace(config, F)
+    inputs = sampleDesignSpace(space, numberOfSamples, seed)
+    outputs = solveFullModel(config, inputs, workers)
+
+    surrogate = ReactorSurrogate(
+        inputNames=tuple(space),
+        low=np.array([bounds[0] for bounds in space.values()]),
+        high=np.array([bounds[1] for bounds in space.values()]),
+        exponents=monomialExponents(len(space), degree),
+        outputNames=surrogateOutputs,
+        coefficients=None,
+        XtXinverse=None,
+        residualStd=None,
+    )
+    X, _ = surrogate.features(inputs)
+    Y = np.stack([outputs[name] for name in surrogateOutputs], axis=1)
+    valid = np.all(np.isfinite(Y), axis=1)
+    X, Y = X[valid], Y[valid]
+    coefficients = np.linalg.lstsq(X, Y, rcond=None)[0]
+    degreesOfFreedom = max(len(X) - X.shape[1], 1)
+    residualVariance = np.sum((Y - X @ coefficients) ** 2, axis=0) / degreesOfFreedom
+    surrogate.coefficients = coefficients.T
+    surrogate.XtXinverse = np.linalg.pinv(X.T @ X)
+    surrogate.residualStd = np.sqrt(residualVariance)
+    return surrogate
+
+
+def validate(surrogate, config, F, numberOfSamples=numberOfValidationSamples, workers=None, seed=None):
+    inputs = sampleDesignSpace(designSpace(config, F), numberOfSamples, seed)
+    actual = solveFullModel(config, inputs, workers)
+    predicted, error = surrogate.predict(**inputs)
+    report = {}
+    for name in surrogate.outputNames:
+        valid = np.isfinite(actual[name])
+        residual = predicted[name][valid] - actual[name][valid]
+        report[name] = {
+            "rmse": np.sqrt(np.mean(residual**2)),
+            "maxError": np.max(np.abs(residual)),
+            "r2": 1 - np.sum(residual**2) / np.sum((actual[name][valid] - actual[name][valid].mean()) ** 2),
+            "coverage": np.mean(np.abs(residual) <= 2 * error[name][valid]),     # within the 2-sigma band
+            "meanError": np.mean(error[name][valid]),
+        }
+    return report
+
+
+def validationTable(title, report):
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = title
+    table.field_names = ["Output", "RMSE", "Max |error|", "R2", "Mean predicted error", "2-sigma coverage"]
+    for name, row in report.items():
+        table.add_row([name, "%.4g" % row["rmse"], "%.4g" % row["maxError"], round(row["r2"], 5),
+                       "%.4g" % row["meanError"], "%.1f %%" % (100 * row["coverage"])])
+    return table
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    os.makedirs(surrogatePath, exist_ok=True)
+    for name, config, F in [("R-601", R1Config, 1041.55), ("R-602", R2Config, R2F)]:
+        surrogate = trainSurrogate(config, F, seed=0)
+        surrogate.save(os.path.join(surrogatePath, name + ".npz"))
+        print(validationTable(name + " surrogate vs full model (%d fresh solves)" % numberOfValidationSamples,
+                              validate(surrogate, config, F, seed=1)))
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
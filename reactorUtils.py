@@ -8,13 +8,20 @@
 class ReactorBase:
 
     def __init__(self, stepSize, incomingTemp, pressure, bedLength, initialMoleFractionH2, initialMoleFractionN2,
-                 initialMoleFractionNH3, initialMoleFractionAr, Fn2, F):
+                 initialMoleFractionNH3, initialMoleFractionAr, Fn2, F, isobaric=True, densityModel="idealGas",
+                 effFactorModel="polynomial", fugacityModel="gillespieBeattie", rateModel="temkinPyzhev"):
         #self._conversionN2 = [0]
         self._stepSize = stepSize
         self.incomingTemp = incomingTemp
         self._temp = [incomingTemp]
         self._steps = [0]
-        self.pressure = pressure
+        self._pressure = [pressure]
+        self.isobaric = isobaric                    # False: pressure is integrated along the bed (Ergun equation)
+        self.densityModel = densityModel            # "idealGas" or "fugacity" - local gas density, non-isobaric only
+        self.effFactorModel = effFactorModel        # "polynomial" or "pellet" (pelletModel.py)
+        self.fugacityModel = fugacityModel          # correlation sets, see correlationSets.py
+        self.rateModel = rateModel
+        self._gasDensity = [0]
         self.bedLength = bedLength
         self._effFactor = [0]
         self._heatOfReaction = [0]
@@ -51,6 +58,22 @@ class ReactorBase:
     def temp(self, value):
         self._temp.append(value)
 
+    @property
+    def pressure(self):
+        return self._pressure[-1]
+
+    @pressure.setter
+    def pressure(self, value):
+        self._pressure.append(value)
+
+    @property
+    def gasDensity(self):
+        return self._gasDensity[-1]
+
+    @gasDensity.setter
+    def gasDensity(self, value):
+        self._gasDensity.append(value)
+
     @property
     def effFactor(self):
         return self._effFactor[-1]
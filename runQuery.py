@@ -0,0 +1,202 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Dense output of a completed run: the state at ANY axial position, and the position where a  #
+#                  target conversion / temperature / ... is first reached, without rerunning the bed.         #
+#                - Works on a reactorSim.Reactor run (every history list) and on the profiles of a batched     #
+#                  run (reactorEngine.runBatch(..., recordEvery=k), one column per case).                    #
+#                - Profiles are interpolated with monotone piecewise cubics (PCHIP), so no overshoot appears    #
+#                  between the stored points. Batched profiles recorded on a coarse grid can instead use a    #
+#                  cubic Hermite spline with the model's own dX/dz and dT/dz at every record.                 #
+#                - Bed-length trade-off studies therefore need one integration per feed condition.            #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - profile = DenseProfile.fromReactor(R1)                       (after runCached(R1, ...) / R1.run(...))      #
+# - profile.stateAt(2.1)                  ->  {"temp": ..., "conversionN2": ..., "moleFractionNH3": ...}       #
+# - profile.positionWhere("temp", 803.15) ->  bed length at which the catalyst limit is reached (NaN if never) #
+# - profile = DenseProfile.fromBatchResult(runBatch(config, recordEvery=50), config)                          #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+candidateLengths = {
+    # reactor:  bed lengths compared in main() (m)
+    "R-601":    (1.6, 1.8, 2.0, 2.1, 2.2, 2.4),
+    "R-602":    (4.0, 4.5, 5.0, 5.35, 5.5, 6.0),
+}
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import numpy as np
+from scipy.interpolate import CubicHermiteSpline, PchipInterpolator
+from prettytable import PrettyTable
+from interstageCooler import CoolerInlet, InterstageCooler
+from reactorEngine import catalystMaxTemp, evaluateLocalRates
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+# histories of reactorSim.Reactor holding the state at the END of each step (entry k at position k * stepSize)
+stateHistories = ("temp", "conversionN2", "pressure")
+# histories evaluated at the START of each step by updateRates (entry k at position (k - 1) * stepSize)
+localHistories = ("moleFractionH2", "moleFractionN2", "moleFractionNH3", "moleFractionAr", "effFactor",
+                  "heatOfReaction", "specificHeat", "fugacityH2", "fugacityN2", "fugacityNH3",
+                  "activationCoefficientH2", "activationCoefficientN2", "activationCoefficientNH3",
+                  "reactionRateConstant", "equilibriumConstant", "rateOfReactionNH3")
+bisectionIterations = 60                # position of a crossing inside one interval, to round-off              #
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class DenseProfile:
+    bedLength: float                    # m - queries are valid on [0, bedLength]
+    interpolators: dict                 # name -> piecewise cubic in z (values (nPoints,) or (nPoints, nCases))
+
+    @classmethod
+    def fromReactor(cls, reactor):
+        length = np.asarray(reactor.steps, dtype=float)
+        interpolators = {}
+        for name in stateHistories:
+            history = np.asarray(getattr(reactor, "_" + name), dtype=float)
+            if len(history) == 1:                           # isobaric pressure - a single stored value
+                interpolators[name] = PchipInterpolator(length[[0, -1]], history[[0, 0]])
+            else:
+                interpolators[name] = PchipInterpolator(length, history)
+        for name in localHistories:
+            # last step's value is carried over the final step to the outlet
+            history = np.asarray(getattr(reactor, "_" + name)[1:], dtype=float)
+            interpolators[name] = PchipInterpolator(length[:-1], history)
+        return cls(length[-1], interpolators)
+
+    @classmethod
+    def fromBatchResult(cls, result, config=None):
+        # config given: Hermite spline with dX/dz and dT/dz of the model at each record (accurate on coarse grids)
+        if result.length is None:
+            raise ValueError("BatchResult has no profiles - run it with runBatch(..., recordEvery=k)")
+        temp, conversionN2, pressure = (np.real(profile) for profile in
+                                        (result.tempProfile, result.conversionProfile, result.pressureProfile))
+        if config is None:
+            interpolators = {
+                "temp": PchipInterpolator(result.length, temp),
+                "conversionN2": PchipInterpolator(result.length, conversionN2),
+            }
+        else:
+            conversionRate, tempRate, _ = evaluateLocalRates(dataclasses.replace(config, pressure=pressure),
+                                                             temp, conversionN2)
+            interpolators = {
+                "temp": CubicHermiteSpline(result.length, temp, np.real(tempRate)),
+                "conversionN2": CubicHermiteSpline(result.length, conversionN2, np.real(conversionRate)),
+            }
+        interpolators["pressure"] = PchipInterpolator(result.length, pressure)
+        return cls(result.length[-1], interpolators)
+
+    @property
+    def names(self):
+        return tuple(self.interpolators)
+
+    def checkPosition(self, position):
+        position = np.asarray(position, dtype=float)
+        if np.any(position < 0) or np.any(position > self.bedLength * (1 + 1e-12)):
+            raise ValueError("position outside the integrated bed (0 to %g m)" % self.bedLength)
+        return position
+
+    def stateAt(self, position, names=None):
+        # position: scalar or array of positions; batched profiles give one column per case
+        position = self.checkPosition(position)
+        return {name: self.interpolators[name](position) for name in (names or self.names)}
+
+    def stateAtEachCase(self, position, names=None):
+        # batched profiles: one position per case (e.g. from positionWhere) -> one value per case
+        position = self.checkPosition(position)
+        return {name: evaluateCaseWise(self.interpolators[name], position) for name in (names or self.names)}
+
+    def positionWhere(self, name, target):
+        # first position where the profile reaches target from either side, NaN where it never does
+        return firstCrossing(self.interpolators[name], target)
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def evaluateInterval(interpolator, interval, position):
+    # cubic of interval[c] of column c at position[c]
+    coefficients = interpolator.c.reshape(interpolator.c.shape[:2] + (-1,))
+    columns = np.arange(coefficients.shape[2])
+    local = position - interpolator.x[interval]
+    value = np.zeros(np.shape(position))
+    for power in range(coefficients.shape[0]):
+        value = value * local + coefficients[power, interval, columns]
+    return value
+
+
+def columnShaped(interpolator, value):
+    # one entry per column back to the shape of the profile values (a float for a single profile)
+    value = value.reshape(interpolator.c.shape[2:])
+    return float(value) if value.ndim == 0 else value
+
+
+def evaluateCaseWise(interpolator, position):
+    # value of column c at position[c] - one cubic per case, not the full (nPositions, nCases) table
+    numberOfColumns = int(np.prod(interpolator.c.shape[2:]))
+    position = np.broadcast_to(position, (numberOfColumns,))
+    interval = np.clip(np.searchsorted(interpolator.x, position, side="right") - 1, 0, len(interpolator.x) - 2)
+    return columnShaped(interpolator, evaluateInterval(interpolator, interval, position))
+
+
+def firstCrossing(interpolator, target):
+    # bracket on the stored points, then bisection on the cubic of the bracketing interval
+    difference = interpolator.c[-1].reshape(len(interpolator.x) - 1, -1) - target
+    difference = np.concatenate([difference, interpolator(interpolator.x[-1]).reshape(1, -1) - target])
+    reached = (np.sign(difference) != np.sign(difference[0])) | (difference == 0)
+    found = reached.any(axis=0)
+    index = np.argmax(reached, axis=0)
+
+    interval = np.maximum(index - 1, 0)
+    lower, upper = interpolator.x[interval], interpolator.x[index]
+    lowerSign = np.sign(difference[interval, np.arange(difference.shape[1])])
+    for _ in range(bisectionIterations):
+        middle = 0.5 * (lower + upper)
+        sameSide = np.sign(evaluateInterval(interpolator, interval, middle) - target) == lowerSign
+        lower = np.where(sameSide, middle, lower)
+        upper = np.where(sameSide, upper, middle)
+    position = np.where(index == 0, interpolator.x[0], 0.5 * (lower + upper))
+    return columnShaped(interpolator, np.where(found, position, np.nan))
+
+
+def bedLengthTable(title, profile, lengths, F, Fn2, coolerOutletTemp=None, upperTempLimit=catalystMaxTemp):
+    # one completed run -> outlet state (and interstage cooler duty) of every candidate bed length
+    cooler = None if coolerOutletTemp is None else InterstageCooler(outletTemp=coolerOutletTemp)
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = title
+    table.field_names = ["Bed length (m)", "Outlet T (K)", "Conversion N2", "Mole fraction NH3",
+                         "Cooler duty (MW)", "Below T limit"]
+    limitLength = profile.positionWhere("temp", upperTempLimit)
+    for length in lengths:
+        state = profile.stateAt(length)
+        duty = "-" if cooler is None else round(float(cooler.calcDuty(
+            CoolerInlet.fromProfile(profile, length, F, Fn2))) / 1e3, 3)
+        table.add_row([length, round(float(state["temp"]), 3), round(float(state["conversionN2"]), 5),
+                       round(float(state["moleFractionNH3"]), 5), duty,
+                       "yes" if np.isnan(limitLength) or length < limitLength else "no"])
+    return table
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    # imported here - reactorSim itself uses DenseProfile
+    from reactorCache import runCached
+    from reactorSim import R1Config, R2Config, R2FN2, R2F, Reactor
+    reactors = [("R-601", R1Config, 248.153, 1041.55, R2Config.incomingTemp), ("R-602", R2Config, R2FN2, R2F, None)]
+    for name, config, Fn2, F, coolerOutletTemp in reactors:
+        reactor = Reactor(config.StepSize, config.incomingTemp, config.constantPressure, config.BedLengthcalc,
+                          config.initialMoleFractionH2, config.initialMoleFractionN2, config.initialMoleFractionNH3,
+                          config.initialMoleFractionAr, Fn2, F, config.isobaric, config.densityModel,
+                          config.effFactorModel, fugacityModel=config.fugacityModel, rateModel=config.rateModel)
+        runCached(reactor, int(config.BedLengthcalc / config.StepSize))
+        profile = DenseProfile.fromReactor(reactor)
+        print(name, "Temperature limit reached at: ", round(profile.positionWhere("temp", config.upperTempLimit), 4),
+              "m")
+        print(bedLengthTable(name + " candidate bed lengths (one run)", profile, candidateLengths[name], F, Fn2,
+                             coolerOutletTemp, config.upperTempLimit))
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
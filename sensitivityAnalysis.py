@@ -0,0 +1,153 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Variance-based global sensitivity analysis (Sobol indices) of the R-601/R-602 design        #
+#                  outputs: final N2 conversion and peak bed temperature.                                     #
+#                - Inputs: inlet temperature, pressure, feed composition (NH3 mole fraction, H2/N2 ratio),     #
+#                  Temkin alpha, activation energy E, Arrhenius constant ko and bed length.                   #
+#                - Saltelli sampling, N * (d + 2) reactor solves run through the batched engine over a         #
+#                  process pool and the on-disk results store (reactorCache.runBatchCached). First-order     #
+#                  (Saltelli 2010) and total (Jansen) indices with bootstrap confidence intervals.            #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - numberOfBaseSamples should be a power of 2 (Sobol sequence). Solves per reactor = N * (d + 2)             #
+# - Ranges are defined relative to R1Config/R2Config in inputRanges()                                         #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+numberOfBaseSamples = 2048              # N
+numberOfBootstraps = 500
+confidenceLevel = 0.95
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import numpy as np
+from scipy.stats import qmc
+from prettytable import PrettyTable
+from reactorCalcs_1 import ko, E
+from reactorEngine import BatchConfig
+from reactorCache import runBatchCached
+from reactorSim import R1Config, R2Config, R2F
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class SobolIndices:
+    names: list
+    firstOrder: np.ndarray
+    firstOrderInterval: np.ndarray      # (d, 2) - lower/upper confidence bound
+    total: np.ndarray
+    totalInterval: np.ndarray           # (d, 2)
+    validSamples: int
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def inputRanges(config):
+    # name: (low, high) - sampled uniformly
+    return {
+        "incomingTemp": (config.incomingTemp - 20, config.incomingTemp + 20),           # K
+        "pressure": (150, 300),                                                         # atm
+        "initialMoleFractionNH3": (0.5 * config.initialMoleFractionNH3, 1.5 * config.initialMoleFractionNH3),
+        "ratioH2N2": (2.5, 3.5),
+        "alpha": (0.5, 0.75),
+        "E": (0.97 * E, 1.03 * E),                                                      # J/mol
+        "ko": (0.5 * ko, 2 * ko),
+        "bedLength": (0.8 * config.baseLength, 1.2 * config.baseLength),                # m
+    }
+
+
+def buildBatchConfig(config, F, inputs):
+    # H2/N2 ratio and NH3 fraction sampled, Ar fraction kept, H2 + N2 fill the rest of the feed
+    inputs = dict(inputs)
+    ratioH2N2 = inputs.pop("ratioH2N2")
+    moleFractionN2 = (1 - inputs["initialMoleFractionNH3"] - config.initialMoleFractionAr) / (1 + ratioH2N2)
+    return BatchConfig.fromReactorConfig(
+        config,
+        Fn2=None,
+        F=F,
+        initialMoleFractionN2=moleFractionN2,
+        initialMoleFractionH2=ratioH2N2 * moleFractionN2,
+        **inputs,
+    )
+
+
+def saltelliSamples(ranges, numberOfBaseSamples, seed=None):
+    # returns A, B and the d "AB" matrices (column i of A replaced by column i of B), stacked as one batch
+    d = len(ranges)
+    unit = qmc.Sobol(2 * d, scramble=True, seed=seed).random(numberOfBaseSamples)
+    low = np.array([bounds[0] for bounds in ranges.values()])
+    high = np.array([bounds[1] for bounds in ranges.values()])
+    A = low + unit[:, :d] * (high - low)
+    B = low + unit[:, d:] * (high - low)
+    AB = np.repeat(A[None, :, :], d, axis=0)
+    AB[np.arange(d), :, np.arange(d)] = B.T
+    return np.concatenate([A, B, AB.reshape(-1, d)])
+
+
+def estimateIndices(fA, fB, fAB):
+    # fA, fB: (N,)   fAB: (d, N). Outputs are centred first - peak temperatures of ~800 K would otherwise swamp S1
+    mean = np.mean(np.concatenate([fA, fB]))
+    fA, fB, fAB = fA - mean, fB - mean, fAB - mean
+    variance = np.var(np.concatenate([fA, fB]), ddof=1)
+    firstOrder = np.mean(fB * (fAB - fA), axis=1) / variance
+    total = 0.5 * np.mean((fA - fAB) ** 2, axis=1) / variance
+    return firstOrder, total
+
+
+def calcSobolIndices(names, outputs, numberOfBaseSamples, numberOfBootstraps=numberOfBootstraps, seed=None):
+    d = len(names)
+    fA = outputs[:numberOfBaseSamples]
+    fB = outputs[numberOfBaseSamples:2 * numberOfBaseSamples]
+    fAB = outputs[2 * numberOfBaseSamples:].reshape(d, numberOfBaseSamples)
+    valid = np.isfinite(fA) & np.isfinite(fB) & np.all(np.isfinite(fAB), axis=0)
+    fA, fB, fAB = fA[valid], fB[valid], fAB[:, valid]
+
+    firstOrder, total = estimateIndices(fA, fB, fAB)
+    generator = np.random.default_rng(seed)
+    resampled = generator.integers(0, len(fA), size=(numberOfBootstraps, len(fA)))
+    bootstrap = [estimateIndices(fA[rows], fB[rows], fAB[:, rows]) for rows in resampled]
+    tail = 100 * (1 - confidenceLevel) / 2
+    firstOrderInterval = np.percentile([b[0] for b in bootstrap], [tail, 100 - tail], axis=0).T
+    totalInterval = np.percentile([b[1] for b in bootstrap], [tail, 100 - tail], axis=0).T
+    return SobolIndices(list(names), firstOrder, firstOrderInterval, total, totalInterval, int(valid.sum()))
+
+
+def runSensitivityAnalysis(config, F, numberOfBaseSamples=numberOfBaseSamples, workers=None, seed=None):
+    ranges = inputRanges(config)
+    samples = saltelliSamples(ranges, numberOfBaseSamples, seed)
+    batchConfig = buildBatchConfig(config, F, {name: samples[:, i] for i, name in enumerate(ranges)})
+    result = runBatchCached(batchConfig, workers=workers)
+    return {
+        "Final conversion N2": calcSobolIndices(ranges, result.conversionN2, numberOfBaseSamples, seed=seed),
+        "Peak temperature": calcSobolIndices(ranges, result.peakTemp, numberOfBaseSamples, seed=seed),
+    }
+
+
+def indicesTable(title, indices):
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = title + "  (%d valid base samples)" % indices.validSamples
+    table.field_names = ["Input", "S1", "S1 %d%% CI" % (100 * confidenceLevel), "ST", "ST %d%% CI" % (100 * confidenceLevel)]
+    for i, name in enumerate(indices.names):
+        table.add_row([
+            name,
+            round(indices.firstOrder[i], 3),
+            "[%.3f, %.3f]" % tuple(indices.firstOrderInterval[i]),
+            round(indices.total[i], 3),
+            "[%.3f, %.3f]" % tuple(indices.totalInterval[i]),
+        ])
+    return table
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    for name, config, F in [("R-601", R1Config, 1041.55), ("R-602", R2Config, R2F)]:
+        results = runSensitivityAnalysis(config, F)
+        for output, indices in results.items():
+            print(indicesTable(name + " " + output, indices))
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
@@ -0,0 +1,234 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Continuation for sweeps whose points need an iterative solve (shooting, recycle loops):    #
+#                  neighbouring sweep points have nearly the same solution, so every point starts from its     #
+#                  neighbours instead of from scratch.                                                        #
+#                - naturalContinuation: the parameter is stepped through the given values. Each solve starts   #
+#                  from the linear extrapolation of the last two solutions (secant predictor) and reuses the  #
+#                  converged slope of the last point as its first derivative - one march instead of two to    #
+#                  get going, and a guess already close to the answer.                                        #
+#                - pseudoArclength: parameter AND unknown move together along the solution curve, so the sweep #
+#                  passes turning points (folds) where natural continuation breaks down. Corrector with a      #
+#                  Broyden-updated gradient, adaptive arc step.                                               #
+#                - A problem supplies solve(parameter, guess, slope) and residual(parameter, unknown);         #
+#                  CoolantShooting wraps the counter-current cooled bed of reactorGeometry.                  #
+#                - main() reports the marches (solver iterations) of cold and warm-started sweeps.            #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - problem = CoolantShooting(config, CooledTubeBed(0.05, 121, 5.0), Coolant(0.08, 20, 600))                  #
+# - sweep = naturalContinuation(problem, np.arange(640, 721, 4))   ->  sweep.solutions, sweep.evaluations       #
+# - curve = pseudoArclength(problem, 640, (640, 720), stepLength=0.05, scales=(100, 100))                      #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+tempSweep = (640, 720, 4)               # K      inlet temperature sweep of main() (low, high, step)          #
+pressureSweep = (150, 300, 15)          # atm    pressure sweep of main()                                     #
+maxCorrectorIterations = 8
+finiteDifferenceStep = 1e-4             #        scaled units, gradient at the start of an arc                #
+stepGrowth = 1.5                        #        arc step x 1.5 after an easy corrector, / 2 after a failure  #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import time
+import numpy as np
+from prettytable import PrettyTable
+from reactorEngine import BatchConfig
+from reactorGeometry import Coolant, CooledTubeBed, marchGeometry, runGeometry, shootingTolerance, tabulateGeometry
+from reactorSim import R1Config
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class CoolantShooting:
+    # counter-current cooled bed: parameter = one BatchConfig field, unknown = coolant temperature at the bed inlet
+    config: BatchConfig
+    geometry: object
+    coolant: Coolant
+    parameterName: str = "incomingTemp"
+
+    def __post_init__(self):
+        if self.coolant.flow != "counter":
+            raise ValueError("CoolantShooting needs a counter-current coolant - co-current beds need no shooting")
+        self.config, self.area, self.cooledPerimeter = tabulateGeometry(self.config, self.geometry)
+
+    def configAt(self, parameter):
+        return dataclasses.replace(self.config, **{self.parameterName: parameter})
+
+    def solve(self, parameter, guess=None, slope=None):
+        # -> (unknown, slope, marches, result)
+        result = runGeometry(self.configAt(parameter), self.geometry, self.coolant, initialGuess=guess,
+                             initialSlope=slope)
+        slope = None if result.shootingSlope is None else float(result.shootingSlope[0])
+        return float(result.coolantOutletTemp[0]), slope, result.shootingIterations, result
+
+    def residual(self, parameter, unknown):
+        # -> (coolant inlet mismatch (K), result) - one march
+        result = marchGeometry(self.configAt(parameter), self.area, self.cooledPerimeter, self.coolant, unknown)
+        return float(result.coolantOutletTemp[0]) - self.coolant.inletTemp, result
+
+
+@dataclasses.dataclass
+class ContinuationPoint:
+    parameter: float
+    unknown: float
+    evaluations: int                    # residual evaluations (marches) spent on this point
+    result: object                      # solver output at the point
+    tangent: np.ndarray = None          # scaled (dparameter, dunknown)/ds - arclength points only
+
+
+@dataclasses.dataclass
+class ContinuationResult:
+    points: list
+    evaluations: int                    # total, start-up included
+    wallTime: float                     # s
+
+    @property
+    def parameters(self):
+        return np.array([point.parameter for point in self.points])
+
+    @property
+    def solutions(self):
+        return np.array([point.unknown for point in self.points])
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def naturalContinuation(problem, parameters, warmStart=True):
+    # warmStart=False solves every point from scratch (the reference for the savings)
+    start = time.perf_counter()
+    points = []
+    slope = None
+    for parameter in parameters:
+        guess = None
+        if warmStart and len(points) >= 2:
+            previous, last = points[-2], points[-1]
+            guess = last.unknown + (parameter - last.parameter) * (last.unknown - previous.unknown) / (
+                last.parameter - previous.parameter)
+        elif warmStart and points:
+            guess = points[-1].unknown
+        unknown, newSlope, evaluations, result = problem.solve(parameter, guess, slope if warmStart else None)
+        slope = newSlope if newSlope is not None else slope
+        points.append(ContinuationPoint(float(parameter), unknown, evaluations, result))
+    return ContinuationResult(points, sum(point.evaluations for point in points), time.perf_counter() - start)
+
+
+def calcTangent(gradient, previousTangent):
+    # unit vector along the curve (gradient . tangent = 0), oriented like the previous tangent
+    tangent = np.array([gradient[1], -gradient[0]])
+    tangent /= np.linalg.norm(tangent)
+    return tangent if tangent @ previousTangent >= 0 else -tangent
+
+
+def pseudoArclength(problem, parameter, parameterBounds, stepLength, scales=(1.0, 1.0), guess=None,
+                    maxStepLength=None, minStepLength=1e-4, maxPoints=500):
+    # traces the solution curve from parameter (converged with problem.solve) until it leaves parameterBounds;
+    # stepLength and the tangents are in scaled units (parameter / scales[0], unknown / scales[1])
+    start = time.perf_counter()
+    scales = np.asarray(scales, dtype=float)
+    maxStepLength = 10 * stepLength if maxStepLength is None else maxStepLength
+    direction = 1.0 if parameter <= 0.5 * (parameterBounds[0] + parameterBounds[1]) else -1.0
+
+    def residual(z):
+        return problem.residual(*(z * scales))
+
+    def finiteDifferenceGradient(z, value):
+        gradient = np.empty(2)
+        for i in range(2):
+            shifted = z.copy()
+            shifted[i] += finiteDifferenceStep
+            gradient[i] = (residual(shifted)[0] - value) / finiteDifferenceStep
+        return gradient
+
+    unknown, _, evaluations, result = problem.solve(parameter, guess)
+    z = np.array([parameter, unknown]) / scales
+    zValue, _ = residual(z)
+    gradient = finiteDifferenceGradient(z, zValue)
+    evaluations += 3
+    tangent = calcTangent(gradient, np.array([direction, 0.0]))
+    points = [ContinuationPoint(float(parameter), unknown, evaluations, result, tangent)]
+
+    while len(points) < maxPoints:
+        pointEvaluations = 0
+        w = z + stepLength * tangent
+        value, result = residual(w)
+        pointEvaluations += 1
+        for iteration in range(maxCorrectorIterations):
+            if abs(value) < shootingTolerance:
+                break
+            # Newton on [residual = 0, tangent . (w - z) = stepLength], residual gradient by Broyden updates
+            step = np.linalg.solve(np.vstack([gradient, tangent]), -np.array([value, tangent @ (w - z) - stepLength]))
+            newValue, newResult = residual(w + step)
+            pointEvaluations += 1
+            gradient = gradient + (newValue - value - gradient @ step) * step / (step @ step)
+            w, value, result = w + step, newValue, newResult
+        if abs(value) >= shootingTolerance or not np.all(np.isfinite(w)):
+            # too long a step (or a stale gradient): shorter step, fresh gradient at the last point
+            stepLength *= 0.5
+            if stepLength < minStepLength:
+                raise RuntimeError("pseudo-arclength continuation stalled at parameter %g" % (z[0] * scales[0]))
+            gradient = finiteDifferenceGradient(z, zValue)
+            evaluations += pointEvaluations + 2
+            continue
+        # corrector steps run along the gradient and never rotate it - a secant update along the accepted chord
+        # turns it with the curve, so the tangent follows the curve through folds
+        chord = w - z
+        gradient = gradient + (value - zValue - gradient @ chord) * chord / (chord @ chord)
+        tangent = calcTangent(gradient, tangent)
+        z, zValue = w, value
+        evaluations += pointEvaluations
+        points.append(ContinuationPoint(float(z[0] * scales[0]), float(z[1] * scales[1]), pointEvaluations, result,
+                                        tangent))
+        if iteration <= 2:
+            stepLength = min(stepLength * stepGrowth, maxStepLength)
+        if not parameterBounds[0] <= points[-1].parameter <= parameterBounds[1]:
+            break
+    return ContinuationResult(points, evaluations, time.perf_counter() - start)
+
+
+def savingsTable(title, rows):
+    table = PrettyTable()
+    table._set_double_border_style()
+    table.title = title
+    table.field_names = ["Method", "Points", "Marches", "Marches per point", "Saving (%)", "Computing time (s)",
+                         "Max deviation (K)"]
+    reference = rows[0][1]
+    for name, sweep in rows:
+        # saving and deviation against the reference on the same parameter values only (arclength points fall in
+        # between - compare those by marches per point)
+        sameGrid = np.array_equal(sweep.parameters, reference.parameters)
+        saving = round(100 * (1 - sweep.evaluations / reference.evaluations), 1) if sameGrid else "-"
+        deviation = "%.2e" % np.max(np.abs(sweep.solutions - reference.solutions)) if sameGrid else "-"
+        table.add_row([name, len(sweep.points), sweep.evaluations, round(sweep.evaluations / len(sweep.points), 2),
+                       saving, round(sweep.wallTime, 2), deviation])
+    return table
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    # counter-current cooled tube bed of reactorGeometry.main()
+    config = BatchConfig.fromReactorConfig(R1Config, 248.153, 1041.55)
+    geometry = CooledTubeBed(tubeDiameter=0.05, numberOfTubes=121, bedLength=5.0)
+    coolant = Coolant(heatTransferCoefficient=0.08, flowHeatCapacity=20, inletTemp=600)
+
+    low, high, step = tempSweep
+    temps = np.arange(low, high + step / 2, step, dtype=float)
+    problem = CoolantShooting(config, geometry, coolant)
+    print(savingsTable("Inlet temperature sweep %g-%g K (coolant outlet temperature by shooting)" % (low, high), [
+        ("Cold start every point", naturalContinuation(problem, temps, warmStart=False)),
+        ("Warm start (natural continuation)", naturalContinuation(problem, temps)),
+        ("Pseudo-arclength", pseudoArclength(problem, low, (low, high), stepLength=0.02, scales=(100.0, 100.0))),
+    ]))
+
+    low, high, step = pressureSweep
+    pressures = np.arange(low, high + step / 2, step, dtype=float)
+    problem = CoolantShooting(config, geometry, coolant, parameterName="pressure")
+    print(savingsTable("Pressure sweep %g-%g atm" % (low, high), [
+        ("Cold start every point", naturalContinuation(problem, pressures, warmStart=False)),
+        ("Warm start (natural continuation)", naturalContinuation(problem, pressures)),
+    ]))
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
@@ -0,0 +1,211 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Transient (dynamic) adiabatic packed bed: start-up, feed temperature upsets and the wrong-  #
+#                  way response of ammonia beds (outlet temperature first RISES after the inlet is cooled).   #
+#                - Heterogeneous model, per axial cell: N2 conversion X and gas temperature Tg (gas hold-up)   #
+#                  and catalyst temperature Ts (solid heat capacity). Gas and solid exchange heat through a    #
+#                  film coefficient; the reaction (kinetics of ReactorCalcs at Ts) releases heat in the solid.#
+#                                                                                                             #
+#                  dX/dt  = u * ( -dX/dz + eta r A / (2 Fn2) )                                                #
+#                  dTg/dt = u * ( -dTg/dz + h av A (Ts - Tg) / (F Cp) )                                       #
+#                  dTs/dt = ( h av (Tg - Ts) + eta r (-dH) ) / ((1 - voidage) rho_s cp_s)                     #
+#                                                                                                             #
+#                  u = interstitial gas velocity; at steady state the gas equations are the equations of the  #
+#                  steady reactor model (with the rate at the catalyst temperature).                          #
+#                - Method of lines: first-order upwind finite volumes in z, BDF in time with the block        #
+#                  bidiagonal Jacobian sparsity pattern given explicitly to solve_ivp.                        #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - bed = TransientBed(BatchConfig.fromReactorConfig(R1Config, 248.153, 1041.55, bedLength=2.1))             #
+# - y0 = bed.steadyState()            or      y0 = bed.uniformState(bedTemp=650)      (start-up)              #
+# - result = bed.simulate(y0, endTime=600, incomingTemp=lambda t: 673.15 - 15 * (t > 0))                       #
+# - Isobaric configs only; the effectiveness factor polynomial is clipped at zero outside its fitted range     #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+numberOfCells = 200
+catalystDensity = 2200                  # kg/m3     - pellet density of the iron catalyst                       #
+catalystHeatCapacity = 1.1              # kJ/kg/K                                                               #
+heatTransferCoefficient = 3.0           # kW/m2/K   - gas-pellet film coefficient (Wakao-Kaguei, Re ~ 4000)     #
+inletTempStep = -15                     # K         - feed temperature upset simulated in main()                #
+simulatedTime = 600                     # s                                                                     #
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import dataclasses
+import os
+import pathlib
+import time
+import numpy as np
+import scipy.sparse
+from scipy.integrate import solve_ivp
+import matplotlib.pyplot as plt
+import matplotlib.backends.backend_pdf
+import reactorCalcs_1
+from heatCapacityCalcs import calcMixtureHeatCapacity
+from pressureDrop_Ergun import dp, voidage
+from reactorEngine import BatchConfig, evaluateLocalRates, runBatch
+from reactorSim import R1Config
+from runQuery import DenseProfile
+storagePath = os.path.join(pathlib.Path(__file__).parent.absolute(), "Figures")
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+variablesPerCell = 3                    # X, Tg, Ts                                                             #
+specificSurface = 6 * (1 - voidage) / dp        # m2 pellet surface / m3 bed                                    #
+steadyStateTime = 5000                  # s - integration time used to settle steadyState()                   #
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+@dataclasses.dataclass
+class TransientResult:
+    time: np.ndarray                    # s     (nTimes,)
+    position: np.ndarray                # m     cell centres (nCells,)
+    conversionN2: np.ndarray            #       (nTimes, nCells)
+    gasTemp: np.ndarray                 # K     (nTimes, nCells)
+    solidTemp: np.ndarray               # K     (nTimes, nCells)
+    finalState: np.ndarray              #       state vector at the last time, to continue from
+    wallTime: float                     # s     - computing time of the integration
+    rhsEvaluations: int
+
+    @property
+    def outletTemp(self):
+        return self.gasTemp[:, -1]
+
+    @property
+    def outletConversion(self):
+        return self.conversionN2[:, -1]
+
+
+class TransientBed:
+
+    def __init__(self, config, numberOfCells=numberOfCells, heatTransferCoefficient=heatTransferCoefficient,
+                 catalystDensity=catalystDensity, catalystHeatCapacity=catalystHeatCapacity):
+        if not config.isobaric:
+            raise ValueError("TransientBed needs an isobaric config - the momentum balance is not part of the model")
+        if config.numberOfCases != 1:
+            raise ValueError("TransientBed simulates one bed - give a single-case config")
+        self.config = config
+        self.numberOfCells = numberOfCells
+        self.cellLength = float(config.bedLength) / numberOfCells
+        self.position = (np.arange(numberOfCells) + 0.5) * self.cellLength
+        self.exchangeCoefficient = heatTransferCoefficient * specificSurface            # kW/m3/K
+        self.solidHeatCapacity = (1 - voidage) * catalystDensity * catalystHeatCapacity  # kJ/m3/K
+        self.molarFlowrate = float(config.F) / 3600                                      # kmol/s
+        self.incomingTemp = float(config.incomingTemp)
+
+    def jacobianSparsity(self):
+        # cell j depends on itself and, through the upwind convection term, on cell j - 1
+        cells = scipy.sparse.eye(self.numberOfCells) + scipy.sparse.eye(self.numberOfCells, k=-1)
+        return scipy.sparse.kron(cells, np.ones((variablesPerCell, variablesPerCell)), format="csr")
+
+    def split(self, y):
+        cells = y.reshape(self.numberOfCells, variablesPerCell)
+        return cells[:, 0], cells[:, 1], cells[:, 2]
+
+    def rhs(self, t, y, incomingTemp):
+        conversionN2, gasTemp, solidTemp = self.split(y)
+        _, _, state = evaluateLocalRates(self.config, solidTemp, conversionN2)
+        reactionRate = np.maximum(state.effFactor, 0) * state.rateOfReactionNH3 / 3600       # kmol NH3/m3/s
+        heatRelease = -state.heatOfReaction * reactionRate                                  # kW/m3
+        exchange = self.exchangeCoefficient * (solidTemp - gasTemp)                         # kW/m3, into the gas
+        specificHeat = calcMixtureHeatCapacity(gasTemp, state.moleFractionH2, state.moleFractionN2,
+                                               state.moleFractionNH3, state.moleFractionAr, state.pressure)
+        concentration = state.pressure * reactorCalcs_1.atm / (reactorCalcs_1.R * 1e3 * gasTemp)   # kmol/m3
+        velocity = self.molarFlowrate / (voidage * reactorCalcs_1.A * concentration)             # m/s
+
+        upstreamConversion = np.concatenate(([0.0], conversionN2[:-1]))
+        upstreamTemp = np.concatenate(([incomingTemp(t)], gasTemp[:-1]))
+        dy = np.empty((self.numberOfCells, variablesPerCell))
+        dy[:, 0] = velocity * (-(conversionN2 - upstreamConversion) / self.cellLength
+                               + reactionRate * reactorCalcs_1.A / (2 * float(self.config.Fn2) / 3600))
+        dy[:, 1] = velocity * (-(gasTemp - upstreamTemp) / self.cellLength
+                               + exchange * reactorCalcs_1.A / (self.molarFlowrate * specificHeat))
+        dy[:, 2] = (heatRelease - exchange) / self.solidHeatCapacity
+        return dy.ravel()
+
+    def uniformState(self, bedTemp, conversionN2=0.0):
+        # start-up: bed and gas hold-up at one temperature
+        y = np.empty((self.numberOfCells, variablesPerCell))
+        y[:, 0], y[:, 1], y[:, 2] = conversionN2, bedTemp, bedTemp
+        return y.ravel()
+
+    def steadyState(self, settlingTime=steadyStateTime):
+        # steady reactor model profile at the cell centres, settled on the transient model's own equations
+        profile = DenseProfile.fromBatchResult(runBatch(self.config, recordEvery=10), self.config)
+        state = profile.stateAt(self.position, ("conversionN2", "temp"))
+        y = np.empty((self.numberOfCells, variablesPerCell))
+        y[:, 0], y[:, 1], y[:, 2] = state["conversionN2"][:, 0], state["temp"][:, 0], state["temp"][:, 0]
+        return self.simulate(y.ravel(), settlingTime, numberOfOutputs=2).finalState
+
+    def simulate(self, initialState, endTime, incomingTemp=None, numberOfOutputs=201, rtol=1e-6, atol=1e-8):
+        # incomingTemp: function of time (s) -> feed temperature (K); the config's inlet temperature by default
+        incomingTemp = incomingTemp or (lambda t: self.incomingTemp)
+        times = np.linspace(0, endTime, numberOfOutputs)
+        start = time.perf_counter()
+        solution = solve_ivp(self.rhs, (0, endTime), initialState, method="BDF", t_eval=times,
+                             args=(incomingTemp,), jac_sparsity=self.jacobianSparsity(), rtol=rtol, atol=atol)
+        wallTime = time.perf_counter() - start
+        if not solution.success:
+            raise RuntimeError("transient bed integration failed: " + solution.message)
+        cells = solution.y.T.reshape(len(solution.t), self.numberOfCells, variablesPerCell)
+        return TransientResult(solution.t, self.position, cells[..., 0], cells[..., 1], cells[..., 2],
+                               solution.y[:, -1], wallTime, solution.nfev)
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def plotTransient(result, title, snapshots=6):
+    fig1, ax = plt.subplots()
+    for i in np.linspace(0, len(result.time) - 1, snapshots).astype(int):
+        ax.plot(result.position, result.gasTemp[i], label="t = %d s" % result.time[i])
+    ax.set_xlabel("Length of Bed (m)")
+    ax.set_ylabel("Gas Temperature (K)")
+    plt.title(title + " - temperature profiles")
+
+    fig2, ax = plt.subplots()
+    ax.plot(result.time, result.outletTemp, color="blue", label="Outlet Temperature (K)")
+    ax.axhline(result.outletTemp[0], color="black", linestyle="--", label="Initial Outlet Temperature")
+    ax.set_xlabel("Time (s)")
+    ax.set_ylabel("Temperature (K)")
+    ax2 = ax.twinx()
+    ax2.plot(result.time, result.outletConversion, color="green", label="Outlet Conversion")
+    ax2.set_ylabel("Conversion", rotation=270, labelpad=15)
+    plt.title(title + " - outlet response")
+    return [fig1, fig2]
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    bed = TransientBed(BatchConfig.fromReactorConfig(R1Config, 248.153, 1041.55, bedLength=R1Config.baseLength))
+    initialState = bed.steadyState()
+    newInletTemp = bed.incomingTemp + inletTempStep
+    result = bed.simulate(initialState, simulatedTime, incomingTemp=lambda t: newInletTemp)
+
+    print("R-601 inlet temperature step: ", bed.incomingTemp, "K ->", newInletTemp, "K")
+    print("R-601 initial outlet temperature: ", round(result.outletTemp[0], 3), "K")
+    print("R-601 peak outlet temperature: ", round(result.outletTemp.max(), 3), "K at t =",
+          round(result.time[np.argmax(result.outletTemp)], 1), "s   (wrong-way overshoot: ",
+          round(result.outletTemp.max() - result.outletTemp[0], 3), "K)")
+    print("R-601 final outlet temperature: ", round(result.outletTemp[-1], 3), "K")
+    print("Cells: ", bed.numberOfCells, "    simulated: ", simulatedTime, "s    computing time: ",
+          round(result.wallTime, 2), "s    right-hand side evaluations: ", result.rhsEvaluations)
+
+    figs = plotTransient(result, "R-601 inlet step %+d K" % inletTempStep)
+    pp = matplotlib.backends.backend_pdf.PdfPages(os.path.join(storagePath, "TRANSIENT_BED.pdf"))
+    for fig in figs:
+        fig.set_size_inches(9.0, 5)
+        fig.gca().grid(True, linestyle=':')
+        fig.legend(loc="upper right", fontsize=7)
+        pp.savefig(fig, bbox_inches="tight", dpi=300)
+    pp.close()
+
+    showFig = input("Show figures? (y/n): ")
+    if showFig == "y":
+        plt.show()
+    else:
+        plt.close("all")
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#
@@ -0,0 +1,228 @@
+# =========================================================================================================== #
+# - Author :     Piotr T. Zaniewicz                                                                           #
+# - Date   :     19/10/2026                                                                                   #
+# - Description: - Monte Carlo propagation of the uncertainty in the kinetic parameters of reactorCalcs_1.py  #
+#                  (ko, E, alpha and the effectiveness factor polynomial) to the conversion and temperature    #
+#                  profiles of a reactor bed.                                                                 #
+#                - Parameter sets are drawn by Latin hypercube or scrambled Sobol sampling and run in chunks   #
+#                  through the batched engine (reactorEngine.py), optionally over a process pool.              #
+#                - Profiles are never stored: each chunk is folded into streaming statistics (mean, standard   #
+#                  deviation and a fixed-bin histogram per axial position) so memory does not grow with the   #
+#                  number of samples. Percentile bands are read from the histograms.                         #
+# =========================================================================================================== #
+# --------------------------------------   I N S T R U C T I O N S   ---------------------------------------- #
+# - Adjust parameterRanges and numberOfSamples below, then run the script                                     #
+# - The script prints the percentile bands of the final conversion and temperature and saves the band plots  #
+# =========================================================================================================== #
+# ==================================   I N P U T   V A R I A B L E S   ====================================== #
+numberOfSamples = 4096
+samplingMethod = "lhs"                  # "lhs" (Latin hypercube) or "sobol"
+percentileBands = (5, 25, 50, 75, 95)   # %
+recordEvery = 10                        # steps between stored axial positions (10 steps = 1 cm)
+# =========================================================================================================== #
+# ===================================   I M P O R T   L I B R A R I E S   =================================== #
+import concurrent.futures
+import dataclasses
+import os
+import pathlib
+import numpy as np
+from scipy.stats import qmc
+import matplotlib.pyplot as plt
+import matplotlib.backends.backend_pdf
+from reactorCalcs_1 import ko, E
+from reactorEngine import BatchConfig, runBatch, splitIntoChunks
+from reactorSim import R1Config, R2Config, R2FN2, R2F
+storagePath = os.path.join(pathlib.Path(__file__).parent.absolute(), "Figures")
+# =========================================================================================================== #
+# ------------------------------------------ C O N S T A N T S ---------------------------------------------- #
+parameterRanges = {
+    # name:            (low,        high,       scale)    - sampled uniformly, in log10 space when scale is "log"
+    "ko":              (ko / 2,     ko * 2,     "log"),
+    "E":               (0.97 * E,   1.03 * E,   "linear"),
+    "alpha":           (0.5,        0.75,       "linear"),      # Temkin parameter, stated range 0.5 - 0.75
+    "effFactorScale":  (0.9,        1.1,        "linear"),      # +-10 % on the effectiveness factor polynomial
+}
+# =========================================================================================================== #
+
+# =============================================   C L A S S E S   =========================================== #
+
+class StreamingProfileStats:
+    # running mean/variance (Chan et al. pairwise update) and histogram of a profile at every axial position
+
+    def __init__(self, numberOfPositions, lower, upper, bins=2000):
+        self.count = 0
+        self.mean = np.zeros(numberOfPositions)
+        self.sumSquares = np.zeros(numberOfPositions)
+        self.edges = np.linspace(lower, upper, bins + 1)
+        self.histogram = np.zeros((numberOfPositions, bins), dtype=np.int64)
+        self.outOfRange = 0
+
+    def update(self, profiles):
+        # profiles: (numberOfPositions, numberOfCases)
+        count = profiles.shape[1]
+        if count == 0:
+            return
+        mean = profiles.mean(axis=1)
+        sumSquares = ((profiles - mean[:, None]) ** 2).sum(axis=1)
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.sumSquares += sumSquares + delta**2 * self.count * count / total
+        self.count = total
+
+        bins = self.histogram.shape[1]
+        binIndex = np.searchsorted(self.edges, profiles, side="right") - 1
+        self.outOfRange += int(np.count_nonzero((binIndex < 0) | (binIndex >= bins)))
+        np.clip(binIndex, 0, bins - 1, out=binIndex)
+        flatIndex = binIndex + bins * np.arange(profiles.shape[0])[:, None]
+        self.histogram += np.bincount(flatIndex.ravel(), minlength=self.histogram.size).reshape(self.histogram.shape)
+
+    @property
+    def std(self):
+        return np.sqrt(self.sumSquares / max(self.count - 1, 1))
+
+    def percentile(self, q):
+        # linear interpolation inside the histogram bin that holds the q-th percentile
+        cumulative = np.cumsum(self.histogram, axis=1)
+        target = q / 100 * self.count
+        index = np.minimum((cumulative < target).sum(axis=1), self.histogram.shape[1] - 1)
+        rows = np.arange(len(index))
+        below = np.where(index > 0, cumulative[rows, np.maximum(index - 1, 0)], 0)
+        inBin = np.maximum(self.histogram[rows, index], 1)
+        width = self.edges[1] - self.edges[0]
+        return self.edges[index] + np.clip((target - below) / inBin, 0, 1) * width
+
+
+@dataclasses.dataclass
+class UncertaintyResult:
+    length: np.ndarray                  # m
+    temp: StreamingProfileStats
+    conversionN2: StreamingProfileStats
+    numberOfSamples: int
+    failedSamples: int                  # samples whose profiles contained NaN (non-physical parameter sets)
+
+    def bands(self, percentiles=percentileBands):
+        return {q: (self.temp.percentile(q), self.conversionN2.percentile(q)) for q in percentiles}
+
+
+# =============================================   F U N C T I O N S   ======================================= #
+
+def sampleParameters(numberOfSamples, method=samplingMethod, seed=None, ranges=None):
+    ranges = parameterRanges if ranges is None else ranges
+    if method == "sobol":
+        unitSamples = qmc.Sobol(len(ranges), scramble=True, seed=seed).random(numberOfSamples)
+    elif method == "lhs":
+        unitSamples = qmc.LatinHypercube(len(ranges), seed=seed).random(numberOfSamples)
+    else:
+        raise ValueError("method must be 'lhs' or 'sobol', not %r" % (method,))
+    samples = {}
+    for column, (name, (low, high, scale)) in enumerate(ranges.items()):
+        if scale == "log":
+            samples[name] = 10 ** (np.log10(low) + unitSamples[:, column] * (np.log10(high) - np.log10(low)))
+        else:
+            samples[name] = low + unitSamples[:, column] * (high - low)
+    return samples
+
+
+def _runProfiles(arguments):
+    config, recordEvery = arguments
+    result = runBatch(config, recordEvery=recordEvery)
+    return result.length, result.tempProfile, result.conversionProfile
+
+
+def runMonteCarlo(baseConfig, numberOfSamples=numberOfSamples, method=samplingMethod, recordEvery=recordEvery,
+                  chunkSize=256, workers=1, seed=None, ranges=None):
+    workers = workers or os.cpu_count() or 1
+    samples = sampleParameters(numberOfSamples, method, seed, ranges)
+    config = dataclasses.replace(baseConfig, **samples)
+    chunks = [(chunk, recordEvery) for chunk in splitIntoChunks(config, chunkSize)]
+
+    result = None
+    failedSamples = 0
+
+    def accumulate(length, tempProfile, conversionProfile):
+        nonlocal result, failedSamples
+        if result is None:
+            lowestTemp = float(np.min(config.incomingTemp)) - 1
+            result = UncertaintyResult(
+                length,
+                StreamingProfileStats(len(length), lowestTemp, lowestTemp + 500),
+                StreamingProfileStats(len(length), 0.0, 1.0),
+                numberOfSamples,
+                0,
+            )
+        valid = np.all(np.isfinite(tempProfile) & np.isfinite(conversionProfile), axis=0)
+        failedSamples += int(np.count_nonzero(~valid))
+        result.temp.update(tempProfile[:, valid])
+        result.conversionN2.update(conversionProfile[:, valid])
+
+    if workers == 1:
+        for chunk in chunks:
+            accumulate(*_runProfiles(chunk))
+    else:
+        # at most two chunks per worker in flight, so memory stays bounded however many samples are drawn
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            pending = set()
+            for chunk in chunks:
+                pending.add(executor.submit(_runProfiles, chunk))
+                if len(pending) >= 2 * workers:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        accumulate(*future.result())
+            for future in concurrent.futures.as_completed(pending):
+                accumulate(*future.result())
+
+    result.failedSamples = failedSamples
+    return result
+
+
+# =========================================   M A I N   P R O G R A M   ======================================#
+def main():
+    reactors = [("R-601", BatchConfig.fromReactorConfig(R1Config, 248.153, 1041.55, bedLength=R1Config.baseLength)),
+                ("R-602", BatchConfig.fromReactorConfig(R2Config, R2FN2, R2F, bedLength=R2Config.baseLength))]
+    figs = []
+    for name, baseConfig in reactors:
+        result = runMonteCarlo(baseConfig, workers=os.cpu_count())
+        bands = result.bands()
+        print("---------------------------------------------------------------------")
+        print(name, "Monte Carlo samples: ", result.numberOfSamples, "    failed: ", result.failedSamples)
+        for q, (tempBand, conversionBand) in bands.items():
+            print(name, "P%-3d Final Conversion: " % q, round(conversionBand[-1], 5),
+                  "    Final Temperature: ", round(tempBand[-1], 3), "K")
+        print(name, "Mean Final Conversion: ", round(result.conversionN2.mean[-1], 5),
+              "+-", round(result.conversionN2.std[-1], 5))
+
+        fig, ax = plt.subplots()
+        ax2 = ax.twinx()
+        ax.fill_between(result.length, bands[5][0], bands[95][0], color="blue", alpha=0.15, label="Temperature P5-P95")
+        ax.fill_between(result.length, bands[25][0], bands[75][0], color="blue", alpha=0.3, label="Temperature P25-P75")
+        ax.plot(result.length, bands[50][0], color="blue", linestyle="dotted", label="Temperature P50")
+        ax2.fill_between(result.length, bands[5][1], bands[95][1], color="green", alpha=0.15, label="Conversion P5-P95")
+        ax2.fill_between(result.length, bands[25][1], bands[75][1], color="green", alpha=0.3, label="Conversion P25-P75")
+        ax2.plot(result.length, bands[50][1], color="green", label="Conversion P50")
+        ax.set_xlabel("Length (m)")
+        ax.set_ylabel("Temperature (K)", color="blue")
+        ax2.set_ylabel("Conversion", color="green", rotation=270, labelpad=15)
+        ax.set_xlim(0, result.length[-1])
+        ax2.set_ylim(0,)
+        plt.title(name + " Temperature/Conversion Uncertainty Bands")
+        figs.append(fig)
+
+    pp = matplotlib.backends.backend_pdf.PdfPages(os.path.join(storagePath, "MONTE_CARLO_UNCERTAINTY_BANDS.pdf"))
+    for fig in figs:
+        fig.set_size_inches(9.0, 5)
+        fig.gca().grid(True, linestyle=':')
+        fig.legend(loc='upper center', bbox_to_anchor=(0.5, 0.98), shadow=True, ncol=3, fontsize=7)
+        pp.savefig(fig, bbox_inches="tight", dpi=300)
+    pp.close()
+
+    showFig = input("Show figures? (y/n): ")
+    if showFig == "y":
+        plt.show()
+    else:
+        plt.close("all")
+
+
+if __name__ == "__main__":
+    main()
+# =====================   E N D   O F   P R O G R A M    =====================#